@@ -12,13 +12,27 @@ __version__ = "2.0.0"
 __author__ = "Audio Splitter Team"
 __email__ = "contact@audiosplitter.dev"
 
-# Importaciones principales para facilitar el uso
-from .core.splitter import AudioSplitter
-from .core.converter import AudioConverter
-from .core.metadata_manager import MetadataEditor
+# Importaciones principales para facilitar el uso. Se resuelven bajo demanda
+# (PEP 562) para que importar el paquete no cargue librosa, mutagen ni rich.
+_LAZY_IMPORTS = {
+    'AudioSplitter': '.core.splitter',
+    'AudioConverter': '.core.converter',
+    'MetadataEditor': '.core.metadata_manager'
+}
 
 __all__ = [
     'AudioSplitter',
     'AudioConverter', 
     'MetadataEditor'
 ]
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,75 @@
+"""
+Inicialización en tiempo de ejecución del Audio Splitter Suite
+
+Importar el paquete no crea nada en disco: los directorios de datos y los
+handlers de logging se preparan la primera vez que se necesitan, una sola vez
+por proceso. Los procesos de los pools se marcan como workers y omiten esta
+inicialización por completo.
+"""
+
+import logging
+import threading
+
+_lock = threading.Lock()
+_directories_ready = False
+_logging_ready = False
+_worker_process = False
+
+
+def mark_worker_process():
+    """Marca el proceso actual como worker de un pool (sin directorios ni logs propios)"""
+    global _worker_process
+    _worker_process = True
+
+
+def is_worker_process() -> bool:
+    """Indica si el proceso actual es un worker de un pool"""
+    return _worker_process
+
+
+def ensure_data_directories() -> bool:
+    """
+    Crea los directorios de datos la primera vez que se llama
+
+    Returns:
+        bool: True si los directorios existen (False en workers o instalaciones de solo lectura)
+    """
+    global _directories_ready
+    if _worker_process:
+        return False
+
+    with _lock:
+        if not _directories_ready:
+            from .settings import ensure_directories
+            try:
+                ensure_directories()
+            except OSError:
+                # Instalación de solo lectura: cada operación crea su salida al usarla
+                return False
+            _directories_ready = True
+    return True
+
+
+def ensure_logging() -> logging.Logger:
+    """
+    Configura el logging de la aplicación la primera vez que se llama
+
+    Returns:
+        logging.Logger: Logger 'audio_splitter' (sin handlers propios en workers)
+    """
+    global _logging_ready
+    if _worker_process:
+        return logging.getLogger('audio_splitter')
+
+    with _lock:
+        if not _logging_ready:
+            from ..utils.logging_utils import setup_logging
+            setup_logging()
+            _logging_ready = True
+    return logging.getLogger('audio_splitter')
+
+
+def initialize_runtime():
+    """Prepara directorios y logging para un comando real (idempotente)"""
+    ensure_data_directories()
+    ensure_logging()
@@ -14,6 +14,7 @@ OUTPUT_DIR = DATA_DIR / "output"
 SOURCES_DIR = DATA_DIR / "sources"
 TEMPLATES_DIR = DATA_DIR / "templates"
 METADATA_DIR = DATA_DIR / "metadata"
+CACHE_DIR = DATA_DIR / "cache"
 
 # Formatos soportados
 SUPPORTED_INPUT_FORMATS = ['.wav', '.mp3', '.flac', '.m4a', '.ogg']
@@ -35,20 +36,53 @@ QUALITY_PRESETS = {
     }
 }
 
+# Configuraciones de procesamiento por bloques
+STREAM_BLOCK_FRAMES = 65536  # Frames leídos por bloque en modo streaming (~1.5s a 44.1kHz)
+
+# Planificación de lotes en paralelo
+MEMORY_BUDGET = 4 * 1024 * 1024 * 1024  # 4GB de audio decodificado simultáneo
+SCHEDULER_LOOKAHEAD = 64  # Trabajos pendientes entre los que elegir el más largo
+
+# Carpeta de ingesta vigilada (comando watch)
+WATCH_INTERVAL = 1.0  # Segundos entre sondeos
+WATCH_SETTLE_SECONDS = 2.0  # Segundos sin cambios de tamaño/mtime para dar un archivo por completo
+WATCH_PROCESSED_DIRNAME = "processed"
+WATCH_FAILED_DIRNAME = "failed"
+
+# Servicio HTTP local (comando serve)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+SERVER_QUEUE_SIZE = 16  # Peticiones en espera además de las que se ejecutan
+SERVER_ROOTS = [SOURCES_DIR, OUTPUT_DIR]  # Únicos directorios que el servicio puede leer o escribir
+
+# Caché de conversiones
+CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 2GB
+CACHE_USE_HARDLINKS = False  # Los enlaces duros comparten inodo: editar etiquetas en sitio alteraría la caché
+
+# Codificador externo (MP3)
+FFMPEG_BINARY = "ffmpeg"
+
 # Configuraciones de metadatos
 DEFAULT_ENCODING = 3  # UTF-8 para ID3
 SUPPORTED_ARTWORK_FORMATS = ['.jpg', '.jpeg', '.png']
 MAX_ARTWORK_SIZE = 10 * 1024 * 1024  # 10MB
+METADATA_WORKERS = 8  # Hilos de edición por lotes (lectura/escritura de tags, limitada por E/S)
+LIBRARY_INDEX_PATH = METADATA_DIR / "library.sqlite3"  # Catálogo SQLite del comando index
+
+# Carátulas: las que superan MAX_ARTWORK_SIZE se reducen a JPEG
+ARTWORK_MAX_DIMENSION = 1200  # Lado mayor al reducir ("Grande" en la documentación)
+ARTWORK_MIN_DIMENSION = 300  # No se reduce por debajo de esto para cumplir el límite
+ARTWORK_JPEG_QUALITY = 90
+ARTWORK_CACHE_BYTES = 256 * 1024 * 1024  # Variantes redimensionadas en memoria (LRU)
+ARTWORK_WORKERS = 2  # Procesos para redimensionar
 
 # Configuraciones de la interfaz
 DEFAULT_OUTPUT_DIR = str(OUTPUT_DIR)
 DEFAULT_PRESERVE_METADATA = True
 
-# Crear directorios si no existen
+# Crear directorios si no existen. No se ejecuta al importar: ver
+# config.runtime.ensure_data_directories, que lo llama una vez en el primer uso real
 def ensure_directories():
     """Crea los directorios necesarios si no existen"""
     for directory in [OUTPUT_DIR, SOURCES_DIR, TEMPLATES_DIR, METADATA_DIR]:
         directory.mkdir(parents=True, exist_ok=True)
-
-# Ejecutar al importar
-ensure_directories()
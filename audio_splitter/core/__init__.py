@@ -2,8 +2,27 @@
 Módulo core - Lógica de negocio central del Audio Splitter
 """
 
-from .splitter import AudioSplitter
-from .converter import AudioConverter
-from .metadata_manager import MetadataEditor
+# Exportaciones resueltas bajo demanda (PEP 562): cada clase carga solo sus dependencias
+_LAZY_IMPORTS = {
+    'AudioSplitter': '.splitter',
+    'AudioConverter': '.converter',
+    'MetadataEditor': '.metadata_manager',
+    'BatchMetadataEditor': '.metadata_batch',
+    'MetadataTemplate': '.metadata_templates',
+    'LibraryIndex': '.library_index',
+    'ConversionPipeline': '.pipeline'
+}
 
-__all__ = ['AudioSplitter', 'AudioConverter', 'MetadataEditor']
+__all__ = ['AudioSplitter', 'AudioConverter', 'MetadataEditor', 'BatchMetadataEditor', 'MetadataTemplate',
+           'LibraryIndex', 'ConversionPipeline']
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Artwork Store - Carátulas direccionadas por contenido con caché LRU de
+variantes redimensionadas
+"""
+
+import atexit
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+# Pillow para redimensionar (opcional)
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+from ..config.settings import (MAX_ARTWORK_SIZE, ARTWORK_MAX_DIMENSION, ARTWORK_MIN_DIMENSION,
+                               ARTWORK_JPEG_QUALITY, ARTWORK_CACHE_BYTES, ARTWORK_WORKERS)
+from ..config.runtime import is_worker_process, mark_worker_process
+
+# Clave de una variante: (hash del original, lado mayor, calidad JPEG)
+VariantKey = Tuple[str, int, int]
+
+
+class ArtworkStore:
+    """
+    Almacén de carátulas por hash SHA-256 de su contenido.
+
+    La misma imagen embebida en todas las pistas de un álbum tiene un único
+    hash, así que cada variante (lado mayor, calidad) se calcula una sola vez
+    por lote y todas las pistas comparten los mismos bytes. Las variantes se
+    guardan en una caché LRU con presupuesto de bytes; el redimensionado se
+    hace en un pool de procesos y, si varios hilos piden la misma variante a
+    la vez, esperan al mismo cálculo. Es seguro compartirlo entre hilos.
+    """
+
+    def __init__(self, max_bytes: int = ARTWORK_CACHE_BYTES, workers: int = ARTWORK_WORKERS):
+        """
+        Args:
+            max_bytes: Tamaño máximo de las variantes en caché
+            workers: Procesos para redimensionar (0 = en el propio proceso)
+        """
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[VariantKey, bytes]' = OrderedDict()
+        self._pending: Dict[VariantKey, Future] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'ArtworkStore':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        """Hash de contenido de una imagen"""
+        return hashlib.sha256(data).hexdigest()
+
+    def variant(self, data: bytes, max_dimension: int,
+                quality: int = ARTWORK_JPEG_QUALITY) -> bytes:
+        """
+        Imagen reducida a un lado mayor y recomprimida como JPEG
+
+        Args:
+            data: Imagen original (JPEG o PNG)
+            max_dimension: Lado mayor máximo en píxeles (las imágenes menores no se amplían)
+            quality: Calidad JPEG
+
+        Returns:
+            bytes: JPEG de la variante (los mismos bytes para toda imagen idéntica)
+
+        Raises:
+            ValueError: Si Pillow no está disponible o la imagen no se puede leer
+        """
+        return self.variants(data, [max_dimension], quality)[max_dimension]
+
+    def variants(self, data: bytes, dimensions: Iterable[int],
+                 quality: int = ARTWORK_JPEG_QUALITY) -> Dict[int, bytes]:
+        """
+        Varias variantes de una imagen, calculadas en paralelo
+
+        Returns:
+            Dict[int, bytes]: Lado mayor -> JPEG
+        """
+        if not PILLOW_AVAILABLE:
+            raise ValueError("Redimensionar carátulas requiere Pillow (pip install Pillow)")
+
+        content_hash = self.digest(data)
+        # Dentro de un worker no se anidan pools: se calcula en el propio proceso
+        inline = self.workers <= 0 or is_worker_process()
+        futures = {}
+        owned = []
+        with self._lock:
+            for dimension in dict.fromkeys(dimensions):
+                key = (content_hash, dimension, quality)
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    futures[dimension] = self._entries[key]
+                elif key in self._pending:
+                    # Otro hilo ya la está calculando
+                    self.hits += 1
+                    futures[dimension] = self._pending[key]
+                else:
+                    self.misses += 1
+                    future = Future() if inline else self._submit(data, dimension, quality)
+                    self._pending[key] = future
+                    futures[dimension] = future
+                    owned.append((key, future))
+
+        if inline:
+            for (_, dimension, _), future in owned:
+                future.set_running_or_notify_cancel()
+                try:
+                    future.set_result(_resize_image(data, dimension, quality))
+                except Exception as e:
+                    future.set_exception(e)
+
+        results = {}
+        try:
+            for dimension, value in futures.items():
+                results[dimension] = value if isinstance(value, bytes) else value.result()
+        finally:
+            for key, future in owned:
+                self._finish(key, future)
+        return results
+
+    def fit(self, data: bytes, mime: Optional[str],
+            max_bytes: int = MAX_ARTWORK_SIZE,
+            max_dimension: int = ARTWORK_MAX_DIMENSION) -> Tuple[bytes, Optional[str]]:
+        """
+        Ajusta una carátula a un tamaño máximo en bytes reduciéndola
+
+        Las imágenes que ya caben se devuelven sin tocar (ni hashear). Las demás
+        se reducen a max_dimension y, si aún no caben, a lados cada vez menores
+        hasta ARTWORK_MIN_DIMENSION.
+
+        Args:
+            data: Imagen original
+            mime: Tipo MIME original
+            max_bytes: Tamaño máximo permitido
+            max_dimension: Lado mayor del primer intento
+
+        Returns:
+            Tuple[bytes, Optional[str]]: (imagen, mime) dentro del límite
+
+        Raises:
+            ValueError: Si no se puede reducir por debajo del límite
+        """
+        if len(data) <= max_bytes:
+            return data, mime
+
+        dimension = max_dimension
+        while dimension >= ARTWORK_MIN_DIMENSION:
+            resized = self.variant(data, dimension)
+            if len(resized) <= max_bytes:
+                return resized, 'image/jpeg'
+            dimension = dimension * 3 // 4
+
+        raise ValueError(f"La carátula supera {max_bytes} bytes incluso reducida a "
+                         f"{ARTWORK_MIN_DIMENSION}px")
+
+    def stats(self) -> Dict[str, int]:
+        """Aciertos, fallos, expulsiones y ocupación de la caché"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self._entries), 'bytes': self._size}
+
+    def close(self):
+        """Detiene el pool de procesos, si se creó (la caché se conserva y el pool se recrea si hace falta)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def _submit(self, data: bytes, dimension: int, quality: int) -> Future:
+        """Lanza un redimensionado en el pool (con el lock tomado), creándolo en el primer uso"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 initializer=mark_worker_process)
+        return self._executor.submit(_resize_image, data, dimension, quality)
+
+    def _finish(self, key: VariantKey, future: Future):
+        """Guarda una variante calculada y expulsa las menos usadas si se supera el presupuesto"""
+        with self._lock:
+            self._pending.pop(key, None)
+            if future.cancelled() or future.exception() is not None:
+                return
+            data = future.result()
+            if key in self._entries or len(data) > self.max_bytes:
+                return
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+
+_shared_store: Optional[ArtworkStore] = None
+_shared_lock = threading.Lock()
+
+def shared_artwork_store() -> ArtworkStore:
+    """
+    Almacén único del proceso, creado en el primer uso
+
+    Todos los editores lo comparten, así una carátula se reduce una sola vez
+    por proceso; su pool se detiene al salir (o antes con close()).
+    """
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = ArtworkStore()
+            atexit.register(_shared_store.close)
+        return _shared_store
+
+
+def _resize_image(data: bytes, max_dimension: int, quality: int) -> bytes:
+    """Reduce una imagen a un lado mayor y la recomprime como JPEG (se ejecuta en el pool)"""
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image = image.convert('RGB')
+            resampling = getattr(Image, 'Resampling', Image).LANCZOS
+            image.thumbnail((max_dimension, max_dimension), resampling)
+            output = io.BytesIO()
+            image.save(output, format='JPEG', quality=quality, optimize=True)
+            return output.getvalue()
+    except OSError as e:
+        raise ValueError(f"Imagen de carátula no válida: {e}")
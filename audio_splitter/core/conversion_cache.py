@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Conversion Cache - Caché en disco de conversiones direccionada por contenido
+con presupuesto de bytes y expulsión LRU
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from ..config.settings import CACHE_DIR, CACHE_MAX_BYTES, CACHE_USE_HARDLINKS
+from ..utils.file_utils import file_sha256
+
+# Se incrementa si cambia la forma de codificar, para no servir salidas antiguas
+CACHE_KEY_VERSION = 1
+
+
+class ConversionCache:
+    """
+    Caché de archivos convertidos compartida entre trabajos y procesos.
+
+    La clave combina el hash del contenido del origen con el formato, el
+    preset de calidad y si se preservan metadatos. Las entradas se guardan como
+    <dir>/<clave[:2]>/<clave>.<formato>; el mtime de cada entrada marca su
+    último uso y, al superar el presupuesto de bytes, se eliminan primero las
+    menos usadas recientemente. Las escrituras son atómicas (archivo temporal
+    + os.replace), por lo que varios procesos pueden usar el mismo directorio.
+
+    El directorio se recorre una sola vez, en el primer store(); a partir de
+    ahí cada instancia lleva en memoria el orden LRU y el total de bytes, y
+    expulsa solo lo necesario. Lo que escriben otros procesos se incorpora al
+    volver a recorrerlo con evict().
+    """
+
+    def __init__(self,
+                 cache_dir: Union[str, Path] = CACHE_DIR,
+                 max_bytes: int = CACHE_MAX_BYTES,
+                 use_hardlinks: bool = CACHE_USE_HARDLINKS):
+        """
+        Args:
+            cache_dir: Directorio de la caché
+            max_bytes: Tamaño máximo total de las entradas
+            use_hardlinks: Si servir los aciertos como enlace duro en lugar de copia.
+                           Solo es seguro si las salidas no se editan en sitio
+                           (p. ej. al escribir etiquetas), ya que se compartiría el inodo.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.use_hardlinks = use_hardlinks
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        # Entrada -> tamaño, de menos a más recientemente usada (None = sin recorrer)
+        self._index: Optional['OrderedDict[Path, int]'] = None
+        self._size = 0
+
+    def __getstate__(self):
+        # Cada proceso del pool recorre el directorio por su cuenta
+        state = self.__dict__.copy()
+        state['_index'] = None
+        state['_size'] = 0
+        return state
+
+    def key(self, input_path: Union[str, Path], target_format: str,
+            quality: str, preserve_metadata: bool = True,
+            content_hash: Optional[str] = None) -> str:
+        """
+        Calcula la clave de caché de una conversión
+
+        Args:
+            content_hash: SHA-256 del origen ya calculado (file_sha256); si se
+                          indica, el origen no se vuelve a leer
+        """
+        if content_hash is None:
+            content_hash = file_sha256(input_path)
+        material = f"{CACHE_KEY_VERSION}:{content_hash}:{target_format}:{quality}:{int(preserve_metadata)}"
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str, target_format: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.{target_format}"
+
+    def fetch(self, key: str, target_format: str, output_path: Union[str, Path]) -> bool:
+        """
+        Materializa una entrada de la caché en la ruta de salida
+
+        Returns:
+            bool: True si hubo acierto
+        """
+        entry = self._entry_path(key, target_format)
+        output_path = Path(output_path)
+        if not entry.exists():
+            self.misses += 1
+            return False
+
+        try:
+            if output_path.exists() or output_path.is_symlink():
+                output_path.unlink()
+            if self.use_hardlinks:
+                try:
+                    os.link(entry, output_path)
+                except OSError:
+                    shutil.copyfile(entry, output_path)
+            else:
+                shutil.copyfile(entry, output_path)
+            # Marcar uso reciente para la expulsión LRU
+            os.utime(entry)
+            if self._index is not None and entry in self._index:
+                self._index.move_to_end(entry)
+        except FileNotFoundError:
+            # Expulsada por otro proceso entre la comprobación y la copia
+            self.misses += 1
+            return False
+
+        self.hits += 1
+        return True
+
+    def store(self, key: str, target_format: str, output_path: Union[str, Path]):
+        """Guarda una salida recién convertida y aplica el presupuesto de bytes"""
+        index = self._load_index()
+        entry = self._entry_path(key, target_format)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, temp_name = tempfile.mkstemp(dir=entry.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file, open(output_path, 'rb') as source:
+                shutil.copyfileobj(source, temp_file)
+            os.replace(temp_name, entry)
+        except BaseException:
+            if os.path.exists(temp_name):
+                os.unlink(temp_name)
+            raise
+
+        size = entry.stat().st_size
+        self._size += size - index.pop(entry, 0)
+        index[entry] = size
+        self.stores += 1
+        self._evict_over_budget()
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        """Entradas actuales como (último uso, tamaño, ruta)"""
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+
+        for bucket in self.cache_dir.iterdir():
+            if not bucket.is_dir():
+                continue
+            for entry in bucket.iterdir():
+                if entry.suffix == '.tmp':
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # Expulsada por otro proceso
+                entries.append((stat.st_mtime, stat.st_size, entry))
+        return entries
+
+    def _load_index(self) -> 'OrderedDict[Path, int]':
+        """Índice LRU en memoria, recorriendo el directorio si aún no se hizo"""
+        if self._index is None:
+            self._index = OrderedDict((entry, size) for _, size, entry in sorted(self._entries()))
+            self._size = sum(self._index.values())
+        return self._index
+
+    def _evict_over_budget(self):
+        """Elimina las entradas menos usadas del índice mientras se supere el presupuesto"""
+        index = self._load_index()
+        while self._size > self.max_bytes and index:
+            entry, size = index.popitem(last=False)
+            self._size -= size
+            try:
+                entry.unlink()
+                self.evictions += 1
+            except FileNotFoundError:
+                pass  # Ya expulsada por otro proceso
+
+    def evict(self):
+        """
+        Vuelve a recorrer el directorio y elimina las entradas menos usadas
+        recientemente hasta cumplir el presupuesto
+
+        Recoge también lo escrito por otros procesos; conviene llamarlo al
+        terminar un lote en paralelo, no tras cada archivo.
+        """
+        self._index = None
+        self._evict_over_budget()
+
+    def merge_stats(self, stats: Dict[str, int]):
+        """Acumula contadores producidos por otra instancia (p. ej. un proceso del pool)"""
+        self.hits += stats.get('hits', 0)
+        self.misses += stats.get('misses', 0)
+        self.stores += stats.get('stores', 0)
+        self.evictions += stats.get('evictions', 0)
+
+    def counters(self) -> Dict[str, int]:
+        """Contadores de esta instancia"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'evictions': self.evictions
+        }
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Contadores de uso más ocupación actual de la caché"""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        stats = dict(self.counters())
+        stats.update({
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes
+        })
+        return stats
@@ -6,25 +6,40 @@ Soporta conversión con preservación de metadatos y configuración de calidad
 
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import argparse
 
-import librosa
-import soundfile as sf
-from pydub import AudioSegment
 from mutagen import File
-from mutagen.mp3 import MP3
-from mutagen.flac import FLAC
-from mutagen.wave import WAVE
 from rich.console import Console
 from rich.progress import Progress, BarColumn, TextColumn, TimeRemainingColumn
 from rich.table import Table
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
 
+from ..utils.audio_utils import probe_audio
+from ..utils.discovery import iter_files
+from ..utils.file_utils import file_sha256
+from .pipeline import ConversionPipeline
+from .manifest import ConversionManifest
+from .conversion_cache import ConversionCache
+from .scheduler import MemoryAwareScheduler, estimate_job
+from ..config.settings import MEMORY_BUDGET
+from ..config.runtime import mark_worker_process
+
 console = Console()
 
+# Trabajo de conversión: (entrada, salida, formato, calidad, preservar_metadatos)
+ConversionJob = Tuple[str, str, str, str, bool]
+
+# Conversiones entre guardados intermedios del manifiesto al sincronizar
+MANIFEST_SAVE_INTERVAL = 500
+
+# Salida de una conversión: (ruta_salida, formato, calidad)
+ConversionTarget = Tuple[Union[str, Path], str, str]
+
 class AudioFormatError(Exception):
     """Excepción personalizada para errores de formato de audio"""
     pass
@@ -54,9 +69,14 @@ class AudioConverter:
         }
     }
     
-    def __init__(self):
+    def __init__(self, cache: Optional[ConversionCache] = None):
+        """
+        Args:
+            cache: Caché de conversiones a consultar antes de codificar (opcional)
+        """
         self.supported_input_formats = ['.wav', '.mp3', '.flac', '.m4a', '.ogg']
         self.supported_output_formats = ['.wav', '.mp3', '.flac']
+        self.cache = cache
     
     def detect_format(self, file_path: Union[str, Path]) -> str:
         """Detecta el formato de audio del archivo"""
@@ -71,35 +91,27 @@ class AudioConverter:
         return extension
     
     def get_audio_info(self, file_path: Union[str, Path]) -> Dict:
-        """Obtiene información detallada del archivo de audio"""
+        """Obtiene información detallada del archivo de audio leyendo solo la cabecera"""
         try:
-            # Cargar con librosa para información técnica
-            y, sr = librosa.load(str(file_path), sr=None)
-            duration = len(y) / sr
-            
-            # Cargar con mutagen para metadatos
+            # Cargar con mutagen para metadatos (no decodifica el audio)
             audio_file = File(str(file_path))
             
+            # Información técnica desde la cabecera
+            stream_info = probe_audio(file_path, audio_file)
+            
             info = {
                 'path': str(file_path),
                 'format': self.detect_format(file_path),
-                'duration': duration,
-                'sample_rate': sr,
-                'channels': 1 if len(y.shape) == 1 else y.shape[0],
+                'duration': stream_info['duration'],
+                'sample_rate': stream_info['sample_rate'],
+                'channels': stream_info['channels'],
                 'file_size': Path(file_path).stat().st_size,
                 'metadata': {}
             }
             
             if audio_file is not None:
                 # Extraer metadatos comunes
-                info['metadata'] = {
-                    'title': self._get_tag(audio_file, ['TIT2', 'TITLE', 'Title']),
-                    'artist': self._get_tag(audio_file, ['TPE1', 'ARTIST', 'Artist']),
-                    'album': self._get_tag(audio_file, ['TALB', 'ALBUM', 'Album']),
-                    'date': self._get_tag(audio_file, ['TDRC', 'DATE', 'Date']),
-                    'genre': self._get_tag(audio_file, ['TCON', 'GENRE', 'Genre']),
-                    'track': self._get_tag(audio_file, ['TRCK', 'TRACKNUMBER', 'TrackNumber'])
-                }
+                info['metadata'] = self._common_tags(audio_file)
             
             return info
             
@@ -122,177 +134,177 @@ class AudioConverter:
                     output_path: Union[str, Path],
                     target_format: str,
                     quality: str = 'high',
-                    preserve_metadata: bool = True) -> bool:
+                    preserve_metadata: bool = True,
+                    content_hash: Optional[str] = None) -> bool:
         """
         Convierte un archivo de audio a otro formato
         
+        El origen se decodifica una sola vez y los metadatos se escriben durante
+        la propia codificación (ver ConversionPipeline).
+        
         Args:
             input_path: Ruta del archivo de entrada
             output_path: Ruta del archivo de salida
             target_format: Formato objetivo ('wav', 'mp3', 'flac')
             quality: Nivel de calidad ('low', 'medium', 'high')
             preserve_metadata: Si preservar metadatos originales
+            content_hash: SHA-256 del origen, si ya se calculó (para la caché)
         """
-        try:
-            input_path = Path(input_path)
-            output_path = Path(output_path)
+        return self.convert_file_multi(
+            input_path, [(output_path, target_format, quality)], preserve_metadata, content_hash
+        )[0]
+    
+    def convert_file_multi(self,
+                           input_path: Union[str, Path],
+                           targets: List[ConversionTarget],
+                           preserve_metadata: bool = True,
+                           content_hash: Optional[str] = None) -> List[bool]:
+        """
+        Convierte un archivo de audio a varios formatos y presets a la vez
+        
+        El origen se lee una sola vez y cada bloque se entrega en paralelo a
+        todos los codificadores (ver ConversionPipeline.encode_many). Las salidas
+        ya presentes en la caché se sirven desde ella y no se codifican.
+        
+        Args:
+            input_path: Ruta del archivo de entrada
+            targets: Lista de (ruta_salida, formato, calidad)
+            preserve_metadata: Si preservar metadatos originales
+            content_hash: SHA-256 del origen, si ya se calculó (para la caché)
             
+        Returns:
+            List[bool]: Éxito de cada salida, en el orden de targets
+        """
+        input_path = Path(input_path)
+        results = [False] * len(targets)
+        
+        try:
             # Validaciones
             if not input_path.exists():
                 raise FileNotFoundError(f"Archivo de entrada no encontrado: {input_path}")
             
-            if target_format not in ['wav', 'mp3', 'flac']:
-                raise AudioFormatError(f"Formato objetivo no soportado: {target_format}")
+            for _, target_format, _ in targets:
+                if target_format not in ['wav', 'mp3', 'flac']:
+                    raise AudioFormatError(f"Formato objetivo no soportado: {target_format}")
             
-            # Crear directorio de salida si no existe
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            self.detect_format(input_path)
+            
+            # Consultar la caché antes de codificar; el origen se hashea una sola
+            # vez y de ese hash se deriva la clave de cada salida
+            pending = []
+            cache_keys = {}
+            if content_hash is None and self.cache is not None:
+                content_hash = file_sha256(input_path)
+            for index, (output_path, target_format, quality) in enumerate(targets):
+                output_path = Path(output_path)
+                # Crear directorio de salida si no existe
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                
+                if self.cache is not None:
+                    cache_keys[index] = self.cache.key(input_path, target_format, quality,
+                                                       preserve_metadata, content_hash)
+                    if self.cache.fetch(cache_keys[index], target_format, output_path):
+                        console.print(f"[green]✓ Conversión desde caché:[/green] {output_path}")
+                        results[index] = True
+                        continue
+                pending.append(index)
             
-            # Obtener información del archivo original
-            original_info = self.get_audio_info(input_path)
+            if not pending:
+                return results
             
-            console.print(f"[blue]Convirtiendo:[/blue] {input_path.name} -> {target_format.upper()}")
+            # Leer metadatos del archivo original (solo etiquetas, sin decodificar)
+            metadata = self.read_tags(input_path) if preserve_metadata else {}
+            pipeline = ConversionPipeline(input_path, metadata)
             
-            # Realizar conversión según el formato objetivo
-            if target_format == 'wav':
-                success = self._convert_to_wav(input_path, output_path)
-            elif target_format == 'mp3':
-                success = self._convert_to_mp3(input_path, output_path, quality)
-            elif target_format == 'flac':
-                success = self._convert_to_flac(input_path, output_path, quality)
+            formats = ', '.join(targets[index][1].upper() for index in pending)
+            console.print(f"[blue]Convirtiendo:[/blue] {input_path.name} -> {formats}")
             
-            # Preservar metadatos si se solicita
-            if success and preserve_metadata and original_info['metadata']:
-                self._copy_metadata(original_info['metadata'], output_path, target_format)
+            encode_targets = [
+                (Path(targets[index][0]), targets[index][1],
+                 self._quality_settings(targets[index][1], targets[index][2]))
+                for index in pending
+            ]
+            errors = pipeline.encode_many(encode_targets)
             
-            if success:
+            for index, error in zip(pending, errors):
+                output_path, target_format, _ = targets[index]
+                if error is not None:
+                    console.print(f"[red]Error convirtiendo a {target_format.upper()}: {error}[/red]")
+                    console.print("[red]✗ Error en conversión[/red]")
+                    continue
+                
+                if index in cache_keys:
+                    self.cache.store(cache_keys[index], target_format, output_path)
                 console.print(f"[green]✓ Conversión exitosa:[/green] {output_path}")
-                return True
-            else:
-                console.print("[red]✗ Error en conversión[/red]")
-                return False
+                results[index] = True
+            
+            if pipeline.metadata and any(results[index] for index in pending):
+                console.print("[green]✓ Metadatos copiados exitosamente[/green]")
+            return results
                 
         except Exception as e:
             console.print(f"[red]Error al convertir {input_path}: {e}[/red]")
-            return False
+            return results
     
-    def _convert_to_wav(self, input_path: Path, output_path: Path) -> bool:
-        """Convierte archivo a formato WAV"""
-        try:
-            # Cargar audio con librosa (soporta múltiples formatos)
-            y, sr = librosa.load(str(input_path), sr=None)
-            
-            # Guardar como WAV
-            sf.write(str(output_path), y, sr, format='WAV')
-            return True
-            
-        except Exception as e:
-            console.print(f"[red]Error convirtiendo a WAV: {e}[/red]")
-            return False
-    
-    def _convert_to_mp3(self, input_path: Path, output_path: Path, quality: str) -> bool:
-        """Convierte archivo a formato MP3"""
-        try:
-            # Usar pydub para conversión a MP3
-            audio = AudioSegment.from_file(str(input_path))
-            
-            # Configurar parámetros de calidad
-            quality_settings = self.QUALITY_PRESETS['mp3'].get(quality, self.QUALITY_PRESETS['mp3']['high'])
+    @staticmethod
+    def plan_targets(output_path: Union[str, Path],
+                     specs: List[Tuple[str, str]]) -> List[ConversionTarget]:
+        """
+        Asigna una ruta de salida a cada par (formato, calidad)
+        
+        Con un único par se usa la ruta tal cual. Con varios, cada salida toma la
+        extensión de su formato y, si un formato se repite con distintos presets,
+        se añade la calidad al nombre (p. ej. master_high.mp3, master_low.mp3).
+        
+        Args:
+            output_path: Ruta de salida base
+            specs: Lista de (formato, calidad)
             
-            # Exportar a MP3
-            if 'bitrate' in quality_settings:
-                audio.export(str(output_path), format="mp3", bitrate=quality_settings['bitrate'])
+        Returns:
+            List[ConversionTarget]: Lista de (ruta_salida, formato, calidad)
+        """
+        output_path = Path(output_path)
+        if len(specs) == 1:
+            target_format, quality = specs[0]
+            return [(output_path, target_format, quality)]
+        
+        format_counts = {}
+        for target_format, _ in specs:
+            format_counts[target_format] = format_counts.get(target_format, 0) + 1
+        
+        targets = []
+        for target_format, quality in specs:
+            if format_counts[target_format] > 1:
+                path = output_path.with_name(f"{output_path.stem}_{quality}.{target_format}")
             else:
-                # Para VBR, usar parámetros personalizados
-                audio.export(str(output_path), format="mp3", parameters=quality_settings.get('parameters', []))
-            
-            return True
-            
-        except Exception as e:
-            console.print(f"[red]Error convirtiendo a MP3: {e}[/red]")
-            return False
+                path = output_path.with_suffix(f".{target_format}")
+            targets.append((path, target_format, quality))
+        return targets
     
-    def _convert_to_flac(self, input_path: Path, output_path: Path, quality: str) -> bool:
-        """Convierte archivo a formato FLAC"""
-        try:
-            # Cargar con librosa
-            y, sr = librosa.load(str(input_path), sr=None)
-            
-            # Configurar nivel de compresión FLAC
-            quality_settings = self.QUALITY_PRESETS['flac'].get(quality, self.QUALITY_PRESETS['flac']['high'])
-            compression_level = quality_settings['compression_level']
-            
-            # Guardar como FLAC
-            sf.write(str(output_path), y, sr, format='FLAC', subtype='PCM_16')
-            
-            return True
-            
-        except Exception as e:
-            console.print(f"[red]Error convirtiendo a FLAC: {e}[/red]")
-            return False
+    def read_tags(self, file_path: Union[str, Path]) -> Dict:
+        """Lee los metadatos comunes de un archivo sin decodificar el audio"""
+        audio_file = File(str(file_path))
+        if audio_file is None:
+            return {}
+        return self._common_tags(audio_file)
     
-    def _copy_metadata(self, metadata: Dict, output_path: Path, target_format: str):
-        """Copia metadatos al archivo convertido"""
-        try:
-            audio_file = File(str(output_path))
-            if audio_file is None:
-                return
-            
-            if target_format == 'mp3':
-                self._copy_id3_metadata(audio_file, metadata)
-            elif target_format == 'flac':
-                self._copy_vorbis_metadata(audio_file, metadata)
-            elif target_format == 'wav':
-                # WAV tiene soporte limitado de metadatos
-                console.print("[yellow]Info: WAV tiene soporte limitado de metadatos[/yellow]")
-                
-        except Exception as e:
-            console.print(f"[yellow]Advertencia: No se pudieron copiar metadatos: {e}[/yellow]")
-    
-    def _copy_id3_metadata(self, audio_file, metadata: Dict):
-        """Copia metadatos usando tags ID3 para MP3"""
-        from mutagen.id3 import TIT2, TPE1, TALB, TDRC, TCON, TRCK
-        
-        # Asegurar que existan tags ID3
-        if audio_file.tags is None:
-            audio_file.add_tags()
-        
-        tags = audio_file.tags
-        
-        # Mapear y agregar tags ID3
-        if metadata.get('title'):
-            tags.add(TIT2(encoding=3, text=metadata['title']))
-        if metadata.get('artist'):
-            tags.add(TPE1(encoding=3, text=metadata['artist']))
-        if metadata.get('album'):
-            tags.add(TALB(encoding=3, text=metadata['album']))
-        if metadata.get('date'):
-            tags.add(TDRC(encoding=3, text=metadata['date']))
-        if metadata.get('genre'):
-            tags.add(TCON(encoding=3, text=metadata['genre']))
-        if metadata.get('track'):
-            tags.add(TRCK(encoding=3, text=metadata['track']))
-        
-        audio_file.save()
-        console.print("[green]✓ Metadatos copiados exitosamente[/green]")
-    
-    def _copy_vorbis_metadata(self, audio_file, metadata: Dict):
-        """Copia metadatos usando Vorbis Comments para FLAC"""
-        # Mapeo directo para FLAC
-        tag_mapping = {
-            'title': 'TITLE',
-            'artist': 'ARTIST',
-            'album': 'ALBUM', 
-            'date': 'DATE',
-            'genre': 'GENRE',
-            'track': 'TRACKNUMBER'
+    def _common_tags(self, audio_file) -> Dict:
+        """Extrae los metadatos comunes de un objeto mutagen"""
+        return {
+            'title': self._get_tag(audio_file, ['TIT2', 'TITLE', 'Title']),
+            'artist': self._get_tag(audio_file, ['TPE1', 'ARTIST', 'Artist']),
+            'album': self._get_tag(audio_file, ['TALB', 'ALBUM', 'Album']),
+            'date': self._get_tag(audio_file, ['TDRC', 'DATE', 'Date']),
+            'genre': self._get_tag(audio_file, ['TCON', 'GENRE', 'Genre']),
+            'track': self._get_tag(audio_file, ['TRCK', 'TRACKNUMBER', 'TrackNumber'])
         }
-        
-        for field, value in metadata.items():
-            if value and field in tag_mapping:
-                audio_file[tag_mapping[field]] = str(value)
-        
-        audio_file.save()
-        console.print("[green]✓ Metadatos copiados exitosamente[/green]")
+    
+    def _quality_settings(self, target_format: str, quality: str) -> Dict:
+        """Obtiene la configuración del preset de calidad (por defecto 'high')"""
+        presets = self.QUALITY_PRESETS.get(target_format)
+        if not presets:
+            return {}
+        return presets.get(quality, presets['high'])
     
     def batch_convert(self, 
                      input_dir: Union[str, Path],
@@ -300,10 +312,19 @@ class AudioConverter:
                      target_format: str,
                      quality: str = 'high',
                      preserve_metadata: bool = True,
-                     recursive: bool = False) -> Tuple[int, int]:
+                     recursive: bool = False,
+                     workers: int = 1,
+                     incremental: bool = False,
+                     memory_budget: Optional[int] = MEMORY_BUDGET) -> Tuple[int, int]:
         """
         Conversión por lotes de múltiples archivos
         
+        Args:
+            workers: Número de procesos de conversión en paralelo (1 = en este proceso)
+            incremental: Si usar el manifiesto del directorio de salida para omitir
+                         los archivos ya convertidos y sin cambios
+            memory_budget: Bytes de audio decodificado simultáneo en el pool (None = sin límite)
+        
         Returns:
             Tuple[int, int]: (archivos_exitosos, archivos_con_error)
         """
@@ -313,58 +334,367 @@ class AudioConverter:
         if not input_dir.exists():
             raise FileNotFoundError(f"Directorio de entrada no encontrado: {input_dir}")
         
-        # Buscar archivos de audio
-        pattern = "**/*" if recursive else "*"
-        audio_files = []
-        
-        for ext in self.supported_input_formats:
-            audio_files.extend(input_dir.glob(f"{pattern}{ext}"))
-        
-        if not audio_files:
-            console.print(f"[yellow]No se encontraron archivos de audio en {input_dir}[/yellow]")
-            return 0, 0
-        
         # Crear directorio de salida
         output_dir.mkdir(parents=True, exist_ok=True)
         
+        manifest = None
+        settings = {'format': target_format, 'quality': quality, 'preserve_metadata': preserve_metadata}
+        if incremental:
+            manifest = ConversionManifest.load(output_dir)
+        
+        # Buscar archivos de audio: un solo recorrido, consumido a medida que avanza
+        # para que la conversión empiece antes de terminar la búsqueda
+        audio_files = iter_files(input_dir, self.supported_input_formats, recursive, workers=workers)
+        discovered = 0
+        skipped = 0
         successful = 0
         failed = 0
         
-        # Progreso con rich
-        with Progress(
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            "[progress.percentage]{task.percentage:>3.0f}%",
-            TimeRemainingColumn(),
-            console=console
-        ) as progress:
-            
-            task = progress.add_task(f"Convirtiendo a {target_format.upper()}", total=len(audio_files))
-            
-            for audio_file in audio_files:
-                # Generar nombre de archivo de salida
-                output_file = output_dir / f"{audio_file.stem}.{target_format}"
+        try:
+            # Progreso con rich
+            with Progress(
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                "[progress.percentage]{task.percentage:>3.0f}%",
+                TimeRemainingColumn(),
+                console=console
+            ) as progress:
                 
-                # Evitar sobrescribir si el archivo ya existe
-                counter = 1
-                while output_file.exists():
-                    output_file = output_dir / f"{audio_file.stem}_{counter}.{target_format}"
-                    counter += 1
+                task = progress.add_task(f"Convirtiendo a {target_format.upper()}", total=None)
                 
-                # Convertir archivo
-                if self.convert_file(audio_file, output_file, target_format, quality, preserve_metadata):
-                    successful += 1
-                else:
-                    failed += 1
+                def pending_files():
+                    nonlocal discovered, skipped
+                    for audio_file in audio_files:
+                        discovered += 1
+                        if manifest is not None and manifest.is_up_to_date(audio_file, settings):
+                            skipped += 1
+                            continue
+                        progress.update(task, total=discovered - skipped)
+                        yield audio_file
                 
-                progress.advance(task)
+                # Los nombres de salida se reservan aquí, antes de repartir el trabajo,
+                # para que dos procesos nunca elijan el mismo archivo
+                jobs = (
+                    (str(audio_file), str(output_file), target_format, quality, preserve_metadata)
+                    for audio_file, output_file in self._plan_output_files(pending_files(), output_dir,
+                                                                           target_format, manifest)
+                )
+                
+                for job, converted, content_hash in self._run_jobs(jobs, workers, memory_budget,
+                                                                   hash_sources=manifest is not None):
+                    if converted:
+                        successful += 1
+                        if manifest is not None:
+                            manifest.record(job[0], job[1], settings, content_hash)
+                    else:
+                        failed += 1
+                    
+                    progress.advance(task)
+        finally:
+            if manifest is not None:
+                manifest.save()
+        
+        if not discovered:
+            console.print(f"[yellow]No se encontraron archivos de audio en {input_dir}[/yellow]")
+            return 0, 0
         
         # Resumen
         console.print(f"\n[green]Conversión completada:[/green]")
         console.print(f"  ✓ Exitosos: {successful}")
         console.print(f"  ✗ Fallidos: {failed}")
+        if incremental:
+            console.print(f"  ↷ Sin cambios: {skipped}")
         
         return successful, failed
+    
+    def sync_library(self,
+                     input_dir: Union[str, Path],
+                     output_dir: Union[str, Path],
+                     target_format: str,
+                     quality: str = 'high',
+                     preserve_metadata: bool = True,
+                     workers: int = 1,
+                     memory_budget: Optional[int] = MEMORY_BUDGET) -> Dict[str, int]:
+        """
+        Mantiene un árbol de salida como espejo convertido del árbol de origen
+        
+        Cada origen se convierte en la misma ruta relativa dentro de output_dir.
+        El manifiesto del directorio de salida decide qué está al día; solo se
+        convierten los orígenes nuevos o modificados, y se eliminan las salidas
+        cuyo origen ya no existe.
+        
+        Args:
+            input_dir: Raíz del árbol de origen
+            output_dir: Raíz del árbol espejo
+            target_format: Formato objetivo ('wav', 'mp3', 'flac')
+            quality: Nivel de calidad
+            preserve_metadata: Si preservar metadatos originales
+            workers: Número de procesos de conversión en paralelo (1 = en este proceso)
+            memory_budget: Bytes de audio decodificado simultáneo en el pool (None = sin límite)
+        
+        Returns:
+            Dict[str, int]: Contadores 'converted', 'failed', 'unchanged' y 'removed'
+        """
+        input_dir = Path(input_dir)
+        output_dir = Path(output_dir)
+        
+        if not input_dir.exists():
+            raise FileNotFoundError(f"Directorio de entrada no encontrado: {input_dir}")
+        
+        output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = ConversionManifest.load(output_dir)
+        settings = {'format': target_format, 'quality': quality, 'preserve_metadata': preserve_metadata}
+        counts = {'converted': 0, 'failed': 0, 'unchanged': 0, 'removed': 0}
+        present = []
+        
+        # Salidas registradas y su origen, para no asignar una salida ajena
+        owners = {manifest.output_dir / entry['output']: source
+                  for source, entry in manifest.entries.items()}
+        reserved = set()
+        
+        def pending_jobs():
+            for audio_file in iter_files(input_dir, self.supported_input_formats,
+                                         recursive=True, workers=workers):
+                present.append(audio_file)
+                if manifest.is_up_to_date(audio_file, settings):
+                    counts['unchanged'] += 1
+                    reserved.add(manifest.output_for(audio_file))
+                    continue
+                
+                output_file = self._mirror_output_file(audio_file, input_dir, output_dir,
+                                                       target_format, manifest, owners, reserved)
+                reserved.add(output_file)
+                progress.update(task, total=len(present) - counts['unchanged'])
+                yield (str(audio_file), str(output_file), target_format, quality, preserve_metadata)
+        
+        try:
+            with Progress(
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                "[progress.percentage]{task.percentage:>3.0f}%",
+                TimeRemainingColumn(),
+                console=console
+            ) as progress:
+                
+                task = progress.add_task(f"Sincronizando {target_format.upper()}", total=None)
+                
+                for job, converted, content_hash in self._run_jobs(pending_jobs(), workers, memory_budget,
+                                                                   hash_sources=True):
+                    if converted:
+                        counts['converted'] += 1
+                        previous = manifest.output_for(job[0])
+                        if previous is not None and previous != Path(job[1]):
+                            # La salida cambió de nombre (p. ej. otro formato): retirar la anterior
+                            self._remove_output(previous, output_dir)
+                        manifest.record(job[0], job[1], settings, content_hash)
+                        if counts['converted'] % MANIFEST_SAVE_INTERVAL == 0:
+                            manifest.save()
+                    else:
+                        counts['failed'] += 1
+                    
+                    progress.advance(task)
+            
+            # Retirar las salidas de orígenes eliminados
+            for orphan in manifest.prune(input_dir, present):
+                if self._remove_output(orphan, output_dir):
+                    counts['removed'] += 1
+        finally:
+            manifest.save()
+        
+        # Resumen
+        console.print(f"\n[green]Sincronización completada:[/green]")
+        console.print(f"  ✓ Convertidos: {counts['converted']}")
+        console.print(f"  ✗ Fallidos: {counts['failed']}")
+        console.print(f"  ↷ Sin cambios: {counts['unchanged']}")
+        console.print(f"  🗑 Eliminados: {counts['removed']}")
+        
+        return counts
+    
+    @staticmethod
+    def _mirror_output_file(audio_file: Path, input_dir: Path, output_dir: Path,
+                            target_format: str, manifest: ConversionManifest,
+                            owners: Dict[Path, str], reserved: set) -> Path:
+        """
+        Ruta espejo de un origen dentro del árbol de salida
+        
+        Si dos orígenes del mismo directorio comparten nombre base (p. ej.
+        tema.wav y tema.flac), el segundo recibe un sufijo _N.
+        """
+        relative = audio_file.relative_to(input_dir)
+        output_file = output_dir / relative.parent / f"{relative.stem}.{target_format}"
+        
+        previous = manifest.output_for(audio_file)
+        if previous is not None and previous.suffix == output_file.suffix \
+                and previous.parent == output_file.parent:
+            return previous
+        
+        source_key = str(audio_file.resolve())
+        counter = 1
+        candidate = output_file
+        while candidate in reserved or owners.get(candidate, source_key) != source_key \
+                or (candidate not in owners and candidate.exists()):
+            candidate = output_file.with_name(f"{relative.stem}_{counter}.{target_format}")
+            counter += 1
+        return candidate
+    
+    @staticmethod
+    def _remove_output(output_file: Path, output_dir: Path) -> bool:
+        """Elimina una salida y los directorios que queden vacíos hasta output_dir"""
+        try:
+            output_file.unlink()
+        except FileNotFoundError:
+            return False
+        
+        directory = output_file.parent
+        while directory != output_dir and output_dir in directory.parents:
+            try:
+                directory.rmdir()
+            except OSError:
+                break  # No vacío
+            directory = directory.parent
+        return True
+    
+    def _run_jobs(self, jobs: Iterable[ConversionJob], workers: int,
+                  memory_budget: Optional[int] = MEMORY_BUDGET,
+                  hash_sources: bool = False) -> Iterator[Tuple[ConversionJob, bool, Optional[str]]]:
+        """
+        Ejecuta trabajos de conversión, en este proceso o en un pool de procesos
+        
+        Con pool, los trabajos se reparten con MemoryAwareScheduler: se leen de
+        forma perezosa (la conversión avanza mientras la búsqueda de archivos
+        sigue generando trabajos), los más largos se lanzan primero y solo se
+        admiten mientras su audio decodificado quepa en memory_budget.
+        
+        Args:
+            hash_sources: Si devolver el SHA-256 de cada origen (para el manifiesto).
+                          Se calcula junto a la conversión, en el proceso que la
+                          hace, y se reutiliza como clave de la caché
+        
+        Yields:
+            Tuple[ConversionJob, bool, Optional[str]]: (trabajo, éxito, hash del origen)
+            a medida que terminan
+        """
+        if workers > 1:
+            scheduler = MemoryAwareScheduler(workers, memory_budget,
+                                             estimate=lambda job: estimate_job(job[0]))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self.cache,)) as executor:
+                convert = partial(_convert_job, hash_source=hash_sources)
+                for job, future in scheduler.run(executor, convert, jobs):
+                    content_hash = None
+                    try:
+                        converted, content_hash, cache_counters = future.result()
+                        if self.cache is not None:
+                            self.cache.merge_stats(cache_counters)
+                    except Exception as e:
+                        console.print(f"[red]Error al convertir {job[0]}: {e}[/red]")
+                        converted = False
+                    yield job, converted, content_hash
+            if self.cache is not None:
+                # Cada proceso solo conoce sus propias entradas: reajustar al total real
+                self.cache.evict()
+        else:
+            for job in jobs:
+                # Convertir archivo
+                yield (job,) + _convert_hashed(self, job, hash_sources)
+    
+    @staticmethod
+    def _plan_output_files(audio_files: Iterable[Path], output_dir: Path,
+                           target_format: str,
+                           manifest: Optional[ConversionManifest] = None) -> Iterator[Tuple[Path, Path]]:
+        """
+        Asigna a cada archivo un nombre de salida único dentro del lote
+        
+        Con manifiesto, un origen ya registrado reutiliza su salida anterior
+        (se sobrescribe) en lugar de generar un nombre con sufijo nuevo.
+        
+        Yields:
+            Tuple[Path, Path]: (origen, salida) a medida que se consumen los orígenes
+        """
+        reserved = set()
+        
+        if manifest is not None:
+            # Las salidas registradas pertenecen a sus orígenes y no se asignan a otros
+            reserved.update(manifest.output_dir / entry['output'] for entry in manifest.entries.values())
+        
+        for audio_file in audio_files:
+            previous = manifest.output_for(audio_file) if manifest is not None else None
+            if previous is not None and previous.suffix == f".{target_format}":
+                yield audio_file, previous
+                continue
+            
+            # Generar nombre de archivo de salida
+            output_file = output_dir / f"{audio_file.stem}.{target_format}"
+            
+            # Evitar sobrescribir archivos existentes o ya asignados en este lote
+            counter = 1
+            while output_file in reserved or output_file.exists():
+                output_file = output_dir / f"{audio_file.stem}_{counter}.{target_format}"
+                counter += 1
+            
+            reserved.add(output_file)
+            yield audio_file, output_file
+
+def parse_format_specs(format_args: List[str], default_quality: str = 'high') -> List[Tuple[str, str]]:
+    """
+    Convierte especificaciones "formato[:calidad]" en pares (formato, calidad)
+    
+    Raises:
+        ValueError: Si algún formato no está soportado
+    """
+    specs = []
+    for format_arg in format_args:
+        target_format, _, quality = format_arg.partition(':')
+        target_format = target_format.lower()
+        if target_format not in ('wav', 'mp3', 'flac'):
+            raise ValueError(f"Formato de salida no soportado: {target_format}")
+        specs.append((target_format, quality or default_quality))
+    return specs
+
+# Conversor de cada proceso del pool, creado una vez por proceso
+_worker_converter: Optional[AudioConverter] = None
+
+def _init_worker(cache: Optional[ConversionCache]):
+    """Inicializa el conversor de un proceso del pool"""
+    global _worker_converter
+    mark_worker_process()
+    _worker_converter = AudioConverter(cache=cache)
+
+def _convert_hashed(converter: AudioConverter, job: ConversionJob,
+                    hash_source: bool) -> Tuple[bool, Optional[str]]:
+    """
+    Convierte un trabajo calculando antes, si se pide, el hash del origen
+    
+    Returns:
+        Tuple[bool, Optional[str]]: (éxito, hash del origen o None)
+    """
+    content_hash = None
+    if hash_source:
+        try:
+            content_hash = file_sha256(job[0])
+        except OSError as e:
+            console.print(f"[red]Error al convertir {job[0]}: {e}[/red]")
+            return False, None
+    return converter.convert_file(*job, content_hash=content_hash), content_hash
+
+def _convert_job(job: ConversionJob,
+                 hash_source: bool = False) -> Tuple[bool, Optional[str], Dict[str, int]]:
+    """
+    Ejecuta una conversión dentro de un proceso del pool
+    
+    Returns:
+        Tuple[bool, Optional[str], Dict[str, int]]: (éxito, hash del origen si se
+        pidió, contadores de caché producidos por el trabajo)
+    """
+    converter = _worker_converter or AudioConverter()
+    cache = converter.cache
+    before = cache.counters() if cache is not None else {}
+    
+    converted, content_hash = _convert_hashed(converter, job, hash_source)
+    
+    if cache is None:
+        return converted, content_hash, {}
+    return converted, content_hash, {name: value - before[name] for name, value in cache.counters().items()}
 
 def interactive_mode():
     """Modo interactivo para conversión de archivos"""
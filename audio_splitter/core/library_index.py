@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Library Index - Catálogo SQLite de etiquetas e información de stream de una
+biblioteca de audio, actualizado de forma incremental
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from rich.console import Console
+from rich.progress import Progress, BarColumn, TextColumn, TimeRemainingColumn
+
+from ..config.settings import SUPPORTED_INPUT_FORMATS, METADATA_WORKERS, LIBRARY_INDEX_PATH
+from ..utils.discovery import iter_files
+from .metadata_manager import MetadataEditor, TEXT_FIELDS
+
+console = Console()
+
+# Se incrementa al cambiar el esquema; un índice de otra versión se reconstruye
+INDEX_SCHEMA_VERSION = 1
+
+# Filas escritas por transacción durante un escaneo
+INDEX_COMMIT_INTERVAL = 500
+
+STREAM_FIELDS = ('codec', 'duration', 'sample_rate', 'channels', 'bitrate', 'bits_per_sample')
+
+# Columnas por las que se puede filtrar en query (nunca se interpolan otras)
+QUERY_FIELDS = TEXT_FIELDS + STREAM_FIELDS + ('artwork_hash',)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS artwork (
+    hash TEXT PRIMARY KEY,
+    mime TEXT,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    indexed_at REAL NOT NULL,
+    error TEXT,
+    {', '.join(f'{name} TEXT' for name in TEXT_FIELDS)},
+    codec TEXT,
+    duration REAL,
+    sample_rate INTEGER,
+    channels INTEGER,
+    bitrate INTEGER,
+    bits_per_sample INTEGER,
+    artwork_hash TEXT REFERENCES artwork(hash)
+);
+CREATE INDEX IF NOT EXISTS files_album ON files (albumartist, album);
+CREATE INDEX IF NOT EXISTS files_artist ON files (artist);
+CREATE INDEX IF NOT EXISTS files_artwork ON files (artwork_hash);
+"""
+
+_FILE_COLUMNS = ('path', 'size', 'mtime_ns', 'indexed_at', 'error') + TEXT_FIELDS + STREAM_FIELDS + ('artwork_hash',)
+
+# Lectura de un archivo: (metadatos, stream) o el error
+_ReadResult = Tuple[Optional[Any], Optional[Dict[str, Any]], Optional[str]]
+
+
+class LibraryIndex:
+    """
+    Catálogo de una biblioteca de audio en SQLite, indexado por ruta.
+
+    Cada archivo guarda tamaño, mtime, información del stream y todos los
+    campos de texto de AudioMetadata; las carátulas se guardan una sola vez por
+    hash SHA-256 de su contenido. Un nuevo escaneo solo vuelve a leer los
+    archivos cuyo tamaño o mtime cambió, elimina los que desaparecieron y
+    registra también los que no se pudieron leer (con su error) para no
+    reintentarlos mientras no cambien. Las consultas se responden desde el
+    índice sin abrir ningún archivo de audio.
+    """
+
+    def __init__(self, db_path: Union[str, Path] = LIBRARY_INDEX_PATH,
+                 editor: Optional[MetadataEditor] = None):
+        """
+        Args:
+            db_path: Archivo SQLite del índice
+            editor: Editor usado para leer los archivos
+        """
+        self.db_path = Path(db_path)
+        self.editor = editor or MetadataEditor()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def __enter__(self) -> 'LibraryIndex':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Conexión abierta en el primer uso, con el esquema al día"""
+        if self._connection is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.db_path))
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != INDEX_SCHEMA_VERSION:
+                # Índice de otra versión: es una caché, se reconstruye
+                connection.executescript("DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS artwork;")
+            connection.executescript(_SCHEMA)
+            connection.execute(f"PRAGMA user_version = {INDEX_SCHEMA_VERSION}")
+            self._connection = connection
+        return self._connection
+
+    def close(self):
+        """Cierra la conexión"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def scan(self, root: Union[str, Path], workers: int = METADATA_WORKERS,
+             show_progress: bool = True) -> Dict[str, int]:
+        """
+        Actualiza el índice con el contenido de un directorio
+
+        Args:
+            root: Directorio a recorrer (recursivamente)
+            workers: Hilos para leer las etiquetas de los archivos nuevos o modificados
+            show_progress: Si mostrar una barra de progreso
+
+        Returns:
+            Dict[str, int]: Archivos añadidos, actualizados, sin cambios, eliminados y con error
+        """
+        root = Path(root).resolve()
+        if not root.is_dir():
+            raise FileNotFoundError(f"Directorio no encontrado: {root}")
+
+        connection = self.connection
+        known = {row['path']: (row['size'], row['mtime_ns'])
+                 for row in connection.execute(
+                     "SELECT path, size, mtime_ns FROM files WHERE path >= ? AND path < ?",
+                     self._prefix_range(root))}
+        counts = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0, 'failed': 0}
+        present = set()
+
+        def changed_files():
+            for path in iter_files(root, SUPPORTED_INPUT_FORMATS, recursive=True):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                key = str(path)
+                present.add(key)
+                if known.get(key) == (stat.st_size, stat.st_mtime_ns):
+                    counts['unchanged'] += 1
+                    continue
+                yield path, stat
+
+        pending_rows = 0
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            "[progress.percentage]{task.percentage:>3.0f}%",
+            TimeRemainingColumn(),
+            console=console,
+            disable=not show_progress
+        ) as progress:
+            task = progress.add_task("Indexando", total=None)
+
+            for (path, stat), (metadata, stream, error) in self._read_all(changed_files(), workers,
+                                                                         progress, task):
+                counts['updated' if str(path) in known else 'added'] += 1
+                if error is not None:
+                    counts['failed'] += 1
+                self._store(path, stat, metadata, stream, error)
+                pending_rows += 1
+                if pending_rows >= INDEX_COMMIT_INTERVAL:
+                    connection.commit()
+                    pending_rows = 0
+
+        removed = [(path,) for path in known if path not in present]
+        connection.executemany("DELETE FROM files WHERE path = ?", removed)
+        counts['removed'] = len(removed)
+        connection.execute("DELETE FROM artwork WHERE hash NOT IN "
+                           "(SELECT artwork_hash FROM files WHERE artwork_hash IS NOT NULL)")
+        connection.commit()
+        return counts
+
+    def _read_all(self, files: Iterable[Tuple[Path, os.stat_result]], workers: int,
+                  progress: Progress, task) -> Iterable[Tuple[Tuple[Path, os.stat_result], _ReadResult]]:
+        """Lee los archivos en un pool de hilos; los resultados se escriben en el hilo principal"""
+        files = iter(files)
+        in_flight: Dict[Future, Tuple[Path, os.stat_result]] = {}
+        max_in_flight = max(1, workers) * 4
+        submitted = 0
+        exhausted = False
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            while True:
+                while not exhausted and len(in_flight) < max_in_flight:
+                    item = next(files, None)
+                    if item is None:
+                        exhausted = True
+                        progress.update(task, total=submitted)
+                    else:
+                        in_flight[executor.submit(self._read, item[0])] = item
+                        submitted += 1
+
+                if not in_flight:
+                    return
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield in_flight.pop(future), future.result()
+                    progress.advance(task)
+
+    def _read(self, path: Path) -> _ReadResult:
+        """Lee un archivo sin lanzar excepciones"""
+        try:
+            # La carátula se carga del archivo ya abierto solo para hashearla y se descarta al guardar
+            metadata, stream = self.editor.inspect(path, load_artwork=True)
+            return metadata, stream, None
+        except Exception as e:
+            return None, None, str(e) or type(e).__name__
+
+    def _store(self, path: Path, stat: os.stat_result, metadata, stream: Optional[Dict[str, Any]],
+               error: Optional[str]):
+        """Inserta o reemplaza la fila de un archivo (y su carátula, si es nueva)"""
+        connection = self.connection
+        artwork_hash = None
+        data = metadata.load_artwork() if metadata is not None else None
+        if data:
+            artwork_hash = hashlib.sha256(data).hexdigest()
+            connection.execute("INSERT OR IGNORE INTO artwork (hash, mime, size, data) VALUES (?, ?, ?, ?)",
+                               (artwork_hash, metadata.artwork_mime, len(data), data))
+
+        values = [str(path), stat.st_size, stat.st_mtime_ns, time.time(), error]
+        values += [getattr(metadata, name, None) for name in TEXT_FIELDS]
+        values += [(stream or {}).get(name) for name in STREAM_FIELDS]
+        values.append(artwork_hash)
+        connection.execute(
+            f"INSERT OR REPLACE INTO files ({', '.join(_FILE_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in _FILE_COLUMNS)})", values)
+
+    @staticmethod
+    def _prefix_range(root: Path) -> Tuple[str, str]:
+        """Rango de rutas [inicio, fin) dentro de un directorio, para usar la clave primaria"""
+        prefix = str(root).rstrip(os.sep) + os.sep
+        return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+    def find(self,
+             equals: Optional[Dict[str, str]] = None,
+             missing: Iterable[str] = (),
+             under: Optional[Union[str, Path]] = None,
+             limit: Optional[int] = None) -> List[sqlite3.Row]:
+        """
+        Busca archivos en el índice
+
+        Args:
+            equals: Campo -> valor exacto
+            missing: Campos que deben estar vacíos
+            under: Limitar a un directorio
+            limit: Número máximo de resultados
+
+        Returns:
+            List[sqlite3.Row]: Filas de los archivos, ordenadas por ruta
+
+        Raises:
+            ValueError: Si algún campo no se puede consultar
+        """
+        equals = equals or {}
+        missing = list(missing)
+        unknown = [name for name in list(equals) + missing if name not in QUERY_FIELDS]
+        if unknown:
+            raise ValueError(f"Campos no consultables: {', '.join(unknown)} "
+                             f"(disponibles: {', '.join(QUERY_FIELDS)})")
+
+        clauses = ["error IS NULL"]
+        params: List[Any] = []
+        for name, value in equals.items():
+            clauses.append(f"{name} = ?")
+            params.append(value)
+        for name in missing:
+            clauses.append(f"({name} IS NULL OR {name} = '')")
+        if under is not None:
+            clauses.append("path >= ? AND path < ?")
+            params.extend(self._prefix_range(Path(under).resolve()))
+
+        sql = f"SELECT * FROM files WHERE {' AND '.join(clauses)} ORDER BY path"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self.connection.execute(sql, params).fetchall()
+
+    def album_summary(self, under: Optional[Union[str, Path]] = None) -> List[sqlite3.Row]:
+        """
+        Pistas y duración total por álbum
+
+        Returns:
+            List[sqlite3.Row]: Filas (albumartist, album, tracks, duration), ordenadas
+        """
+        sql = ("SELECT COALESCE(albumartist, artist) AS albumartist, album, "
+               "COUNT(*) AS tracks, SUM(duration) AS duration FROM files WHERE error IS NULL")
+        params: List[Any] = []
+        if under is not None:
+            sql += " AND path >= ? AND path < ?"
+            params.extend(self._prefix_range(Path(under).resolve()))
+        sql += " GROUP BY 1, 2 ORDER BY 1, 2"
+        return self.connection.execute(sql, params).fetchall()
+
+    def failures(self) -> List[sqlite3.Row]:
+        """Archivos que no se pudieron leer en el último escaneo, con su error"""
+        return self.connection.execute(
+            "SELECT path, error FROM files WHERE error IS NOT NULL ORDER BY path").fetchall()
+
+    def artwork(self, artwork_hash: str) -> Optional[Tuple[bytes, str]]:
+        """Carátula guardada por hash: (datos, mime)"""
+        row = self.connection.execute("SELECT data, mime FROM artwork WHERE hash = ?",
+                                      (artwork_hash,)).fetchone()
+        return (row['data'], row['mime']) if row else None
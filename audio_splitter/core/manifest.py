@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Conversion Manifest - Registro persistente de conversiones por lotes para
+re-sincronizaciones incrementales
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from ..utils.file_utils import file_sha256
+
+MANIFEST_FILENAME = ".audio_splitter_manifest.json"
+MANIFEST_VERSION = 1
+
+
+class ConversionManifest:
+    """
+    Manifiesto de conversiones guardado en el directorio de salida.
+
+    Cada entrada, indexada por la ruta absoluta del origen, guarda tamaño,
+    mtime y hash SHA-256 del origen, la configuración de conversión usada y el
+    archivo de salida (relativo al directorio de salida). Un origen cuyo tamaño
+    y mtime coinciden se considera al día sin leerlo; si solo cambia el mtime,
+    se compara el hash antes de decidir volver a convertir.
+    """
+
+    def __init__(self, output_dir: Union[str, Path]):
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / MANIFEST_FILENAME
+        self.entries: Dict[str, Dict] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, output_dir: Union[str, Path]) -> 'ConversionManifest':
+        """Carga el manifiesto del directorio de salida (vacío si no existe o está dañado)"""
+        manifest = cls(output_dir)
+        try:
+            with open(manifest.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                manifest.entries = data.get('entries', {})
+        except (OSError, ValueError):
+            pass
+        return manifest
+
+    @staticmethod
+    def _key(source: Union[str, Path]) -> str:
+        return str(Path(source).resolve())
+
+    def output_for(self, source: Union[str, Path]) -> Optional[Path]:
+        """Archivo de salida registrado para un origen, si existe entrada"""
+        entry = self.entries.get(self._key(source))
+        if entry is None:
+            return None
+        return self.output_dir / entry['output']
+
+    def is_up_to_date(self, source: Union[str, Path], settings: Dict) -> bool:
+        """
+        Indica si la salida registrada para un origen sigue siendo válida
+
+        Args:
+            source: Archivo de origen
+            settings: Configuración de conversión (formato, calidad...)
+
+        Returns:
+            bool: True si no hace falta volver a convertir
+        """
+        entry = self.entries.get(self._key(source))
+        if entry is None or entry.get('settings') != settings:
+            return False
+
+        if not (self.output_dir / entry['output']).exists():
+            return False
+
+        stat = Path(source).stat()
+        if stat.st_size != entry['size']:
+            return False
+        if stat.st_mtime_ns == entry['mtime_ns']:
+            return True
+
+        # Solo cambió el mtime (copia, touch...): decidir por contenido
+        if file_sha256(source) != entry['sha256']:
+            return False
+
+        entry['mtime_ns'] = stat.st_mtime_ns
+        self._dirty = True
+        return True
+
+    def record(self, source: Union[str, Path], output: Union[str, Path], settings: Dict,
+               sha256: Optional[str] = None):
+        """
+        Registra una conversión correcta
+
+        Args:
+            source: Archivo de origen
+            output: Archivo de salida
+            settings: Configuración de conversión usada
+            sha256: Hash del origen ya calculado (p. ej. por el proceso que convirtió);
+                    si no se indica, se lee el origen aquí
+        """
+        stat = Path(source).stat()
+        self.entries[self._key(source)] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': sha256 or file_sha256(source),
+            'settings': settings,
+            'output': os.path.relpath(output, self.output_dir)
+        }
+        self._dirty = True
+
+    def remove(self, source: Union[str, Path]):
+        """Elimina la entrada de un origen"""
+        if self.entries.pop(self._key(source), None) is not None:
+            self._dirty = True
+
+    def prune(self, source_root: Union[str, Path], present: Iterable[Union[str, Path]]) -> List[Path]:
+        """
+        Elimina las entradas cuyo origen desapareció de un árbol de origen
+
+        Solo se consideran las entradas con origen dentro de source_root, de
+        modo que un mismo directorio de salida puede recibir varios árboles.
+
+        Args:
+            source_root: Raíz del árbol de origen recorrido
+            present: Orígenes encontrados en el recorrido
+
+        Returns:
+            List[Path]: Salidas registradas de los orígenes eliminados
+        """
+        root = self._key(source_root)
+        prefix = root.rstrip(os.sep) + os.sep
+        present_keys = {self._key(source) for source in present}
+        orphaned = []
+
+        for key in list(self.entries):
+            if not key.startswith(prefix) or key in present_keys:
+                continue
+            if os.path.exists(key):
+                # Sigue existiendo (p. ej. fuera del filtro de extensiones)
+                continue
+            orphaned.append(self.output_dir / self.entries.pop(key)['output'])
+            self._dirty = True
+
+        return orphaned
+
+    def save(self):
+        """Guarda el manifiesto de forma atómica si hubo cambios"""
+        if not self._dirty:
+            return
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'entries': self.entries}, f,
+                      ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.path)
+        self._dirty = False
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Batch Metadata Editor - Edición de metadatos por lotes sobre MetadataEditor
+"""
+
+import glob
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from rich.console import Console
+from rich.progress import Progress, BarColumn, TextColumn, TimeRemainingColumn
+
+from ..config.settings import SUPPORTED_INPUT_FORMATS, METADATA_WORKERS
+from ..utils.discovery import iter_files, normalize_extensions
+from .manifest import MANIFEST_FILENAME, ConversionManifest
+from .metadata_manager import MetadataEditor, TEXT_FIELDS
+from .metadata_templates import CompiledTemplate
+
+console = Console()
+
+# Listas de archivos aceptadas como origen del lote (una ruta por línea)
+FILE_LIST_EXTENSIONS = ('.txt', '.m3u', '.m3u8')
+
+
+@dataclass
+class BatchResult:
+    """Resultado de una edición por lotes"""
+    updated: int = 0
+    failures: List[Tuple[Path, str]] = field(default_factory=list)
+
+
+def resolve_batch_sources(source: Union[str, Path]) -> Iterator[Path]:
+    """
+    Genera los archivos de audio de un lote sin repetir ninguno
+
+    El origen puede ser un directorio (se recorre recursivamente), un
+    manifiesto de conversión (se editan sus salidas), una lista de archivos
+    (.txt/.m3u, rutas relativas a la propia lista, en su orden) o un patrón
+    glob (admite **).
+
+    Args:
+        source: Directorio, manifiesto, lista o patrón glob
+
+    Returns:
+        Iterator[Path]: Archivos de audio a editar
+
+    Raises:
+        ValueError: Si el origen es un .json que no es un manifiesto de conversión
+    """
+    path = Path(source)
+
+    if path.is_dir():
+        candidates = iter_files(path, SUPPORTED_INPUT_FORMATS, recursive=True)
+    elif path.is_file() and path.name == MANIFEST_FILENAME:
+        manifest = ConversionManifest.load(path.parent)
+        candidates = (manifest.output_for(key) for key in list(manifest.entries))
+    elif path.is_file() and path.suffix.lower() == '.json':
+        raise ValueError(f"{path} no es un manifiesto de conversión "
+                         f"(se esperaba un archivo {MANIFEST_FILENAME})")
+    elif path.is_file() and path.suffix.lower() in FILE_LIST_EXTENSIONS:
+        candidates = _read_file_list(path)
+    elif path.is_file():
+        candidates = iter([path])
+    else:
+        # Ordenado: el orden del lote numera las pistas al aplicar plantillas
+        candidates = (Path(match) for match in sorted(glob.iglob(str(source), recursive=True)))
+
+    return _unique_audio_files(candidates)
+
+
+def _unique_audio_files(candidates: Iterable[Path]) -> Iterator[Path]:
+    """Filtra los candidatos a archivos de audio, sin repetir ninguno"""
+    extensions = normalize_extensions(SUPPORTED_INPUT_FORMATS)
+    seen = set()
+    for candidate in candidates:
+        if candidate.suffix.lower() not in extensions:
+            continue
+        key = candidate.resolve()
+        if key in seen:
+            continue
+        seen.add(key)
+        yield candidate
+
+
+def _read_file_list(list_path: Path) -> Iterator[Path]:
+    """Rutas de una lista de archivos (ignora líneas vacías y comentarios #)"""
+    with open(list_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            entry = Path(line)
+            yield entry if entry.is_absolute() else list_path.parent / entry
+
+
+class BatchMetadataEditor:
+    """
+    Aplica los mismos cambios de campos a muchos archivos.
+
+    Cada archivo se abre y se guarda una sola vez (MetadataEditor.update_metadata)
+    en un pool de hilos: mutagen pasa casi todo el tiempo en E/S. Los archivos se
+    leen del iterable de forma perezosa con un número acotado de tareas en curso,
+    de modo que un glob de miles de archivos empieza a editarse enseguida. Un
+    fallo no detiene el lote; se acumula en el resultado.
+    """
+
+    def __init__(self, editor: Optional[MetadataEditor] = None, workers: int = METADATA_WORKERS):
+        """
+        Args:
+            editor: Editor a usar (sin estado, se comparte entre hilos)
+            workers: Hilos del pool
+        """
+        self.editor = editor or MetadataEditor()
+        self.workers = max(1, workers)
+
+    def apply(self, files: Iterable[Union[str, Path]], changes: Dict[str, Optional[str]],
+              show_progress: bool = True) -> BatchResult:
+        """
+        Aplica los mismos cambios a todos los archivos
+
+        Args:
+            files: Archivos a editar
+            changes: Campo -> nuevo valor (None o cadena vacía borra el campo)
+            show_progress: Si mostrar una barra de progreso
+
+        Returns:
+            BatchResult: Archivos actualizados y fallos (archivo, motivo)
+
+        Raises:
+            ValueError: Si no hay cambios o algún campo no es editable
+        """
+        if not changes:
+            raise ValueError("No se indicaron cambios de metadatos")
+        unknown = [name for name in changes if name not in TEXT_FIELDS]
+        if unknown:
+            raise ValueError(f"Campos no editables: {', '.join(unknown)}")
+
+        jobs = ((Path(file_path), changes) for file_path in files)
+        return self._run(jobs, show_progress)
+
+    def apply_template(self, files: Iterable[Union[str, Path]], template: CompiledTemplate,
+                       show_progress: bool = True) -> BatchResult:
+        """
+        Aplica una plantilla compilada a todos los archivos
+
+        {track} y {total} numeran los archivos en el orden recibido, por lo que
+        el lote se materializa antes de empezar.
+
+        Args:
+            files: Archivos a editar
+            template: Plantilla compilada (MetadataTemplate.compile)
+            show_progress: Si mostrar una barra de progreso
+
+        Returns:
+            BatchResult: Archivos actualizados y fallos (archivo, motivo)
+        """
+        files = [Path(file_path) for file_path in files]
+        total = len(files)
+        jobs = ((file_path, template.render(file_path, track, total))
+                for track, file_path in enumerate(files, start=1))
+        return self._run(jobs, show_progress)
+
+    def _run(self, jobs: Iterable[Tuple[Path, Dict]], show_progress: bool) -> BatchResult:
+        """Ejecuta update_metadata para cada (archivo, cambios) con tareas en curso acotadas"""
+        result = BatchResult()
+        jobs = iter(jobs)
+        in_flight: Dict[Future, Path] = {}
+        max_in_flight = self.workers * 4
+        submitted = 0
+        exhausted = False
+
+        try:
+            with Progress(
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                "[progress.percentage]{task.percentage:>3.0f}%",
+                TimeRemainingColumn(),
+                console=console,
+                disable=not show_progress
+            ) as progress, ThreadPoolExecutor(max_workers=self.workers) as executor:
+
+                task = progress.add_task("Editando metadatos", total=None)
+
+                while True:
+                    while not exhausted and len(in_flight) < max_in_flight:
+                        job = next(jobs, None)
+                        if job is None:
+                            exhausted = True
+                            progress.update(task, total=submitted)
+                        else:
+                            file_path, changes = job
+                            in_flight[executor.submit(self.editor.update_metadata, file_path, changes)] = file_path
+                            submitted += 1
+
+                    if not in_flight:
+                        break
+
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        file_path = in_flight.pop(future)
+                        try:
+                            future.result()
+                            result.updated += 1
+                        except Exception as e:
+                            result.failures.append((file_path, str(e) or type(e).__name__))
+                        progress.advance(task)
+        finally:
+            # El pool de redimensionado de carátulas no sobrevive al lote (su caché sí)
+            artwork_store = getattr(self.editor, 'artwork_store', None)
+            if artwork_store is not None:
+                artwork_store.close()
+
+        return result
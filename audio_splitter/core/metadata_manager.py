@@ -8,18 +8,17 @@ import os
 import sys
 import json
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Optional, Set, Union, Any, Tuple
+from dataclasses import dataclass, asdict, replace
 
 # Bibliotecas de metadatos
 from mutagen import File
 from mutagen.mp3 import MP3
 from mutagen.flac import FLAC, Picture
-from mutagen.mp4 import MP4
+from mutagen.mp4 import MP4, MP4Cover
 from mutagen.wave import WAVE
 from mutagen.aiff import AIFF
 from mutagen.id3 import ID3NoHeaderError, TIT2, TPE1, TALB, TPE2, TDRC, TCON, TRCK, TPOS, TCOM, COMM, APIC, ID3
-from mutagen._vorbis import VCommentDict
 
 # Pillow para manejo de imágenes (opcional)
 try:
@@ -28,6 +27,9 @@ try:
 except ImportError:
     PILLOW_AVAILABLE = False
 
+from ..config.settings import MAX_ARTWORK_SIZE
+from .artwork_store import ArtworkStore, shared_artwork_store
+
 # UI y utilidades
 from rich.console import Console
 from rich.table import Table
@@ -36,6 +38,48 @@ from rich.prompt import Prompt, Confirm
 
 console = Console()
 
+@dataclass(frozen=True)
+class ArtworkHandle:
+    """
+    Referencia a una carátula embebida en un archivo de audio.
+    
+    Guarda dónde está la imagen (frame APIC, bloque PICTURE o átomo covr),
+    su tipo y su tamaño, pero no sus bytes: se leen del archivo en cada acceso,
+    así listar o indexar metadatos no retiene ninguna carátula en memoria.
+    """
+    path: str
+    kind: str  # 'id3', 'flac' o 'mp4'
+    key: Union[str, int]  # HashKey del frame APIC o índice de la imagen
+    mime: Optional[str] = None
+    size: int = 0
+    
+    def load(self, audio_file=None) -> bytes:
+        """
+        Lee los bytes de la carátula
+        
+        Args:
+            audio_file: Objeto mutagen del mismo archivo ya abierto (evita volver a abrirlo)
+        
+        Returns:
+            bytes: Copia de la imagen, independiente del objeto mutagen (cada
+                   llamada sin audio_file vuelve a leer el archivo)
+        
+        Raises:
+            ValueError: Si el archivo ya no contiene la carátula
+        """
+        if audio_file is None:
+            audio_file = File(self.path)
+        try:
+            if self.kind == 'id3':
+                data = audio_file.tags[self.key].data
+            elif self.kind == 'flac':
+                data = audio_file.pictures[self.key].data
+            else:
+                data = audio_file.tags['covr'][self.key]
+        except (AttributeError, KeyError, IndexError, TypeError):
+            raise ValueError(f"La carátula ya no está en el archivo: {self.path}")
+        return bytes(data)
+
 @dataclass
 class AudioMetadata:
     """Clase para representar metadatos de audio de forma unificada"""
@@ -51,19 +95,74 @@ class AudioMetadata:
     disc_total: Optional[str] = None
     composer: Optional[str] = None
     comment: Optional[str] = None
-    artwork_data: Optional[bytes] = None
+    artwork_data: Optional[bytes] = None  # Carátula asignada explícitamente
     artwork_mime: Optional[str] = None
     artwork_description: Optional[str] = None
+    artwork: Optional[ArtworkHandle] = None  # Carátula leída del archivo, sin cargar
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convierte a diccionario excluyendo campos None"""
-        return {k: v for k, v in asdict(self).items() if v is not None}
+        """Convierte a diccionario excluyendo campos None (y la referencia a la carátula)"""
+        return {k: v for k, v in asdict(self).items() if v is not None and k != 'artwork'}
+
+    @property
+    def has_artwork(self) -> bool:
+        """Indica si hay carátula, sin cargarla"""
+        return self.artwork_data is not None or self.artwork is not None
+
+    @property
+    def artwork_size(self) -> int:
+        """Tamaño en bytes de la carátula, sin cargarla"""
+        if self.artwork_data is not None:
+            return len(self.artwork_data)
+        return self.artwork.size if self.artwork is not None else 0
+
+    def load_artwork(self, audio_file=None) -> Optional[bytes]:
+        """
+        Bytes de la carátula: los asignados o, si no, los del archivo de origen
+
+        La carátula de origen se lee en cada llamada; quien la necesite varias
+        veces debe guardar el resultado.
+
+        Args:
+            audio_file: Objeto mutagen del archivo de origen ya abierto
+        """
+        if self.artwork_data is not None:
+            return self.artwork_data
+        if self.artwork is not None:
+            return self.artwork.load(audio_file)
+        return None
+
+# Campos de texto que se pueden editar (la carátula se gestiona aparte)
+TEXT_FIELDS = ('title', 'artist', 'album', 'albumartist', 'date', 'genre',
+               'track', 'track_total', 'disc', 'disc_total', 'composer', 'comment')
+ARTWORK_FIELDS = ('artwork_data', 'artwork_mime', 'artwork_description')
+
+# Etiqueta de cada campo de texto por formato (track, disc y comment en ID3 y
+# track/disc en MP4 combinan dos campos y se escriben aparte)
+ID3_TEXT_FRAMES = {'title': TIT2, 'artist': TPE1, 'album': TALB, 'albumartist': TPE2,
+                   'date': TDRC, 'genre': TCON, 'composer': TCOM}
+VORBIS_KEYS = {'title': 'TITLE', 'artist': 'ARTIST', 'album': 'ALBUM', 'albumartist': 'ALBUMARTIST',
+               'date': 'DATE', 'genre': 'GENRE', 'composer': 'COMPOSER', 'comment': 'COMMENT',
+               'track': 'TRACKNUMBER', 'track_total': 'TRACKTOTAL',
+               'disc': 'DISCNUMBER', 'disc_total': 'DISCTOTAL'}
+MP4_KEYS = {'title': '©nam', 'artist': '©ART', 'album': '©alb', 'albumartist': 'aART',
+            'date': '©day', 'genre': '©gen', 'composer': '©wrt', 'comment': '©cmt'}
+
+def _same_file(audio_file, path: str) -> bool:
+    """Indica si un objeto mutagen abierto corresponde a una ruta"""
+    filename = getattr(audio_file, 'filename', None)
+    return filename is not None and os.path.abspath(filename) == os.path.abspath(path)
 
 class MetadataEditor:
     """Editor principal de metadatos con soporte para múltiples formatos"""
     
-    def __init__(self):
-        pass
+    def __init__(self, artwork_store: Optional[ArtworkStore] = None):
+        """
+        Args:
+            artwork_store: Almacén de carátulas para reducir las que superan MAX_ARTWORK_SIZE
+                           (por defecto el compartido por todo el proceso)
+        """
+        self.artwork_store = artwork_store or shared_artwork_store()
     
     def read_metadata(self, file_path: Union[str, Path]) -> Optional[AudioMetadata]:
         """Lee metadatos de un archivo de audio"""
@@ -73,48 +172,111 @@ class MetadataEditor:
                 console.print(f"[red]No se pudo leer el archivo: {file_path}[/red]")
                 return None
             
-            metadata = AudioMetadata()
-            
-            # Leer metadatos según el formato
-            if isinstance(audio_file, MP3):
-                self._read_id3_tags(audio_file, metadata)
-            elif isinstance(audio_file, FLAC):
-                self._read_vorbis_tags(audio_file, metadata)
-            elif isinstance(audio_file, MP4):
-                self._read_mp4_tags(audio_file, metadata)
-            elif isinstance(audio_file, (WAVE, AIFF)):
-                self._read_id3_tags_from_container(audio_file, metadata)
-            
+            metadata = self._read_tags(audio_file)
+            if isinstance(audio_file, (WAVE, AIFF)) and not audio_file.tags:
+                console.print(f"[yellow]Archivo {type(audio_file).__name__} sin metadatos existentes[/yellow]")
             return metadata
             
         except Exception as e:
             console.print(f"[red]Error leyendo metadatos: {e}[/red]")
             return None
     
+    def inspect(self, file_path: Union[str, Path],
+                load_artwork: bool = False) -> Tuple[AudioMetadata, Dict[str, Any]]:
+        """
+        Lee metadatos e información del stream abriendo el archivo una sola vez
+        
+        Args:
+            file_path: Archivo de audio
+            load_artwork: Si cargar ya la carátula en artwork_data (sin volver a abrir el archivo)
+        
+        Returns:
+            Tuple[AudioMetadata, Dict[str, Any]]: (metadatos, información del stream)
+        
+        Raises:
+            ValueError: Si el formato no se reconoce
+        """
+        audio_file = File(str(file_path))
+        if audio_file is None:
+            raise ValueError("Formato de audio no reconocido")
+        metadata = self._read_tags(audio_file)
+        if load_artwork and metadata.artwork is not None:
+            metadata.artwork_data = metadata.artwork.load(audio_file)
+        return metadata, self._stream_info(audio_file)
+    
+    def _stream_info(self, audio_file) -> Dict[str, Any]:
+        """Información del stream de un archivo ya abierto (None si el formato no la da)"""
+        info = audio_file.info
+        return {
+            'codec': type(audio_file).__name__,
+            'duration': getattr(info, 'length', None),
+            'sample_rate': getattr(info, 'sample_rate', None),
+            'channels': getattr(info, 'channels', None),
+            'bitrate': getattr(info, 'bitrate', None),
+            'bits_per_sample': getattr(info, 'bits_per_sample', None)
+        }
+    
+    def update_metadata(self, file_path: Union[str, Path], changes: Dict[str, Optional[str]]) -> AudioMetadata:
+        """
+        Aplica cambios de campos a un archivo abriéndolo y guardándolo una sola vez
+        
+        Solo se escriben las etiquetas de los campos de `changes`: el resto
+        (incluidas las que este editor no conoce) y las imágenes se conservan,
+        salvo la portada si el cambio incluye la carátula.
+        
+        Args:
+            file_path: Archivo de audio
+            changes: Campo -> nuevo valor (None o vacío borra el campo); admite
+                     campos de texto y de carátula
+        
+        Returns:
+            AudioMetadata: Metadatos resultantes
+        
+        Raises:
+            ValueError: Si el campo no es editable o el archivo no se puede leer o escribir
+        """
+        unknown = [field for field in changes if field not in TEXT_FIELDS + ARTWORK_FIELDS]
+        if unknown:
+            raise ValueError(f"Campos no editables: {', '.join(unknown)}")
+        
+        audio_file = File(str(file_path))
+        if audio_file is None:
+            raise ValueError("Formato de audio no reconocido")
+        
+        metadata = self._read_tags(audio_file)
+        for field, value in changes.items():
+            setattr(metadata, field, value or None)
+        if 'artwork_data' in changes:
+            # La carátula indicada sustituye (o borra) la del archivo
+            metadata.artwork = None
+        
+        if not self._write_tags(audio_file, metadata, changes):
+            raise ValueError("No se pudieron escribir los metadatos")
+        audio_file.save()
+        return metadata
+    
+    def _read_tags(self, audio_file) -> AudioMetadata:
+        """Lee los metadatos de un archivo ya abierto según su formato"""
+        metadata = AudioMetadata()
+        
+        if isinstance(audio_file, MP3):
+            self._read_id3_tags(audio_file, metadata)
+        elif isinstance(audio_file, FLAC):
+            self._read_vorbis_tags(audio_file, metadata)
+        elif isinstance(audio_file, MP4):
+            self._read_mp4_tags(audio_file, metadata)
+        elif isinstance(audio_file, (WAVE, AIFF)):
+            self._read_id3_tags_from_container(audio_file, metadata)
+        
+        return metadata
+    
     def _read_id3_tags(self, audio_file: MP3, metadata: AudioMetadata):
         """Lee tags ID3 de archivos MP3"""
         tags = audio_file.tags
         if not tags:
             return
         
-        # Mapeo básico de tags ID3
-        if 'TIT2' in tags:
-            metadata.title = str(tags['TIT2'].text[0]) if tags['TIT2'].text else None
-        if 'TPE1' in tags:
-            metadata.artist = str(tags['TPE1'].text[0]) if tags['TPE1'].text else None
-        if 'TALB' in tags:
-            metadata.album = str(tags['TALB'].text[0]) if tags['TALB'].text else None
-        if 'TPE2' in tags:
-            metadata.albumartist = str(tags['TPE2'].text[0]) if tags['TPE2'].text else None
-        if 'TDRC' in tags:
-            metadata.date = str(tags['TDRC'].text[0]) if tags['TDRC'].text else None
-        if 'TCON' in tags:
-            metadata.genre = str(tags['TCON'].text[0]) if tags['TCON'].text else None
-        if 'TRCK' in tags:
-            track_info = str(tags['TRCK'].text[0]).split('/')
-            metadata.track = track_info[0]
-            if len(track_info) > 1:
-                metadata.track_total = track_info[1]
+        self._read_id3_tags_direct(tags, metadata, audio_file.filename)
     
     def _read_id3_tags_from_container(self, audio_file: Union[WAVE, AIFF], metadata: AudioMetadata):
         """Lee tags ID3 de archivos WAV/AIFF que pueden contener chunks ID3"""
@@ -122,14 +284,11 @@ class MetadataEditor:
         if hasattr(audio_file, 'tags') and audio_file.tags:
             # Si ya tiene tags ID3, los leemos como MP3
             if hasattr(audio_file.tags, 'getall'):
-                self._read_id3_tags_direct(audio_file.tags, metadata)
-        else:
-            # Si no tiene tags, intentamos crear un objeto ID3 vacío
-            console.print(f"[yellow]Archivo {type(audio_file).__name__} sin metadatos existentes[/yellow]")
+                self._read_id3_tags_direct(audio_file.tags, metadata, audio_file.filename)
     
-    def _read_id3_tags_direct(self, tags, metadata: AudioMetadata):
-        """Lee tags ID3 directamente de un objeto de tags"""
-        # Mapeo básico de tags ID3 (similar a _read_id3_tags pero sin audio_file.tags)
+    def _read_id3_tags_direct(self, tags, metadata: AudioMetadata, source: Optional[str] = None):
+        """Lee tags ID3 directamente de un objeto de tags (source: archivo, para la carátula)"""
+        # Mapeo básico de tags ID3
         if 'TIT2' in tags:
             metadata.title = str(tags['TIT2'].text[0]) if tags['TIT2'].text else None
         if 'TPE1' in tags:
@@ -147,6 +306,28 @@ class MetadataEditor:
             metadata.track = track_info[0]
             if len(track_info) > 1:
                 metadata.track_total = track_info[1]
+        if 'TPOS' in tags:
+            disc_info = str(tags['TPOS'].text[0]).split('/')
+            metadata.disc = disc_info[0]
+            if len(disc_info) > 1:
+                metadata.disc_total = disc_info[1]
+        if 'TCOM' in tags:
+            metadata.composer = str(tags['TCOM'].text[0]) if tags['TCOM'].text else None
+        
+        # Los escritores reescriben estos campos: leerlos evita perderlos al editar otros
+        comments = tags.getall('COMM')
+        if comments and comments[0].text:
+            metadata.comment = str(comments[0].text[0])
+        
+        pictures = tags.getall('APIC')
+        if pictures:
+            cover = next((pic for pic in pictures if pic.type == 3), pictures[0])
+            metadata.artwork_mime = cover.mime
+            metadata.artwork_description = cover.desc or 'Cover'
+            if source is not None:
+                metadata.artwork = ArtworkHandle(source, 'id3', cover.HashKey, cover.mime, len(cover.data))
+            else:
+                metadata.artwork_data = cover.data
     
     def _read_vorbis_tags(self, audio_file: FLAC, metadata: AudioMetadata):
         """Lee Vorbis Comments de archivos FLAC"""
@@ -168,6 +349,24 @@ class MetadataEditor:
             metadata.genre = audio_file.tags['GENRE'][0] if audio_file.tags['GENRE'] else None
         if 'TRACKNUMBER' in audio_file.tags:
             metadata.track = audio_file.tags['TRACKNUMBER'][0] if audio_file.tags['TRACKNUMBER'] else None
+        if 'TRACKTOTAL' in audio_file.tags:
+            metadata.track_total = audio_file.tags['TRACKTOTAL'][0] if audio_file.tags['TRACKTOTAL'] else None
+        if 'DISCNUMBER' in audio_file.tags:
+            metadata.disc = audio_file.tags['DISCNUMBER'][0] if audio_file.tags['DISCNUMBER'] else None
+        if 'DISCTOTAL' in audio_file.tags:
+            metadata.disc_total = audio_file.tags['DISCTOTAL'][0] if audio_file.tags['DISCTOTAL'] else None
+        if 'COMPOSER' in audio_file.tags:
+            metadata.composer = audio_file.tags['COMPOSER'][0] if audio_file.tags['COMPOSER'] else None
+        if 'COMMENT' in audio_file.tags:
+            metadata.comment = audio_file.tags['COMMENT'][0] if audio_file.tags['COMMENT'] else None
+        
+        # Carátula (bloques PICTURE de FLAC)
+        if audio_file.pictures:
+            index = next((i for i, pic in enumerate(audio_file.pictures) if pic.type == 3), 0)
+            cover = audio_file.pictures[index]
+            metadata.artwork_mime = cover.mime
+            metadata.artwork_description = cover.desc or 'Cover'
+            metadata.artwork = ArtworkHandle(audio_file.filename, 'flac', index, cover.mime, len(cover.data))
     
     def _read_mp4_tags(self, audio_file: MP4, metadata: AudioMetadata):
         """Lee tags de archivos MP4/M4A"""
@@ -205,10 +404,11 @@ class MetadataEditor:
                 metadata.disc_total = str(tags['disk'][0][1])
         
         # Leer artwork
-        if 'covr' in tags:
-            metadata.artwork_data = bytes(tags['covr'][0])
-            metadata.artwork_mime = 'image/jpeg'  # MP4 típicamente usa JPEG
+        if 'covr' in tags and tags['covr']:
+            cover = tags['covr'][0]
+            metadata.artwork_mime = 'image/png' if getattr(cover, 'imageformat', None) == MP4Cover.FORMAT_PNG else 'image/jpeg'
             metadata.artwork_description = 'Cover'
+            metadata.artwork = ArtworkHandle(audio_file.filename, 'mp4', 0, metadata.artwork_mime, len(cover))
     
     def write_metadata(self, file_path: Union[str, Path], metadata: AudioMetadata) -> bool:
         """Escribe metadatos a un archivo de audio"""
@@ -218,20 +418,7 @@ class MetadataEditor:
                 console.print(f"[red]No se pudo abrir el archivo: {file_path}[/red]")
                 return False
             
-            # Escribir según el formato
-            if isinstance(audio_file, MP3):
-                success = self._write_id3_tags(audio_file, metadata)
-            elif isinstance(audio_file, FLAC):
-                success = self._write_vorbis_tags(audio_file, metadata)
-            elif isinstance(audio_file, MP4):
-                success = self._write_mp4_tags(audio_file, metadata)
-            elif isinstance(audio_file, (WAVE, AIFF)):
-                success = self._write_id3_tags_to_container(audio_file, metadata)
-            else:
-                console.print(f"[red]Formato no soportado para escritura: {type(audio_file)}[/red]")
-                return False
-            
-            if success:
+            if self._write_tags(audio_file, metadata):
                 audio_file.save()
                 return True
             
@@ -241,80 +428,60 @@ class MetadataEditor:
             console.print(f"[red]Error escribiendo metadatos: {e}[/red]")
             return False
     
-    def _write_id3_tags(self, audio_file: MP3, metadata: AudioMetadata) -> bool:
+    def _write_tags(self, audio_file, metadata: AudioMetadata,
+                    fields: Optional[Iterable[str]] = None) -> bool:
+        """
+        Escribe los metadatos en un archivo ya abierto según su formato (sin guardar)
+        
+        Solo se tocan las etiquetas de `fields`; las demás (ReplayGain, MusicBrainz,
+        letras...) y las imágenes que no son la portada se conservan tal cual.
+        
+        Args:
+            audio_file: Objeto mutagen abierto
+            metadata: Metadatos completos a escribir
+            fields: Campos de AudioMetadata a escribir (None = todos)
+        """
+        fields = set(TEXT_FIELDS + ARTWORK_FIELDS if fields is None else fields)
+        
+        if fields & set(ARTWORK_FIELDS):
+            if metadata.artwork_data is not None:
+                # MAX_ARTWORK_SIZE solo se aplica a carátulas nuevas: la que ya tiene
+                # el archivo se reescribe tal cual. La misma imagen se reduce una vez por proceso
+                if len(metadata.artwork_data) > MAX_ARTWORK_SIZE:
+                    data, mime = self.artwork_store.fit(metadata.artwork_data, metadata.artwork_mime)
+                    metadata = replace(metadata, artwork_data=data, artwork_mime=mime)
+            elif metadata.artwork is not None:
+                # Cargar la carátula referenciada antes de que el escritor quite la existente;
+                # si es la de este mismo archivo, se lee del objeto ya abierto
+                source = audio_file if _same_file(audio_file, metadata.artwork.path) else None
+                metadata = replace(metadata, artwork_data=metadata.artwork.load(source))
+        
+        if isinstance(audio_file, MP3):
+            return self._write_id3_tags(audio_file, metadata, fields)
+        elif isinstance(audio_file, FLAC):
+            return self._write_vorbis_tags(audio_file, metadata, fields)
+        elif isinstance(audio_file, MP4):
+            return self._write_mp4_tags(audio_file, metadata, fields)
+        elif isinstance(audio_file, (WAVE, AIFF)):
+            return self._write_id3_tags_to_container(audio_file, metadata, fields)
+        
+        raise ValueError(f"Formato no soportado para escritura: {type(audio_file).__name__}")
+    
+    def _write_id3_tags(self, audio_file: MP3, metadata: AudioMetadata, fields: Set[str]) -> bool:
         """Escribe tags ID3 a archivos MP3"""
         try:
             # Asegurar que existan tags ID3
             if audio_file.tags is None:
                 audio_file.add_tags()
             
-            tags = audio_file.tags
-            
-            # Limpiar tags existentes de los campos que vamos a escribir
-            tags_to_remove = ['TIT2', 'TPE1', 'TALB', 'TPE2', 'TDRC', 'TCON', 'TRCK', 'TPOS', 'TCOM']
-            for tag_id in tags_to_remove:
-                if tag_id in tags:
-                    del tags[tag_id]
-            
-            # Limpiar comentarios
-            comm_keys = [k for k in tags.keys() if k.startswith('COMM')]
-            for key in comm_keys:
-                del tags[key]
-            
-            # Limpiar artwork
-            apic_keys = [k for k in tags.keys() if k.startswith('APIC')]
-            for key in apic_keys:
-                del tags[key]
-            
-            # Escribir tags básicos
-            if metadata.title:
-                tags.add(TIT2(encoding=3, text=metadata.title))
-            if metadata.artist:
-                tags.add(TPE1(encoding=3, text=metadata.artist))
-            if metadata.album:
-                tags.add(TALB(encoding=3, text=metadata.album))
-            if metadata.albumartist:
-                tags.add(TPE2(encoding=3, text=metadata.albumartist))
-            if metadata.date:
-                tags.add(TDRC(encoding=3, text=metadata.date))
-            if metadata.genre:
-                tags.add(TCON(encoding=3, text=metadata.genre))
-            if metadata.composer:
-                tags.add(TCOM(encoding=3, text=metadata.composer))
-            if metadata.comment:
-                tags.add(COMM(encoding=3, lang='eng', desc='', text=metadata.comment))
-            
-            # Track number
-            if metadata.track:
-                track_text = metadata.track
-                if metadata.track_total:
-                    track_text += f"/{metadata.track_total}"
-                tags.add(TRCK(encoding=3, text=track_text))
-            
-            # Disc number
-            if metadata.disc:
-                disc_text = metadata.disc
-                if metadata.disc_total:
-                    disc_text += f"/{metadata.disc_total}"
-                tags.add(TPOS(encoding=3, text=disc_text))
-            
-            # Artwork
-            if metadata.artwork_data:
-                tags.add(APIC(
-                    encoding=3,
-                    mime=metadata.artwork_mime or 'image/jpeg',
-                    type=3,  # Cover (front)
-                    desc=metadata.artwork_description or 'Cover',
-                    data=metadata.artwork_data
-                ))
-            
-            return True
+            return self._write_id3_tags_direct(audio_file.tags, metadata, fields)
             
         except Exception as e:
             console.print(f"[red]Error escribiendo tags ID3: {e}[/red]")
             return False
     
-    def _write_id3_tags_to_container(self, audio_file: Union[WAVE, AIFF], metadata: AudioMetadata) -> bool:
+    def _write_id3_tags_to_container(self, audio_file: Union[WAVE, AIFF], metadata: AudioMetadata,
+                                     fields: Set[str]) -> bool:
         """Escribe tags ID3 a archivos WAV/AIFF"""
         try:
             # Intentar agregar tags ID3 al archivo WAV/AIFF
@@ -324,7 +491,7 @@ class MetadataEditor:
             tags = audio_file.tags
             
             # Usar la misma lógica que para MP3
-            return self._write_id3_tags_direct(tags, metadata)
+            return self._write_id3_tags_direct(tags, metadata, fields)
             
         except Exception as e:
             console.print(f"[red]Error escribiendo tags ID3 a {type(audio_file).__name__}: {e}[/red]")
@@ -332,66 +499,54 @@ class MetadataEditor:
             console.print(f"[yellow]Considera convertir a MP3 o FLAC para mejor soporte de metadatos[/yellow]")
             return False
     
-    def _write_id3_tags_direct(self, tags, metadata: AudioMetadata) -> bool:
-        """Escribe tags ID3 directamente a un objeto de tags"""
+    def _write_id3_tags_direct(self, tags, metadata: AudioMetadata, fields: Set[str]) -> bool:
+        """Escribe los campos indicados directamente a un objeto de tags ID3"""
         try:
-            # Limpiar tags existentes de los campos que vamos a escribir
-            tags_to_remove = ['TIT2', 'TPE1', 'TALB', 'TPE2', 'TDRC', 'TCON', 'TRCK', 'TPOS', 'TCOM']
-            for tag_id in tags_to_remove:
-                if tag_id in tags:
-                    del tags[tag_id]
-            
-            # Limpiar comentarios
-            comm_keys = [k for k in tags.keys() if k.startswith('COMM')]
-            for key in comm_keys:
-                del tags[key]
-            
-            # Limpiar artwork
-            apic_keys = [k for k in tags.keys() if k.startswith('APIC')]
-            for key in apic_keys:
-                del tags[key]
-            
-            # Escribir tags básicos
-            if metadata.title:
-                tags.add(TIT2(encoding=3, text=metadata.title))
-            if metadata.artist:
-                tags.add(TPE1(encoding=3, text=metadata.artist))
-            if metadata.album:
-                tags.add(TALB(encoding=3, text=metadata.album))
-            if metadata.albumartist:
-                tags.add(TPE2(encoding=3, text=metadata.albumartist))
-            if metadata.date:
-                tags.add(TDRC(encoding=3, text=metadata.date))
-            if metadata.genre:
-                tags.add(TCON(encoding=3, text=metadata.genre))
-            if metadata.composer:
-                tags.add(TCOM(encoding=3, text=metadata.composer))
-            if metadata.comment:
-                tags.add(COMM(encoding=3, lang='eng', desc='', text=metadata.comment))
+            # Tags básicos: se sustituye solo el frame de cada campo editado
+            for field, frame in ID3_TEXT_FRAMES.items():
+                if field in fields:
+                    tags.delall(frame.__name__)
+                    value = getattr(metadata, field)
+                    if value:
+                        tags.add(frame(encoding=3, text=value))
+            
+            # Comentario: solo el de descripción vacía (iTunNORM y similares se conservan)
+            if 'comment' in fields:
+                for key in [key for key, frame in tags.items() if key.startswith('COMM') and not frame.desc]:
+                    del tags[key]
+                if metadata.comment:
+                    tags.add(COMM(encoding=3, lang='eng', desc='', text=metadata.comment))
             
             # Track number
-            if metadata.track:
-                track_text = metadata.track
-                if metadata.track_total:
-                    track_text += f"/{metadata.track_total}"
-                tags.add(TRCK(encoding=3, text=track_text))
+            if fields & {'track', 'track_total'}:
+                tags.delall('TRCK')
+                if metadata.track:
+                    track_text = metadata.track
+                    if metadata.track_total:
+                        track_text += f"/{metadata.track_total}"
+                    tags.add(TRCK(encoding=3, text=track_text))
             
             # Disc number
-            if metadata.disc:
-                disc_text = metadata.disc
-                if metadata.disc_total:
-                    disc_text += f"/{metadata.disc_total}"
-                tags.add(TPOS(encoding=3, text=disc_text))
-            
-            # Artwork (limitado en WAV/AIFF)
-            if metadata.artwork_data:
-                tags.add(APIC(
-                    encoding=3,
-                    mime=metadata.artwork_mime or 'image/jpeg',
-                    type=3,  # Cover (front)
-                    desc=metadata.artwork_description or 'Cover',
-                    data=metadata.artwork_data
-                ))
+            if fields & {'disc', 'disc_total'}:
+                tags.delall('TPOS')
+                if metadata.disc:
+                    disc_text = metadata.disc
+                    if metadata.disc_total:
+                        disc_text += f"/{metadata.disc_total}"
+                    tags.add(TPOS(encoding=3, text=disc_text))
+            
+            # Artwork: se sustituye la portada; contraportada, libreto, etc. se conservan
+            if fields & set(ARTWORK_FIELDS):
+                for key in [key for key, frame in tags.items() if key.startswith('APIC') and frame.type == 3]:
+                    del tags[key]
+                if metadata.artwork_data:
+                    tags.add(APIC(
+                        encoding=3,
+                        mime=metadata.artwork_mime or 'image/jpeg',
+                        type=3,  # Cover (front)
+                        desc=metadata.artwork_description or 'Cover',
+                        data=metadata.artwork_data
+                    ))
             
             return True
             
@@ -399,57 +554,41 @@ class MetadataEditor:
             console.print(f"[red]Error escribiendo tags ID3 directos: {e}[/red]")
             return False
     
-    def _write_vorbis_tags(self, audio_file: FLAC, metadata: AudioMetadata) -> bool:
-        """Escribe Vorbis Comments a archivos FLAC"""
+    def _write_vorbis_tags(self, audio_file: FLAC, metadata: AudioMetadata, fields: Set[str]) -> bool:
+        """Escribe los campos indicados como Vorbis Comments en archivos FLAC"""
         try:
-            # Limpiar tags existentes
-            if audio_file.tags:
-                audio_file.tags.clear()
-            else:
-                audio_file.tags = VCommentDict()
+            if audio_file.tags is None:
+                audio_file.add_tags()
             
             tags = audio_file.tags
             
-            # Escribir tags
-            if metadata.title:
-                tags['TITLE'] = metadata.title
-            if metadata.artist:
-                tags['ARTIST'] = metadata.artist
-            if metadata.album:
-                tags['ALBUM'] = metadata.album
-            if metadata.albumartist:
-                tags['ALBUMARTIST'] = metadata.albumartist
-            if metadata.date:
-                tags['DATE'] = metadata.date
-            if metadata.genre:
-                tags['GENRE'] = metadata.genre
-            if metadata.composer:
-                tags['COMPOSER'] = metadata.composer
-            if metadata.comment:
-                tags['COMMENT'] = metadata.comment
-            if metadata.track:
-                tags['TRACKNUMBER'] = metadata.track
-            if metadata.track_total:
-                tags['TRACKTOTAL'] = metadata.track_total
-            if metadata.disc:
-                tags['DISCNUMBER'] = metadata.disc
-            if metadata.disc_total:
-                tags['DISCTOTAL'] = metadata.disc_total
-            
-            # Artwork
-            if metadata.artwork_data:
-                # Limpiar imágenes existentes
-                audio_file.clear_pictures()
+            # Solo las claves de los campos editados; el resto de comentarios se conserva
+            for field, key in VORBIS_KEYS.items():
+                if field not in fields:
+                    continue
+                value = getattr(metadata, field)
+                if value:
+                    tags[key] = value
+                elif key in tags:
+                    del tags[key]
+            
+            # Artwork: se sustituye la portada; las demás imágenes se conservan
+            if fields & set(ARTWORK_FIELDS):
+                audio_file.metadata_blocks = [
+                    block for block in audio_file.metadata_blocks
+                    if not (block.code == Picture.code and block.type == 3)
+                ]
                 
-                # Crear objeto Picture
-                pic = Picture()
-                pic.type = 3  # Cover (front)
-                pic.mime = metadata.artwork_mime or 'image/jpeg'
-                pic.desc = metadata.artwork_description or 'Cover'
-                pic.data = metadata.artwork_data
-                
-                # Agregar al archivo
-                audio_file.add_picture(pic)
+                if metadata.artwork_data:
+                    # Crear objeto Picture
+                    pic = Picture()
+                    pic.type = 3  # Cover (front)
+                    pic.mime = metadata.artwork_mime or 'image/jpeg'
+                    pic.desc = metadata.artwork_description or 'Cover'
+                    pic.data = metadata.artwork_data
+                    
+                    # Agregar al archivo
+                    audio_file.add_picture(pic)
             
             return True
             
@@ -457,58 +596,49 @@ class MetadataEditor:
             console.print(f"[red]Error escribiendo tags Vorbis: {e}[/red]")
             return False
     
-    def _write_mp4_tags(self, audio_file: MP4, metadata: AudioMetadata) -> bool:
-        """Escribe tags a archivos MP4/M4A"""
+    def _write_mp4_tags(self, audio_file: MP4, metadata: AudioMetadata, fields: Set[str]) -> bool:
+        """Escribe los campos indicados como tags de archivos MP4/M4A"""
         try:
-            # Limpiar tags existentes
-            if audio_file.tags:
-                audio_file.tags.clear()
-            else:
-                audio_file.tags = {}
+            if audio_file.tags is None:
+                audio_file.add_tags()
             
             tags = audio_file.tags
             
-            # Escribir tags
-            if metadata.title:
-                tags['©nam'] = [metadata.title]
-            if metadata.artist:
-                tags['©ART'] = [metadata.artist]
-            if metadata.album:
-                tags['©alb'] = [metadata.album]
-            if metadata.albumartist:
-                tags['aART'] = [metadata.albumartist]
-            if metadata.date:
-                tags['©day'] = [metadata.date]
-            if metadata.genre:
-                tags['©gen'] = [metadata.genre]
-            if metadata.composer:
-                tags['©wrt'] = [metadata.composer]
-            if metadata.comment:
-                tags['©cmt'] = [metadata.comment]
-            
-            # Track number
-            if metadata.track:
-                try:
-                    track_num = int(metadata.track)
-                    track_total = int(metadata.track_total) if metadata.track_total else 0
-                    tags['trkn'] = [(track_num, track_total)]
-                except ValueError:
-                    pass
-            
-            # Disc number
-            if metadata.disc:
+            # Solo los átomos de los campos editados; el resto se conserva
+            for field, key in MP4_KEYS.items():
+                if field not in fields:
+                    continue
+                value = getattr(metadata, field)
+                if value:
+                    tags[key] = [value]
+                elif key in tags:
+                    del tags[key]
+            
+            # Track y disc number
+            for number_field, total_field, key in (('track', 'track_total', 'trkn'),
+                                                   ('disc', 'disc_total', 'disk')):
+                if not fields & {number_field, total_field}:
+                    continue
+                if key in tags:
+                    del tags[key]
                 try:
-                    disc_num = int(metadata.disc)
-                    disc_total = int(metadata.disc_total) if metadata.disc_total else 0
-                    tags['disk'] = [(disc_num, disc_total)]
+                    number = int(getattr(metadata, number_field) or 0)
+                    total = int(getattr(metadata, total_field) or 0)
                 except ValueError:
-                    pass
-            
-            # Artwork
-            if metadata.artwork_data:
-                from mutagen.mp4 import MP4Cover
-                cover_format = MP4Cover.FORMAT_JPEG if metadata.artwork_mime == 'image/jpeg' else MP4Cover.FORMAT_PNG
-                tags['covr'] = [MP4Cover(metadata.artwork_data, imageformat=cover_format)]
+                    continue
+                if number:
+                    tags[key] = [(number, total)]
+            
+            # Artwork: se sustituye la primera imagen (la que se lee como carátula)
+            if fields & set(ARTWORK_FIELDS):
+                covers = list(tags.get('covr', []))[1:]
+                if metadata.artwork_data:
+                    cover_format = MP4Cover.FORMAT_JPEG if metadata.artwork_mime == 'image/jpeg' else MP4Cover.FORMAT_PNG
+                    covers.insert(0, MP4Cover(metadata.artwork_data, imageformat=cover_format))
+                if covers:
+                    tags['covr'] = covers
+                elif 'covr' in tags:
+                    del tags['covr']
             
             return True
             
@@ -545,9 +675,9 @@ def interactive_mode():
         if choice == "1":
             _edit_single_file_interactive(editor)
         elif choice == "2":
-            console.print("[yellow]Edición por lotes - Funcionalidad en desarrollo[/yellow]")
+            _batch_edit_interactive(editor)
         elif choice == "3":
-            console.print("[yellow]Gestión de plantillas - Funcionalidad en desarrollo[/yellow]")
+            _templates_interactive(editor)
         elif choice == "4":
             console.print("[yellow]Gestión de carátulas - Funcionalidad en desarrollo[/yellow]")
         elif choice == "5":
@@ -590,6 +720,7 @@ def _edit_single_file_interactive(editor: MetadataEditor):
     new_metadata.artwork_data = getattr(existing_metadata, 'artwork_data', None)
     new_metadata.artwork_mime = getattr(existing_metadata, 'artwork_mime', None)
     new_metadata.artwork_description = getattr(existing_metadata, 'artwork_description', None)
+    new_metadata.artwork = existing_metadata.artwork
     
     console.print("\n[cyan]Editar metadatos (Enter para mantener valor actual):[/cyan]")
     
@@ -659,10 +790,10 @@ def _edit_single_file_interactive(editor: MetadataEditor):
             console.print(f"  {field_name}: '{old_value}' → '{new_value}'")
             changes_made = True
     
-    if new_metadata.artwork_data and not getattr(existing_metadata, 'artwork_data', None):
+    if new_metadata.artwork_data and not existing_metadata.has_artwork:
         console.print("  Carátula: Agregada")
         changes_made = True
-    elif new_metadata.artwork_data and getattr(existing_metadata, 'artwork_data', None):
+    elif new_metadata.artwork_data and existing_metadata.has_artwork:
         console.print("  Carátula: Actualizada")
         changes_made = True
     
@@ -679,12 +810,122 @@ def _edit_single_file_interactive(editor: MetadataEditor):
             if Confirm.ask("\n¿Guardar estos metadatos como plantilla?"):
                 template_name = Prompt.ask("Nombre de la plantilla")
                 if template_name:
-                    console.print("[yellow]Funcionalidad de plantillas - En desarrollo[/yellow]")
+                    _save_template(template_name, new_metadata)
         else:
             console.print("[red]✗ Error guardando metadatos[/red]")
     else:
         console.print("[yellow]Cambios cancelados[/yellow]")
 
+def _batch_edit_interactive(editor: MetadataEditor):
+    """Modo interactivo para aplicar los mismos cambios a muchos archivos"""
+    from .metadata_batch import BatchMetadataEditor, resolve_batch_sources
+    
+    source = Prompt.ask("\nArchivos (patrón glob, directorio, manifiesto o lista)")
+    if not source:
+        return
+    
+    console.print("\n[cyan]Campos a cambiar (Enter para no modificar, '-' para borrar):[/cyan]")
+    fields_to_edit = [
+        ('artist', 'Artista'),
+        ('album', 'Álbum'),
+        ('albumartist', 'Artista del álbum'),
+        ('date', 'Fecha (YYYY)'),
+        ('genre', 'Género'),
+        ('composer', 'Compositor'),
+        ('comment', 'Comentario')
+    ]
+    
+    changes = {}
+    for field, label in fields_to_edit:
+        value = Prompt.ask(label, default="", show_default=False)
+        if value == '-':
+            changes[field] = None
+        elif value:
+            changes[field] = value
+    
+    if not changes:
+        console.print("[yellow]No se indicaron cambios[/yellow]")
+        return
+    
+    if not Confirm.ask(f"\n¿Aplicar {len(changes)} cambio(s) a los archivos de '{source}'?"):
+        console.print("[yellow]Cambios cancelados[/yellow]")
+        return
+    
+    try:
+        files = resolve_batch_sources(source)
+    except ValueError as e:
+        console.print(f"[red]✗ {e}[/red]")
+        return
+    
+    result = BatchMetadataEditor(editor).apply(files, changes)
+    console.print(f"[green]✓ Metadatos actualizados: {result.updated} archivos[/green]")
+    for file_path, reason in result.failures:
+        console.print(f"  [red]✗ {file_path}[/red]: {reason}")
+
+def _save_template(template_name: str, metadata: AudioMetadata):
+    """Guarda los metadatos como plantilla (sin título ni track, propios de cada pista)"""
+    from .metadata_templates import MetadataTemplate
+    
+    template = MetadataTemplate.from_metadata(template_name, metadata, exclude=('title', 'track'))
+    try:
+        artwork = None
+        if metadata.has_artwork:
+            artwork = (metadata.load_artwork(), metadata.artwork_mime or 'image/jpeg')
+        path = template.save(artwork=artwork)
+        console.print(f"[green]✓ Plantilla guardada: {path}[/green]")
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Error guardando plantilla: {e}[/red]")
+
+def _templates_interactive(editor: MetadataEditor):
+    """Modo interactivo para listar plantillas y aplicarlas a un lote"""
+    from .metadata_batch import BatchMetadataEditor, resolve_batch_sources
+    from .metadata_templates import MetadataTemplate, PLACEHOLDERS, list_templates
+    
+    names = list_templates()
+    if not names:
+        console.print("[yellow]No hay plantillas guardadas[/yellow]")
+        return
+    
+    table = Table(title="Plantillas")
+    table.add_column("Nombre", style="cyan")
+    table.add_column("Campos", style="white")
+    table.add_column("Carátula", style="white")
+    for name in names:
+        try:
+            template = MetadataTemplate.load(name)
+        except (OSError, ValueError) as e:
+            table.add_row(name, f"[red]{e}[/red]", "")
+            continue
+        fields = ", ".join(f"{key}={value}" for key, value in template.fields.items())
+        table.add_row(name, fields, "Sí" if template.artwork else "")
+    console.print(table)
+    console.print(f"[dim]Variables: {', '.join('{' + p + '}' for p in PLACEHOLDERS)}[/dim]")
+    
+    name = Prompt.ask("\nPlantilla a aplicar (Enter para volver)", default="", show_default=False)
+    if not name:
+        return
+    
+    try:
+        template = MetadataTemplate.load(name).compile()
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Error en la plantilla: {e}[/red]")
+        return
+    
+    source = Prompt.ask("Archivos (patrón glob, directorio, manifiesto o lista)")
+    if not source or not Confirm.ask(f"¿Aplicar la plantilla '{name}' a '{source}'?"):
+        return
+    
+    try:
+        files = resolve_batch_sources(source)
+    except ValueError as e:
+        console.print(f"[red]✗ {e}[/red]")
+        return
+    
+    result = BatchMetadataEditor(editor).apply_template(files, template)
+    console.print(f"[green]✓ Metadatos actualizados: {result.updated} archivos[/green]")
+    for file_path, reason in result.failures:
+        console.print(f"  [red]✗ {file_path}[/red]: {reason}")
+
 def _display_metadata_table(metadata: AudioMetadata, title: str):
     """Muestra metadatos en formato tabla"""
     
@@ -697,11 +938,11 @@ def _display_metadata_table(metadata: AudioMetadata, title: str):
     # Excluir artwork data de la visualización
     if 'artwork_data' in metadata_dict:
         del metadata_dict['artwork_data']
-        # Mostrar info de carátula si existe
-        if getattr(metadata, 'artwork_data', None):
-            artwork_mime = getattr(metadata, 'artwork_mime', 'unknown')
-            artwork_size = len(metadata.artwork_data)
-            table.add_row("Carátula", f"Presente ({artwork_mime}, {artwork_size} bytes)")
+    
+    # Mostrar info de carátula si existe (sin cargarla)
+    if metadata.has_artwork:
+        artwork_mime = metadata.artwork_mime or 'unknown'
+        table.add_row("Carátula", f"Presente ({artwork_mime}, {metadata.artwork_size} bytes)")
     
     if 'artwork_mime' in metadata_dict:
         del metadata_dict['artwork_mime']
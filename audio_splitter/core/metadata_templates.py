@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Metadata Templates - Plantillas de metadatos guardadas en TEMPLATES_DIR y
+aplicadas a lotes de archivos
+"""
+
+import json
+import os
+import string
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from ..config.settings import TEMPLATES_DIR, SUPPORTED_ARTWORK_FORMATS
+from ..utils.file_utils import safe_filename
+from .metadata_manager import TEXT_FIELDS
+
+TEMPLATE_EXTENSION = ".json"
+TEMPLATE_VERSION = 1
+
+# Variables disponibles en los valores de una plantilla. track y total son
+# enteros, así que admiten formato: "{track:02d}"
+PLACEHOLDERS = ('filename', 'stem', 'parent', 'track', 'total')
+
+_FORMATTER = string.Formatter()
+
+# Valores de ejemplo para validar el formato de los campos al compilar
+_SAMPLE_VALUES = {'filename': 'a.mp3', 'stem': 'a', 'parent': 'album', 'track': 1, 'total': 1}
+
+
+def _artwork_mime(path: Path) -> str:
+    """Tipo MIME de una imagen de carátula por su extensión"""
+    return 'image/jpeg' if path.suffix.lower() in ('.jpg', '.jpeg') else 'image/png'
+
+
+@dataclass
+class MetadataTemplate:
+    """
+    Plantilla de metadatos: un subconjunto de campos de AudioMetadata cuyos
+    valores pueden usar las variables de PLACEHOLDERS (las llaves literales se
+    escriben {{ }}) y, opcionalmente, una imagen de carátula compartida.
+
+    Se guarda como JSON en TEMPLATES_DIR; la carátula es una ruta relativa al
+    directorio de la plantilla.
+    """
+    name: str
+    fields: Dict[str, str] = field(default_factory=dict)
+    artwork: Optional[str] = None
+
+    @staticmethod
+    def path_for(name: str, templates_dir: Union[str, Path] = TEMPLATES_DIR) -> Path:
+        """Archivo de una plantilla a partir de su nombre"""
+        return Path(templates_dir) / f"{safe_filename(name)}{TEMPLATE_EXTENSION}"
+
+    @classmethod
+    def load(cls, name_or_path: Union[str, Path],
+             templates_dir: Union[str, Path] = TEMPLATES_DIR) -> 'MetadataTemplate':
+        """
+        Carga una plantilla por nombre o por ruta
+
+        Raises:
+            FileNotFoundError: Si la plantilla no existe
+            ValueError: Si el archivo no es una plantilla válida
+        """
+        path = Path(name_or_path)
+        if not path.is_file():
+            path = cls.path_for(str(name_or_path), templates_dir)
+        if not path.is_file():
+            raise FileNotFoundError(f"Plantilla no encontrada: {name_or_path}")
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except ValueError as e:
+            raise ValueError(f"Plantilla dañada: {path} ({e})")
+        if data.get('version') != TEMPLATE_VERSION:
+            raise ValueError(f"Versión de plantilla no soportada: {path}")
+
+        artwork = data.get('artwork')
+        if artwork:
+            # Relativa al directorio de la plantilla
+            artwork = str(path.parent / artwork)
+        return cls(name=data.get('name', path.stem), fields=data.get('fields', {}), artwork=artwork)
+
+    @classmethod
+    def from_metadata(cls, name: str, metadata, exclude: Tuple[str, ...] = ()) -> 'MetadataTemplate':
+        """
+        Crea una plantilla con los campos de texto de un AudioMetadata
+
+        Args:
+            name: Nombre de la plantilla
+            metadata: Metadatos de origen
+            exclude: Campos que no se copian (p. ej. los propios de una pista)
+        """
+        fields = {}
+        for field_name in TEXT_FIELDS:
+            value = getattr(metadata, field_name, None)
+            if value and field_name not in exclude:
+                # Los valores copiados son literales
+                fields[field_name] = value.replace('{', '{{').replace('}', '}}')
+        return cls(name=name, fields=fields)
+
+    def save(self, templates_dir: Union[str, Path] = TEMPLATES_DIR,
+             artwork: Optional[Tuple[bytes, str]] = None) -> Path:
+        """
+        Guarda la plantilla de forma atómica
+
+        Args:
+            templates_dir: Directorio de plantillas
+            artwork: (datos, mime) de una carátula a guardar junto a la plantilla
+
+        Returns:
+            Path: Archivo de la plantilla
+        """
+        path = self.path_for(self.name, templates_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if artwork is not None:
+            data, mime = artwork
+            artwork_path = path.with_suffix('.png' if mime == 'image/png' else '.jpg')
+            artwork_path.write_bytes(data)
+            self.artwork = str(artwork_path)
+
+        stored_artwork = None
+        if self.artwork:
+            artwork_path = Path(self.artwork)
+            try:
+                stored_artwork = os.path.relpath(artwork_path, path.parent)
+            except ValueError:
+                # Otra unidad (Windows): se guarda la ruta absoluta
+                stored_artwork = str(artwork_path.resolve())
+
+        temp_path = path.with_name(path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': TEMPLATE_VERSION, 'name': self.name,
+                       'fields': self.fields, 'artwork': stored_artwork},
+                      f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
+        return path
+
+    def compile(self, overrides: Optional[Dict[str, Optional[str]]] = None) -> 'CompiledTemplate':
+        """
+        Valida la plantilla y la prepara para aplicarla a un lote
+
+        Las variables se analizan una sola vez y la carátula se lee una sola vez;
+        todos los archivos del lote comparten los mismos bytes.
+
+        Args:
+            overrides: Valores literales que sustituyen a los de la plantilla
+
+        Returns:
+            CompiledTemplate: Plantilla lista para render()
+
+        Raises:
+            ValueError: Si hay campos, variables o formatos no válidos, o la carátula no se puede usar
+        """
+        unknown = [name for name in self.fields if name not in TEXT_FIELDS]
+        if unknown:
+            raise ValueError(f"Campos no editables en la plantilla: {', '.join(unknown)}")
+
+        static: Dict[str, Optional[str]] = {}
+        dynamic: Dict[str, str] = {}
+        for name, pattern in self.fields.items():
+            try:
+                variables = {variable for _, variable, _, _ in _FORMATTER.parse(pattern) if variable is not None}
+            except ValueError as e:
+                raise ValueError(f"Campo '{name}' no válido: {e}")
+
+            invalid = [variable for variable in variables if variable not in PLACEHOLDERS]
+            if invalid:
+                raise ValueError(f"Variables desconocidas en '{name}': {', '.join(invalid)} "
+                                 f"(disponibles: {', '.join(PLACEHOLDERS)})")
+            try:
+                pattern.format_map(_SAMPLE_VALUES)
+            except (ValueError, IndexError, KeyError) as e:
+                raise ValueError(f"Formato no válido en '{name}': {e}")
+
+            if variables:
+                dynamic[name] = pattern
+            else:
+                static[name] = pattern.format_map({})
+
+        for name, value in (overrides or {}).items():
+            if name not in TEXT_FIELDS:
+                raise ValueError(f"Campo no editable: {name}")
+            dynamic.pop(name, None)
+            static[name] = value
+
+        artwork = None
+        if self.artwork:
+            artwork_path = Path(self.artwork)
+            if artwork_path.suffix.lower() not in SUPPORTED_ARTWORK_FORMATS:
+                raise ValueError(f"Formato de carátula no soportado: {artwork_path.suffix}")
+            try:
+                artwork = (artwork_path.read_bytes(), _artwork_mime(artwork_path))
+            except OSError as e:
+                raise ValueError(f"No se pudo leer la carátula {artwork_path}: {e}")
+
+        return CompiledTemplate(static, dynamic, artwork)
+
+
+class CompiledTemplate:
+    """Plantilla validada, con sus variables analizadas y la carátula en memoria"""
+
+    def __init__(self, static: Dict[str, Optional[str]], dynamic: Dict[str, str],
+                 artwork: Optional[Tuple[bytes, str]] = None):
+        self.static = static
+        self.dynamic = dynamic
+        self.artwork = artwork
+
+    def render(self, file_path: Union[str, Path], track: int, total: int) -> Dict[str, Optional[str]]:
+        """
+        Cambios de campos para un archivo del lote
+
+        Args:
+            file_path: Archivo de destino
+            track: Posición del archivo en el lote (desde 1)
+            total: Número de archivos del lote
+
+        Returns:
+            Dict[str, Optional[str]]: Cambios para MetadataEditor.update_metadata
+        """
+        file_path = Path(file_path)
+        values = {'filename': file_path.name, 'stem': file_path.stem,
+                  'parent': file_path.parent.name, 'track': track, 'total': total}
+
+        changes = dict(self.static)
+        for name, pattern in self.dynamic.items():
+            changes[name] = pattern.format_map(values)
+        if self.artwork is not None:
+            changes['artwork_data'], changes['artwork_mime'] = self.artwork
+            changes['artwork_description'] = 'Cover'
+        return changes
+
+
+def list_templates(templates_dir: Union[str, Path] = TEMPLATES_DIR) -> List[str]:
+    """Nombres de las plantillas guardadas (ordenados)"""
+    templates_dir = Path(templates_dir)
+    if not templates_dir.is_dir():
+        return []
+    return sorted(path.stem for path in templates_dir.glob(f"*{TEMPLATE_EXTENSION}"))
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Conversion Pipeline - Decodifica un archivo de audio una sola vez y lo entrega
+a los codificadores junto con sus metadatos
+"""
+
+import subprocess
+from itertools import chain
+from queue import Queue
+from threading import Thread
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import soundfile as sf
+
+from ..utils.audio_utils import native_dtype
+from ..config.settings import STREAM_BLOCK_FRAMES, FFMPEG_BINARY
+
+# Atributos de soundfile (chunk INFO en WAV, Vorbis Comments en FLAC) por campo común
+SOUNDFILE_TAGS = {
+    'title': 'title',
+    'artist': 'artist',
+    'album': 'album',
+    'date': 'date',
+    'genre': 'genre',
+    'track': 'tracknumber'
+}
+
+# Subtipo FLAC que conserva la profundidad de bits del origen (FLAC admite hasta 24 bits)
+FLAC_SUBTYPES = {
+    'PCM_S8': 'PCM_S8',
+    'PCM_U8': 'PCM_S8',
+    'PCM_16': 'PCM_16',
+    'PCM_24': 'PCM_24',
+    'PCM_32': 'PCM_24',
+    'FLOAT': 'PCM_24',
+    'DOUBLE': 'PCM_24'
+}
+
+MAX_FLAC_COMPRESSION_LEVEL = 8
+
+# Formato de entrada PCM crudo de ffmpeg por dtype de bloque
+FFMPEG_PCM_FORMATS = {
+    'int16': 's16le',
+    'int32': 's32le',
+    'float32': 'f32le',
+    'float64': 'f64le'
+}
+
+# Bloques en espera por codificador al codificar varias salidas a la vez
+FANOUT_QUEUE_BLOCKS = 8
+
+# Marca de fin de la secuencia de bloques en las colas de cada codificador
+_END_OF_STREAM = object()
+
+# Salida a codificar: (ruta, formato, configuración del preset)
+EncodeTarget = Tuple[Union[str, Path], str, Dict]
+
+# Claves -metadata de ffmpeg por campo común
+FFMPEG_TAGS = {
+    'title': 'title',
+    'artist': 'artist',
+    'album': 'album',
+    'date': 'date',
+    'genre': 'genre',
+    'track': 'track'
+}
+
+
+class ConversionPipeline:
+    """
+    Conversión de un archivo de origen con una única decodificación.
+
+    Si soundfile puede leer el origen, los codificadores consumen bloques de
+    tamaño fijo leídos en una sola pasada (memoria acotada). Si no, el audio se
+    decodifica una vez con librosa y el buffer PCM (frames, canales) se reutiliza.
+    Los metadatos se escriben como parte de la propia codificación, sin reabrir
+    la salida.
+    """
+
+    def __init__(self, input_path: Union[str, Path], metadata: Optional[Dict] = None):
+        """
+        Args:
+            input_path: Ruta del archivo de origen
+            metadata: Metadatos comunes a escribir en las salidas (title, artist, album...)
+        """
+        self.input_path = Path(input_path)
+        self.metadata = {k: v for k, v in (metadata or {}).items() if v}
+        self._pcm: Optional[np.ndarray] = None
+        self._sample_rate: Optional[int] = None
+        self._subtype: Optional[str] = None
+        self._info = None
+        self._info_checked = False
+
+    def _soundfile_info(self):
+        """Cabecera leída por soundfile, o None si libsndfile no soporta el formato"""
+        if not self._info_checked:
+            self._info_checked = True
+            try:
+                self._info = sf.info(str(self.input_path))
+            except RuntimeError:
+                # soundfile.LibsndfileError hereda de RuntimeError
+                self._info = None
+        return self._info
+
+    def stream_format(self) -> Tuple[int, int, Optional[str]]:
+        """
+        Formato del origen, leído de la cabecera cuando es posible
+
+        Returns:
+            Tuple[int, int, Optional[str]]: (frecuencia de muestreo, canales, subtipo soundfile)
+        """
+        info = self._soundfile_info()
+        if self._pcm is None and info is not None:
+            return info.samplerate, info.channels, info.subtype
+
+        pcm, sr = self.decode()
+        return sr, pcm.shape[1], self._subtype
+
+    def blocks(self, block_frames: int = STREAM_BLOCK_FRAMES) -> Iterator[np.ndarray]:
+        """
+        Recorre el audio del origen en bloques (frames, canales) con su dtype nativo
+
+        Args:
+            block_frames: Frames por bloque
+
+        Yields:
+            np.ndarray: Bloque de audio
+        """
+        info = self._soundfile_info()
+        if self._pcm is None and info is not None:
+            with sf.SoundFile(str(self.input_path)) as source:
+                yield from source.blocks(blocksize=block_frames,
+                                         dtype=native_dtype(info.subtype),
+                                         always_2d=True)
+            return
+
+        pcm, _ = self.decode()
+        for start in range(0, len(pcm), block_frames):
+            yield pcm[start:start + block_frames]
+
+    def decode(self) -> Tuple[np.ndarray, int]:
+        """
+        Decodifica el origen a un buffer PCM, solo la primera vez
+
+        Returns:
+            Tuple[np.ndarray, int]: (buffer (frames, canales), frecuencia de muestreo)
+        """
+        if self._pcm is None:
+            info = self._soundfile_info()
+            if info is not None:
+                # soundfile conserva canales y formato de muestra del origen
+                self._pcm, self._sample_rate = sf.read(str(self.input_path),
+                                                       dtype=native_dtype(info.subtype),
+                                                       always_2d=True)
+                self._subtype = info.subtype
+            else:
+                # Formatos no soportados por libsndfile (m4a, mp3 en versiones antiguas).
+                # librosa se importa solo aquí: su carga (numba) tarda segundos
+                import librosa
+                y, self._sample_rate = librosa.load(str(self.input_path), sr=None, mono=False)
+                self._pcm = y.T if y.ndim > 1 else y[:, np.newaxis]
+
+        return self._pcm, self._sample_rate
+
+    def encode(self, output_path: Union[str, Path], target_format: str, settings: Optional[Dict] = None,
+               blocks: Optional[Iterator[np.ndarray]] = None):
+        """
+        Codifica el origen en el formato objetivo, con metadatos
+
+        Args:
+            output_path: Ruta del archivo de salida
+            target_format: Formato objetivo ('wav', 'mp3', 'flac')
+            settings: Configuración del preset de calidad del formato
+            blocks: Bloques de audio a codificar (por defecto, una lectura nueva del origen)
+
+        Raises:
+            ValueError: Si el formato objetivo no está soportado
+        """
+        settings = settings or {}
+        if target_format not in ('wav', 'flac', 'mp3'):
+            raise ValueError(f"Formato objetivo no soportado: {target_format}")
+
+        blocks = blocks if blocks is not None else self.blocks()
+        if target_format == 'wav':
+            self._encode_soundfile(output_path, 'WAV', self._wav_subtype(), blocks)
+        elif target_format == 'flac':
+            self._encode_flac(output_path, settings, blocks)
+        else:
+            self._encode_mp3(output_path, settings, blocks)
+
+    def encode_many(self, targets: List[EncodeTarget]) -> List[Optional[Exception]]:
+        """
+        Codifica varias salidas a partir de una única lectura del origen
+
+        Cada bloque leído se entrega a todos los codificadores, que trabajan en
+        paralelo en hilos propios (libsndfile libera el GIL y ffmpeg es un proceso
+        aparte alimentado por su stdin). Los bloques se comparten por referencia;
+        las colas acotadas limitan la memoria cuando un codificador va más lento.
+
+        Args:
+            targets: Lista de (ruta_salida, formato, configuración_del_preset)
+
+        Returns:
+            List[Optional[Exception]]: Error de cada salida (None si fue correcta), en el orden de targets
+        """
+        if len(targets) == 1:
+            try:
+                self.encode(*targets[0])
+                return [None]
+            except Exception as e:
+                return [e]
+
+        # Resolver el formato del origen antes de arrancar los hilos
+        self.stream_format()
+
+        queues = [Queue(maxsize=FANOUT_QUEUE_BLOCKS) for _ in targets]
+        errors: List[Optional[Exception]] = [None] * len(targets)
+        threads = [Thread(target=self._fanout_worker, args=(target, block_queue, errors, i), daemon=True)
+                   for i, (target, block_queue) in enumerate(zip(targets, queues))]
+        for thread in threads:
+            thread.start()
+
+        read_error = None
+        try:
+            for block in self.blocks():
+                for block_queue in queues:
+                    block_queue.put(block)
+        except Exception as e:
+            read_error = e
+        finally:
+            for block_queue in queues:
+                block_queue.put(_END_OF_STREAM)
+            for thread in threads:
+                thread.join()
+
+        if read_error is not None:
+            # Una lectura incompleta invalida todas las salidas
+            errors = [error or read_error for error in errors]
+        return errors
+
+    def _fanout_worker(self, target: EncodeTarget, block_queue: Queue,
+                       errors: List[Optional[Exception]], index: int):
+        """Codifica una salida consumiendo los bloques de su cola"""
+        state = {'finished': False}
+
+        def queued_blocks():
+            while True:
+                block = block_queue.get()
+                if block is _END_OF_STREAM:
+                    state['finished'] = True
+                    return
+                yield block
+
+        blocks = queued_blocks()
+        try:
+            output_path, target_format, settings = target
+            self.encode(output_path, target_format, settings, blocks)
+        except Exception as e:
+            errors[index] = e
+        finally:
+            blocks.close()
+            # Si el codificador terminó antes de tiempo, seguir vaciando la cola
+            # para que el lector nunca quede bloqueado
+            while not state['finished'] and block_queue.get() is not _END_OF_STREAM:
+                pass
+
+    def _wav_subtype(self) -> str:
+        """Subtipo WAV de salida: el del origen si WAV lo admite, PCM_16 si no"""
+        _, _, subtype = self.stream_format()
+        if subtype and sf.check_format('WAV', subtype):
+            return subtype
+        return 'PCM_16'
+
+    def _encode_flac(self, output_path: Union[str, Path], settings: Dict, blocks: Iterator[np.ndarray]):
+        """Codifica FLAC por bloques con la profundidad del origen y el nivel de compresión del preset"""
+        _, _, subtype = self.stream_format()
+        level = settings.get('compression_level', MAX_FLAC_COMPRESSION_LEVEL)
+
+        # soundfile expresa el nivel de compresión de libFLAC (0-8) en el rango 0.0-1.0
+        self._encode_soundfile(output_path, 'FLAC', FLAC_SUBTYPES.get(subtype, 'PCM_16'), blocks,
+                               compression_level=level / MAX_FLAC_COMPRESSION_LEVEL)
+
+    def _encode_soundfile(self, output_path: Union[str, Path], file_format: str, subtype: str,
+                          blocks: Iterator[np.ndarray], **options):
+        """Escribe WAV/FLAC con soundfile bloque a bloque; las etiquetas se fijan antes de los datos"""
+        sr, channels, _ = self.stream_format()
+
+        with sf.SoundFile(str(output_path), 'w', samplerate=sr, channels=channels,
+                          format=file_format, subtype=subtype, **options) as destination:
+            for field, attribute in SOUNDFILE_TAGS.items():
+                if field in self.metadata:
+                    setattr(destination, attribute, str(self.metadata[field]))
+            for block in blocks:
+                destination.write(block)
+
+    def _encode_mp3(self, output_path: Union[str, Path], settings: Dict, blocks: Iterator[np.ndarray]):
+        """Codifica MP3 enviando los bloques PCM a un único proceso ffmpeg por stdin"""
+        sr, channels, _ = self.stream_format()
+        first_block = next(blocks, None)
+        dtype = first_block.dtype if first_block is not None else np.dtype('int16')
+
+        command = self._ffmpeg_mp3_command(output_path, sr, channels, dtype, settings)
+        process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        try:
+            if first_block is not None:
+                for block in chain([first_block], blocks):
+                    process.stdin.write(np.ascontiguousarray(block, dtype=dtype.newbyteorder('<')))
+        except BrokenPipeError:
+            # ffmpeg terminó antes de tiempo; el error se informa con su código de salida
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+
+        errors = process.stderr.read()
+        process.stderr.close()
+        if process.wait() != 0:
+            message = errors.decode('utf-8', errors='replace').strip()
+            raise RuntimeError(f"ffmpeg terminó con código {process.returncode}: {message}")
+
+    def _ffmpeg_mp3_command(self, output_path: Union[str, Path], sr: int, channels: int,
+                            dtype: np.dtype, settings: Dict) -> List[str]:
+        """Construye la línea de ffmpeg: PCM crudo por stdin, MP3 con etiquetas a la salida"""
+        if dtype.name not in FFMPEG_PCM_FORMATS:
+            raise ValueError(f"Tipo de muestra no soportado para MP3: {dtype}")
+
+        command = [
+            FFMPEG_BINARY, '-hide_banner', '-loglevel', 'error', '-y',
+            '-f', FFMPEG_PCM_FORMATS[dtype.name], '-ar', str(sr), '-ac', str(channels),
+            '-i', 'pipe:0',
+            '-codec:a', settings.get('codec', 'libmp3lame')
+        ]
+
+        # CBR con bitrate fijo o VBR con parámetros personalizados (-q:a)
+        if settings.get('bitrate'):
+            command += ['-b:a', settings['bitrate']]
+        else:
+            command += list(settings.get('parameters', []))
+
+        for field, value in self.metadata.items():
+            if field in FFMPEG_TAGS:
+                command += ['-metadata', f"{FFMPEG_TAGS[field]}={value}"]
+
+        command += ['-id3v2_version', '4', '-f', 'mp3', str(output_path)]
+        return command
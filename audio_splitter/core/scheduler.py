@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Job Scheduler - Planificación de trabajos por lotes según la memoria que
+ocupará su audio decodificado
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..utils.audio_utils import native_dtype, probe_audio
+from ..config.settings import STREAM_BLOCK_FRAMES, SCHEDULER_LOOKAHEAD
+from .pipeline import FANOUT_QUEUE_BLOCKS
+
+# Trabajo a planificar (opaco para el planificador)
+Job = Any
+
+
+@dataclass
+class JobEstimate:
+    """Estimación de un trabajo a partir de la cabecera de su origen"""
+    memory: int  # Bytes de audio decodificado residentes a la vez
+    frames: int  # Duración en frames, para ordenar de más largo a más corto
+
+
+def estimate_job(input_path: Union[str, Path]) -> JobEstimate:
+    """
+    Estima la memoria de audio decodificado de una conversión sin decodificar
+
+    La huella es frames × canales × tamaño del dtype. Si soundfile puede leer
+    el origen, ConversionPipeline lo recorre por bloques y solo hay unos pocos
+    bloques en memoria; si no, se decodifica entero con librosa (float32).
+
+    Args:
+        input_path: Archivo de origen
+
+    Returns:
+        JobEstimate: Memoria estimada y duración en frames (0 si no se pudo leer la cabecera)
+    """
+    try:
+        info = probe_audio(input_path)
+    except (ValueError, OSError):
+        # La conversión fallará igualmente; no ocupa presupuesto
+        return JobEstimate(memory=0, frames=0)
+
+    frames = info['samples']
+    itemsize = np.dtype(native_dtype(info['subtype'])).itemsize
+    if info['subtype'] is not None:
+        resident = min(frames, STREAM_BLOCK_FRAMES * (FANOUT_QUEUE_BLOCKS + 1))
+    else:
+        resident = frames
+    return JobEstimate(memory=resident * info['channels'] * itemsize, frames=frames)
+
+
+class MemoryAwareScheduler:
+    """
+    Reparte trabajos en un executor respetando un presupuesto de memoria.
+
+    Los trabajos se leen de forma perezosa en una ventana de hasta `lookahead`
+    pendientes y se lanzan de más largo a más corto, de modo que los archivos
+    grandes empiezan primero y el final del lote no queda con un único archivo
+    enorme en marcha. Si el más largo no cabe en el presupuesto restante, no se
+    adelanta a ningún otro: se espera a que se libere memoria, porque rellenar
+    el hueco con trabajos cortos lo retrasaría hasta el final. Un trabajo mayor
+    que el presupuesto completo se admite solo cuando no hay ningún otro en
+    marcha, para que el lote siempre avance.
+    """
+
+    def __init__(self,
+                 workers: int,
+                 memory_budget: Optional[int],
+                 estimate: Callable[[Job], JobEstimate],
+                 lookahead: int = SCHEDULER_LOOKAHEAD):
+        """
+        Args:
+            workers: Trabajos simultáneos como máximo
+            memory_budget: Bytes de audio decodificado permitidos a la vez (None = sin límite)
+            estimate: Función que estima cada trabajo
+            lookahead: Trabajos pendientes entre los que elegir el siguiente
+        """
+        self.workers = max(1, workers)
+        self.memory_budget = memory_budget
+        self.estimate = estimate
+        self.lookahead = max(lookahead, self.workers)
+
+    def run(self, executor: Executor, fn: Callable[[Job], object],
+            jobs: Iterable[Job]) -> Iterator[Tuple[Job, Future]]:
+        """
+        Ejecuta fn(job) para cada trabajo en el executor
+
+        Yields:
+            Tuple[Job, Future]: (trabajo, futuro terminado) a medida que terminan
+        """
+        jobs = iter(jobs)
+        window: List[Tuple[JobEstimate, Job]] = []
+        in_flight: Dict[Future, Tuple[Job, int]] = {}
+        used = 0
+        exhausted = False
+
+        while True:
+            # Rellenar la ventana de pendientes
+            while not exhausted and len(window) < self.lookahead:
+                job = next(jobs, None)
+                if job is None:
+                    exhausted = True
+                else:
+                    window.append((self.estimate(job), job))
+
+            # Admitir trabajos mientras quepan
+            while window and len(in_flight) < self.workers:
+                index = self._next_admissible(window, used, not in_flight)
+                if index is None:
+                    break
+                estimate, job = window.pop(index)
+                in_flight[executor.submit(fn, job)] = (job, estimate.memory)
+                used += estimate.memory
+
+            if not in_flight:
+                return
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                job, memory = in_flight.pop(future)
+                used -= memory
+                yield job, future
+
+    def _next_admissible(self, window: List[Tuple[JobEstimate, Job]],
+                         used: int, idle: bool) -> Optional[int]:
+        """Índice del trabajo más largo de la ventana si cabe en el presupuesto restante, o None"""
+        best = max(range(len(window)), key=lambda index: window[index][0].frames)
+        memory = window[best][0].memory
+        if idle or self.memory_budget is None or used + memory <= self.memory_budget:
+            return best
+        return None
@@ -5,18 +5,22 @@ Uso: Especifica el archivo de entrada y los tiempos de inicio y fin para cada se
 """
 
 # Alternativa usando librosa y soundfile que son más compatibles con Python 3.13
-import librosa
+# (librosa se importa solo al decodificar formatos que soundfile no lee)
 import soundfile as sf
 import numpy as np
 import os
 import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import List, Tuple, Union, Optional
+from typing import Callable, List, Tuple, Union, Optional
 
 # Imports relativos para la nueva arquitectura
 try:
-    from ..utils.audio_utils import time_to_ms
-    from ..config.settings import OUTPUT_DIR
+    from ..utils.audio_utils import time_to_ms, native_dtype
+    from ..utils.wav_utils import read_wav_layout, extract_wav_frames
+    from ..config.settings import OUTPUT_DIR, STREAM_BLOCK_FRAMES
 except ImportError:
     # Fallback para ejecución directa
     def time_to_ms(time_str: str) -> int:
@@ -41,7 +45,17 @@ except ImportError:
             except ValueError:
                 raise ValueError(f"Formato de tiempo no reconocido: {time_str}")
     
+    def native_dtype(subtype):
+        return 'float32'
+    
+    # Sin el paquete no hay ruta rápida WAV; se usa streaming con soundfile
+    read_wav_layout = extract_wav_frames = None
+    
     OUTPUT_DIR = "output"
+    STREAM_BLOCK_FRAMES = 65536
+
+# Trabajo de exportación de un segmento: (archivo_salida, frame_inicio, frame_fin)
+SegmentJob = Tuple[Path, int, int]
 
 class AudioSplitter:
     """Clase principal para dividir archivos de audio en segmentos"""
@@ -51,7 +65,12 @@ class AudioSplitter:
     
     def split_audio(self, input_file: Union[str, Path], 
                    segments: List[Tuple[int, int, str]], 
-                   output_dir: Union[str, Path] = "output") -> bool:
+                   output_dir: Union[str, Path] = "output",
+                   streaming: bool = True,
+                   block_frames: int = STREAM_BLOCK_FRAMES,
+                   fast_path: bool = True,
+                   workers: int = 1,
+                   single_pass: bool = False) -> bool:
         """
         Divide un archivo de audio en segmentos según los tiempos especificados.
         
@@ -59,45 +78,267 @@ class AudioSplitter:
             input_file: Ruta al archivo de audio
             segments: Lista de tuplas (inicio_ms, fin_ms, nombre)
             output_dir: Directorio donde se guardarán los archivos de salida
+            streaming: Si leer solo los rangos de cada segmento por bloques
+                       (memoria acotada) en lugar de cargar el archivo completo
+            block_frames: Frames leídos por bloque en modo streaming
+            fast_path: Si copiar directamente los bytes de cada segmento cuando
+                       la entrada es un WAV PCM (salida idéntica bit a bit)
+            workers: Número de hilos para exportar segmentos en paralelo
+            single_pass: Si recorrer el origen una sola vez en orden, alimentando
+                         a la vez todos los segmentos activos (ideal para muchos
+                         segmentos solapados o discos con acceso aleatorio lento)
         
         Returns:
-            bool: True si la operación fue exitosa
+            bool: True si todos los segmentos se exportaron correctamente
         """
         try:
-            # Cargar el archivo de audio usando librosa
-            print(f"Cargando archivo de audio: {input_file}")
-            y, sr = librosa.load(str(input_file), sr=None)  # sr=None conserva la frecuencia de muestreo original
-            
             # Crear directorio de salida si no existe
             output_path = Path(output_dir)
             output_path.mkdir(parents=True, exist_ok=True)
             print(f"Directorio de salida: {output_path}")
             
-            # Procesar cada segmento
-            for i, (start_ms, end_ms, name) in enumerate(segments):
-                # Convertir milisegundos a muestras
-                start_sample = int((start_ms / 1000) * sr)
-                end_sample = int((end_ms / 1000) * sr)
+            if single_pass:
+                info = self._probe_source(input_file)
+                if info is not None:
+                    print(f"Lectura secuencial única por bloques de {block_frames} frames: {input_file}")
+                    run = partial(self._run_single_pass, input_file, info, block_frames)
+                    return self._export_segments(segments, info.samplerate, info.frames,
+                                                 output_path, run)
+            
+            if fast_path and read_wav_layout is not None:
+                layout = self._wav_layout(input_file)
+                if layout is not None:
+                    print(f"Copia directa de datos PCM: {input_file}")
+                    run = partial(self._run_jobs, partial(extract_wav_frames, input_file, layout), workers)
+                    return self._export_segments(segments, layout.sample_rate, layout.frames,
+                                                 output_path, run)
+            
+            if streaming:
+                info = self._probe_source(input_file)
+                if info is not None:
+                    print(f"Leyendo por bloques de {block_frames} frames: {input_file}")
+                    run = partial(self._run_jobs, partial(self._export_streaming, input_file, info, block_frames), workers)
+                    return self._export_segments(segments, info.samplerate, info.frames,
+                                                 output_path, run)
+            
+            # Cargar el archivo de audio completo usando librosa
+            print(f"Cargando archivo de audio: {input_file}")
+            # sr=None conserva la frecuencia de muestreo original y mono=False los canales
+            import librosa
+            y, sr = librosa.load(str(input_file), sr=None, mono=False)
+            if y.ndim > 1:
+                y = y.T  # soundfile espera (frames, canales)
+            
+            run = partial(self._run_jobs, partial(self._export_array, y, sr), workers)
+            return self._export_segments(segments, sr, len(y), output_path, run)
+        
+        except Exception as e:
+            print(f"Error al procesar el audio: {e}")
+            return False
+    
+    def _export_segments(self, segments: List[Tuple[int, int, str]],
+                         sr: int, total_frames: int, output_path: Path,
+                         run: Callable[[List[SegmentJob]], List[Optional[Exception]]]) -> bool:
+        """
+        Calcula los trabajos de cada segmento, los ejecuta con la estrategia dada
+        e informa el resultado.
+        
+        Los mensajes y errores se informan siempre en el orden de los segmentos,
+        independientemente del orden en que se hayan escrito.
+        
+        Args:
+            segments: Lista de tuplas (inicio_ms, fin_ms, nombre)
+            sr: Frecuencia de muestreo del origen
+            total_frames: Duración del origen en frames
+            output_path: Directorio de salida
+            run: Estrategia que recibe los trabajos (archivo_salida, frame_inicio, frame_fin)
+                 y devuelve, en el mismo orden, la excepción de cada uno o None
+        
+        Returns:
+            bool: True si todos los segmentos se exportaron correctamente
+        """
+        jobs = []
+        for (start_ms, end_ms, _), output_file in zip(segments, self._segment_output_files(output_path, segments)):
+            start_frame, end_frame = self._segment_frames(start_ms, end_ms, sr, total_frames)
+            jobs.append((output_file, start_frame, end_frame))
+        
+        outcomes = run(jobs)
+        
+        errors = 0
+        for i, ((start_ms, end_ms, _), (output_file, _, _), error) in enumerate(zip(segments, jobs, outcomes)):
+            print(f"Cortando segmento {i+1}: {start_ms}ms - {end_ms}ms")
+            if error is None:
+                print(f"Segmento guardado como: {output_file}")
+            else:
+                print(f"Error en segmento {i+1} ({output_file.name}): {error}")
+                errors += 1
+        
+        return errors == 0
+    
+    def _run_jobs(self, export: Callable[[Path, int, int], None], workers: int,
+                  jobs: List[SegmentJob]) -> List[Optional[Exception]]:
+        """Exporta cada segmento por separado, en serie o con un pool de hilos"""
+        if workers > 1 and len(jobs) > 1:
+            # libsndfile y copy_file_range liberan el GIL durante la E/S
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(export, *job) for job in jobs]
+                return [self._job_outcome(future.result) for future in futures]
+        
+        return [self._job_outcome(partial(export, *job)) for job in jobs]
+    
+    def _run_single_pass(self, input_file: Union[str, Path], info, block_frames: int,
+                         jobs: List[SegmentJob]) -> List[Optional[Exception]]:
+        """
+        Exporta todos los segmentos en un único recorrido secuencial del origen.
+        
+        Los segmentos se ordenan por inicio; cada bloque leído se escribe en todos
+        los segmentos que lo cubren, de modo que cada frame del origen se lee una
+        sola vez. Los tramos sin segmentos activos se saltan con seek hacia delante
+        y solo permanecen abiertos los archivos de los segmentos activos.
+        """
+        dtype = native_dtype(info.subtype)
+        subtype = self._wav_subtype(info.subtype)
+        outcomes: List[Optional[Exception]] = [None] * len(jobs)
+        pending = deque(sorted(range(len(jobs)), key=lambda k: (jobs[k][1], jobs[k][2])))
+        active = {}
+        
+        def open_writer(output_file: Path):
+            return sf.SoundFile(str(output_file), 'w', samplerate=info.samplerate,
+                                channels=info.channels, subtype=subtype)
+        
+        def close_writer(k: int):
+            try:
+                active.pop(k).close()
+            except Exception as e:
+                outcomes[k] = outcomes[k] or e
+        
+        with sf.SoundFile(str(input_file)) as source:
+            position = 0
+            while pending or active:
+                if not active and jobs[pending[0]][1] > position:
+                    position = source.seek(jobs[pending[0]][1])
                 
-                # Extraer el segmento
-                print(f"Cortando segmento {i+1}: {start_ms}ms - {end_ms}ms")
-                segment = y[start_sample:end_sample]
+                # Abrir los segmentos que empiezan en la posición actual
+                while pending and jobs[pending[0]][1] <= position:
+                    k = pending.popleft()
+                    output_file, _, end_frame = jobs[k]
+                    try:
+                        active[k] = open_writer(output_file)
+                    except Exception as e:
+                        outcomes[k] = e
+                        continue
+                    if end_frame <= position:
+                        close_writer(k)  # Segmento vacío
                 
-                # Definir nombre de salida
-                if name:
-                    output_file = output_path / f"{name}.wav"
-                else:
-                    output_file = output_path / f"segment_{i+1}.wav"
+                if not active:
+                    continue
                 
-                # Exportar el segmento usando soundfile
-                sf.write(str(output_file), segment, sr)
-                print(f"Segmento guardado como: {output_file}")
+                # Leer hasta el siguiente inicio o fin de segmento, como máximo un bloque
+                next_event = min(jobs[k][2] for k in active)
+                if pending:
+                    next_event = min(next_event, jobs[pending[0]][1])
+                block = source.read(min(block_frames, next_event - position),
+                                    dtype=dtype, always_2d=True)
+                if len(block) == 0:
+                    break  # La cabecera declaraba más frames de los reales
+                
+                for k in list(active):
+                    try:
+                        active[k].write(block)
+                    except Exception as e:
+                        outcomes[k] = e
+                        close_writer(k)
+                
+                position += len(block)
+                for k in [k for k in active if jobs[k][2] <= position]:
+                    close_writer(k)
+            
+            for k in list(active):
+                close_writer(k)
         
+        return outcomes
+    
+    @staticmethod
+    def _job_outcome(run: Callable[[], None]) -> Optional[Exception]:
+        """Ejecuta un trabajo y devuelve la excepción producida, o None"""
+        try:
+            run()
+            return None
         except Exception as e:
-            print(f"Error al procesar el audio: {e}")
-            return False
+            return e
+    
+    @staticmethod
+    def _probe_source(input_file: Union[str, Path]):
+        """Lee la cabecera con soundfile o devuelve None si el formato no es legible"""
+        try:
+            return sf.info(str(input_file))
+        except RuntimeError as e:
+            # soundfile.LibsndfileError hereda de RuntimeError
+            print(f"soundfile no puede leer {input_file} ({e}), usando carga completa")
+            return None
+    
+    @staticmethod
+    def _wav_layout(input_file: Union[str, Path]):
+        """Devuelve la disposición del WAV si admite copia directa de bytes"""
+        if Path(input_file).suffix.lower() != '.wav':
+            return None
+        return read_wav_layout(input_file)
+    
+    def _export_streaming(self, input_file: Union[str, Path], info, block_frames: int,
+                          output_file: Path, start_frame: int, end_frame: int):
+        """Escribe un segmento leyendo solo su rango de frames, bloque a bloque"""
+        # Conservar canales y formato de muestra del origen
+        dtype = native_dtype(info.subtype)
+        
+        # Cada segmento abre su propio manejador: la posición de lectura no se comparte entre hilos
+        with sf.SoundFile(str(input_file)) as source:
+            source.seek(start_frame)
+            with sf.SoundFile(str(output_file), 'w', samplerate=info.samplerate,
+                              channels=info.channels,
+                              subtype=self._wav_subtype(info.subtype)) as destination:
+                for block in source.blocks(blocksize=block_frames,
+                                           frames=end_frame - start_frame,
+                                           dtype=dtype, always_2d=True):
+                    destination.write(block)
+    
+    @staticmethod
+    def _export_array(y: np.ndarray, sr: int, output_file: Path, start_frame: int, end_frame: int):
+        """Escribe un segmento a partir del audio ya cargado en memoria"""
+        sf.write(str(output_file), y[start_frame:end_frame], sr)
+    
+    @staticmethod
+    def _wav_subtype(source_subtype: str) -> str:
+        """Elige el subtipo WAV de salida: el del origen si WAV lo admite, PCM_16 si no"""
+        if source_subtype and sf.check_format('WAV', source_subtype):
+            return source_subtype
+        return 'PCM_16'
+    
+    @staticmethod
+    def _segment_frames(start_ms: int, end_ms: int, sr: int, total_frames: int) -> Tuple[int, int]:
+        """Convierte un rango en milisegundos a frames, acotado a la duración del archivo"""
+        start_frame = min(int((start_ms / 1000) * sr), total_frames)
+        end_frame = min(int((end_ms / 1000) * sr), total_frames)
+        return start_frame, max(start_frame, end_frame)
+    
+    @staticmethod
+    def _segment_output_files(output_path: Path, segments: List[Tuple[int, int, str]]) -> List[Path]:
+        """
+        Define el nombre de salida de cada segmento.
         
-        return True
+        Los nombres repetidos reciben un sufijo numérico para que dos segmentos
+        nunca escriban el mismo archivo (relevante al exportar en paralelo).
+        """
+        output_files = []
+        used = set()
+        for i, (_, _, name) in enumerate(segments):
+            stem = name if name else f"segment_{i+1}"
+            candidate, counter = stem, 1
+            while candidate in used:
+                candidate = f"{stem}_{counter}"
+                counter += 1
+            used.add(candidate)
+            output_files.append(output_path / f"{candidate}.wav")
+        return output_files
     
     def convert_to_ms(self, time_str: str) -> int:
         """
@@ -143,10 +384,11 @@ class AudioSplitter:
             print("\nNo se definieron segmentos. Terminando.")
 
 # Funciones de compatibilidad para mantener la API anterior
-def split_audio(input_file, segments, output_dir="output"):
+def split_audio(input_file, segments, output_dir="output", workers=1, single_pass=False):
     """Función de compatibilidad - usa AudioSplitter internamente"""
     splitter = AudioSplitter()
-    return splitter.split_audio(input_file, segments, output_dir)
+    return splitter.split_audio(input_file, segments, output_dir,
+                                workers=workers, single_pass=single_pass)
 
 def convert_to_ms(time_str):
     """
@@ -182,6 +424,44 @@ def convert_to_ms(time_str):
         except ValueError:
             raise ValueError(f"Formato de tiempo no reconocido: {time_str}")
 
+def parse_segment(spec: str) -> Tuple[int, int, str]:
+    """
+    Convierte una especificación "inicio-fin:nombre" en un segmento.
+    
+    Los tiempos también usan ':' (MM:SS o HH:MM:SS), así que el fin toma
+    tantos campos como el inicio y el resto es el nombre, aunque sea numérico
+    ("0:30-1:45:01" es la pista "01"). Solo si así el fin quedaría antes del
+    inicio se lee un campo más como tiempo ("59:00-1:01:00").
+    
+    Args:
+        spec (str): Segmento, p. ej. "0:30-1:45:intro" o "1:00:00-1:02:30" (el nombre es opcional)
+    
+    Returns:
+        Tuple[int, int, str]: (inicio_ms, fin_ms, nombre)
+    
+    Raises:
+        ValueError: Si la especificación no es válida
+    """
+    start_str, separator, end_spec = spec.partition('-')
+    if not separator:
+        raise ValueError(f"Segmento no válido (se espera inicio-fin[:nombre]): {spec}")
+    
+    start_ms = convert_to_ms(start_str)
+    fields = end_spec.split(':')
+    count = start_str.count(':') + 1
+    end_ms = convert_to_ms(':'.join(fields[:count]))
+    name = ':'.join(fields[count:])
+    
+    if end_ms < start_ms and len(fields) > count and count < 3:
+        try:
+            longer_end_ms = convert_to_ms(':'.join(fields[:count + 1]))
+        except ValueError:
+            longer_end_ms = None
+        if longer_end_ms is not None and longer_end_ms >= start_ms:
+            end_ms, name = longer_end_ms, ':'.join(fields[count + 1:])
+    
+    return start_ms, end_ms, name
+
 def interactive_mode():
     """Función de compatibilidad - usa AudioSplitter internamente"""
     splitter = AudioSplitter()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Ingest Watcher - Vigila una carpeta de entrada y procesa cada archivo en
+cuanto termina de copiarse
+"""
+
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from rich.console import Console
+
+from ..config.settings import (SUPPORTED_INPUT_FORMATS, WATCH_INTERVAL, WATCH_SETTLE_SECONDS,
+                               WATCH_PROCESSED_DIRNAME, WATCH_FAILED_DIRNAME)
+from ..config.runtime import mark_worker_process
+from ..utils.discovery import iter_files
+from ..utils.file_utils import get_unique_filename
+from .converter import AudioConverter
+from .splitter import AudioSplitter
+
+console = Console()
+
+# Tarea de ingesta: (acción, archivo, salida, opciones)
+WatchTask = Tuple[str, str, str, Dict]
+
+
+class IngestWatcher:
+    """
+    Carpeta de ingesta vigilada por sondeo.
+
+    Cada archivo de audio que aparece en la carpeta se considera listo cuando
+    su tamaño y mtime no cambian durante `settle` segundos. Entonces se
+    convierte (AudioConverter) o se divide (AudioSplitter) en un pool de
+    procesos y, al terminar, se mueve a la subcarpeta de procesados o de
+    fallidos. Si no se puede mover, se ignora hasta que cambie su tamaño o
+    mtime, para no procesarlo en bucle. El bucle sigue sondeando mientras el
+    pool trabaja, así la latencia de cada archivo es de unos pocos segundos.
+    """
+
+    def __init__(self,
+                 watch_dir: Union[str, Path],
+                 output_dir: Union[str, Path],
+                 action: str = 'convert',
+                 formats: Optional[List[Tuple[str, str]]] = None,
+                 segments: Optional[List[Tuple[int, int, str]]] = None,
+                 workers: int = 1,
+                 interval: float = WATCH_INTERVAL,
+                 settle: float = WATCH_SETTLE_SECONDS):
+        """
+        Args:
+            watch_dir: Carpeta de ingesta
+            output_dir: Directorio de salida
+            action: 'convert' o 'split'
+            formats: Pares (formato, calidad) de salida para 'convert'
+            segments: Segmentos (inicio_ms, fin_ms, nombre) para 'split'
+            workers: Procesos del pool
+            interval: Segundos entre sondeos
+            settle: Segundos sin cambios de tamaño/mtime para dar un archivo por completo
+        """
+        if action not in ('convert', 'split'):
+            raise ValueError(f"Acción no soportada: {action}")
+        if action == 'split' and not segments:
+            raise ValueError("La acción 'split' requiere segmentos")
+
+        self.watch_dir = Path(watch_dir)
+        self.output_dir = Path(output_dir)
+        self.action = action
+        self.formats = formats or [('mp3', 'high')]
+        self.segments = segments or []
+        self.workers = max(1, workers)
+        self.interval = interval
+        self.settle = settle
+        self.processed_dir = self.watch_dir / WATCH_PROCESSED_DIRNAME
+        self.failed_dir = self.watch_dir / WATCH_FAILED_DIRNAME
+
+        # Archivo -> ((tamaño, mtime_ns), instante desde el que no cambia)
+        self._candidates: Dict[Path, Tuple[Tuple[int, int], float]] = {}
+        # Trabajo en curso -> (archivo, salidas reservadas)
+        self._in_flight: Dict[Future, Tuple[Path, List[Path]]] = {}
+        self._reserved_outputs: Set[Path] = set()
+        # Archivo ya procesado que no se pudo apartar -> (tamaño, mtime_ns) de entonces
+        self._unmovable: Dict[Path, Tuple[int, int]] = {}
+        self.processed = 0
+        self.failed = 0
+
+    def poll(self) -> List[Path]:
+        """
+        Sondea la carpeta y devuelve los archivos que ya están estables
+
+        Returns:
+            List[Path]: Archivos listos para procesar (no incluye los que están en curso)
+        """
+        now = time.monotonic()
+        busy = {path for path, _ in self._in_flight.values()}
+        seen = set()
+        ready = []
+
+        for path in iter_files(self.watch_dir, SUPPORTED_INPUT_FORMATS):
+            # Ocultos: temporales de copias en curso (rsync, navegadores...)
+            if path.name.startswith('.') or path in busy:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+
+            seen.add(path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if path in self._unmovable:
+                if self._unmovable[path] == signature:
+                    continue
+                # Cambió (p. ej. se volvió a copiar): procesarlo de nuevo
+                del self._unmovable[path]
+
+            previous = self._candidates.get(path)
+            if previous is None or previous[0] != signature:
+                self._candidates[path] = (signature, now)
+            elif now - previous[1] >= self.settle:
+                ready.append(path)
+
+        # Olvidar los archivos que desaparecieron
+        for path in list(self._candidates):
+            if path not in seen:
+                del self._candidates[path]
+        for path in list(self._unmovable):
+            if path not in seen:
+                del self._unmovable[path]
+
+        return ready
+
+    def run(self, once: bool = False):
+        """
+        Bucle de vigilancia
+
+        Args:
+            once: Procesar los archivos presentes y terminar cuando no quede ninguno
+        """
+        self.watch_dir.mkdir(parents=True, exist_ok=True)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        console.print(f"[blue]Vigilando:[/blue] {self.watch_dir} -> {self.output_dir} "
+                      f"({self.action}, {self.workers} proceso(s))")
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=mark_worker_process) as executor:
+            try:
+                while True:
+                    for path in self.poll():
+                        del self._candidates[path]
+                        task, reserved = self._task(path)
+                        self._in_flight[executor.submit(_process_task, task)] = (path, reserved)
+
+                    if once and not self._in_flight and not self._candidates:
+                        break
+
+                    if self._in_flight:
+                        done, _ = wait(self._in_flight, timeout=self.interval,
+                                       return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._finish(future)
+                    else:
+                        time.sleep(self.interval)
+            except KeyboardInterrupt:
+                console.print("[yellow]Deteniendo: esperando a los trabajos en curso...[/yellow]")
+                done, _ = wait(self._in_flight)
+                for future in done:
+                    # Los interrumpidos se quedan en la carpeta para el próximo arranque
+                    if future.exception() is None:
+                        self._finish(future)
+
+        console.print(f"[green]Ingesta detenida:[/green] {self.processed} procesados, {self.failed} fallidos")
+
+    def _task(self, path: Path) -> Tuple[WatchTask, List[Path]]:
+        """
+        Prepara la tarea de un archivo reservando sus salidas
+
+        Returns:
+            Tuple[WatchTask, List[Path]]: (tarea, salidas reservadas hasta que termine)
+        """
+        if self.action == 'split':
+            # Un directorio de segmentos por archivo
+            extensions = ['']
+        else:
+            extensions = [f".{target_format}" for target_format, _ in self.formats]
+
+        counter = 0
+        while True:
+            stem = f"{path.stem}_{counter}" if counter else path.stem
+            reserved = [self.output_dir / f"{stem}{extension}" for extension in extensions]
+            if not any(p.exists() or p in self._reserved_outputs for p in reserved):
+                break
+            counter += 1
+
+        self._reserved_outputs.update(reserved)
+        if self.action == 'split':
+            return ('split', str(path), str(reserved[0]), {'segments': self.segments}), reserved
+        return ('convert', str(path), str(reserved[0]), {'formats': self.formats}), reserved
+
+    def _finish(self, future: Future):
+        """Registra el resultado de un trabajo y aparta el archivo de origen"""
+        path, reserved = self._in_flight.pop(future)
+        self._reserved_outputs.difference_update(reserved)
+        try:
+            success = future.result()
+        except Exception as e:
+            console.print(f"[red]Error procesando {path.name}: {e}[/red]")
+            success = False
+
+        destination_dir = self.processed_dir if success else self.failed_dir
+        destination_dir.mkdir(parents=True, exist_ok=True)
+        destination = get_unique_filename(destination_dir, path.stem, path.suffix)
+        try:
+            shutil.move(str(path), str(destination))
+        except OSError as e:
+            console.print(f"[red]No se pudo mover {path.name}: {e}[/red]")
+            try:
+                stat = path.stat()
+                self._unmovable[path] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                pass
+
+        if success:
+            self.processed += 1
+            console.print(f"[green]✓ Procesado:[/green] {path.name}")
+        else:
+            self.failed += 1
+            console.print(f"[red]✗ Fallido:[/red] {path.name} -> {destination_dir}")
+
+
+def _process_task(task: WatchTask) -> bool:
+    """Ejecuta una tarea de ingesta dentro de un proceso del pool"""
+    action, input_path, output, options = task
+
+    if action == 'split':
+        return AudioSplitter().split_audio(input_path, options['segments'], output)
+
+    converter = AudioConverter()
+    targets = converter.plan_targets(output, options['formats'])
+    return all(converter.convert_file_multi(input_path, targets))
@@ -2,7 +2,21 @@
 Módulo UI - Interfaces de usuario del Audio Splitter
 """
 
-from .cli import main_cli
-from .interactive import interactive_menu
+# Exportaciones resueltas bajo demanda (PEP 562) para un arranque rápido del CLI
+_LAZY_IMPORTS = {
+    'main_cli': '.cli',
+    'interactive_menu': '.interactive'
+}
 
 __all__ = ['main_cli', 'interactive_menu']
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -6,13 +6,25 @@ import argparse
 import sys
 from pathlib import Path
 
-# Imports relativos limpios
-from ..core.splitter import split_audio, convert_to_ms
-from ..core.converter import AudioConverter
-from ..core.metadata_manager import MetadataEditor, AudioMetadata
-from rich.console import Console
+# Solo configuración ligera a nivel de módulo: cada manejador importa los módulos
+# core que necesita (librosa, mutagen, rich...) para que --version, --help o
+# metadata no paguen la carga de todo el paquete
+from ..config.settings import (MEMORY_BUDGET, WATCH_INTERVAL, WATCH_SETTLE_SECONDS,
+                               SERVER_HOST, SERVER_PORT, SERVER_QUEUE_SIZE, METADATA_WORKERS,
+                               LIBRARY_INDEX_PATH)
 
-console = Console()
+class _LazyConsole:
+    """Consola rich creada en el primer uso"""
+    
+    _console = None
+    
+    def __getattr__(self, name):
+        if _LazyConsole._console is None:
+            from rich.console import Console
+            _LazyConsole._console = Console()
+        return getattr(_LazyConsole._console, name)
+
+console = _LazyConsole()
 
 def create_parser():
     """Crea el parser principal de argumentos"""
@@ -32,28 +44,117 @@ def create_parser():
     split_parser.add_argument('--output-dir', '-o', default='data/output', help='Directorio de salida')
     split_parser.add_argument('--segments', '-s', nargs='+', 
                              help='Segmentos en formato "inicio-fin:nombre"')
+    split_parser.add_argument('--jobs', '-j', type=int, default=1,
+                             help='Número de segmentos a exportar en paralelo')
+    split_parser.add_argument('--single-pass', action='store_true',
+                             help='Leer el archivo una sola vez en orden (muchos segmentos solapados)')
     
     # Comando convert
     convert_parser = subparsers.add_parser('convert', help='Convertir formatos de audio')
     convert_parser.add_argument('input', help='Archivo o directorio de entrada')
     convert_parser.add_argument('--output', '-o', required=True, help='Archivo o directorio de salida')
-    convert_parser.add_argument('--format', '-f', required=True, choices=['wav', 'mp3', 'flac'], 
-                               help='Formato de salida')
+    convert_parser.add_argument('--format', '-f', required=True, nargs='+', metavar='FORMATO[:CALIDAD]',
+                               help='Formato(s) de salida: wav, mp3, flac, opcionalmente con calidad '
+                                    '(p. ej. "-f wav mp3:high flac"); varios formatos se codifican '
+                                    'con una sola lectura del origen')
     convert_parser.add_argument('--quality', '-q', default='high', 
-                               help='Calidad de conversión')
+                               help='Calidad de conversión por defecto')
     convert_parser.add_argument('--batch', action='store_true', 
                                help='Conversión por lotes')
     convert_parser.add_argument('--recursive', '-r', action='store_true',
                                help='Buscar recursivamente')
+    convert_parser.add_argument('--jobs', '-j', type=int, default=1,
+                               help='Número de procesos de conversión en paralelo (con --batch o --sync)')
+    convert_parser.add_argument('--incremental', action='store_true',
+                               help='Convertir solo archivos nuevos o modificados (con --batch)')
+    convert_parser.add_argument('--sync', action='store_true',
+                               help='Sincronizar un árbol espejo: misma estructura de carpetas, '
+                                    'solo cambios, y eliminación de salidas sin origen')
+    convert_parser.add_argument('--memory-budget', type=int, default=None, metavar='MB',
+                               help='Memoria máxima de audio decodificado a la vez entre los procesos '
+                                    '(con --jobs; por defecto la de config.settings.MEMORY_BUDGET)')
+    convert_parser.add_argument('--cache', action='store_true',
+                               help='Reutilizar conversiones idénticas desde la caché de data/cache')
+    convert_parser.add_argument('--cache-size', type=int, default=None, metavar='MB',
+                               help='Tamaño máximo de la caché en MB')
+    
+    # Comando watch
+    watch_parser = subparsers.add_parser('watch', help='Vigilar una carpeta de ingesta')
+    watch_parser.add_argument('watch_dir', help='Carpeta de ingesta a vigilar')
+    watch_parser.add_argument('--output', '-o', required=True, help='Directorio de salida')
+    watch_parser.add_argument('--action', choices=['convert', 'split'], default='convert',
+                             help='Procesamiento de cada archivo')
+    watch_parser.add_argument('--format', '-f', nargs='+', default=['mp3'], metavar='FORMATO[:CALIDAD]',
+                             help='Formato(s) de salida para convert')
+    watch_parser.add_argument('--quality', '-q', default='high',
+                             help='Calidad de conversión por defecto')
+    watch_parser.add_argument('--segments', '-s', nargs='+',
+                             help='Segmentos "inicio-fin:nombre" para split')
+    watch_parser.add_argument('--jobs', '-j', type=int, default=1,
+                             help='Número de procesos en paralelo')
+    watch_parser.add_argument('--interval', type=float, default=WATCH_INTERVAL,
+                             help='Segundos entre sondeos')
+    watch_parser.add_argument('--settle', type=float, default=WATCH_SETTLE_SECONDS,
+                             help='Segundos sin cambios para dar un archivo por completo')
+    watch_parser.add_argument('--once', action='store_true',
+                             help='Procesar lo presente y terminar')
+    
+    # Comando serve
+    serve_parser = subparsers.add_parser('serve', help='Servicio HTTP local con procesos precalentados')
+    serve_parser.add_argument('--host', default=SERVER_HOST, choices=['127.0.0.1', 'localhost', '::1'],
+                             help='Dirección local de escucha')
+    serve_parser.add_argument('--port', '-p', type=int, default=SERVER_PORT, help='Puerto')
+    serve_parser.add_argument('--jobs', '-j', type=int, default=2,
+                             help='Número de procesos del pool')
+    serve_parser.add_argument('--queue-size', type=int, default=SERVER_QUEUE_SIZE,
+                             help='Peticiones en espera antes de responder 503')
+    serve_parser.add_argument('--root', action='append', dest='roots', metavar='DIRECTORIO',
+                             help='Directorio accesible por el servicio (repetible; '
+                                  'por defecto data/sources y data/output)')
     
     # Comando metadata
     metadata_parser = subparsers.add_parser('metadata', help='Editar metadatos')
-    metadata_parser.add_argument('file_path', help='Archivo de audio')
+    metadata_parser.add_argument('file_path',
+                                help='Archivo de audio (con --batch: patrón glob, directorio, manifiesto o lista)')
     metadata_parser.add_argument('--title', help='Título')
     metadata_parser.add_argument('--artist', help='Artista')
     metadata_parser.add_argument('--album', help='Álbum')
+    metadata_parser.add_argument('--albumartist', help='Artista del álbum')
     metadata_parser.add_argument('--genre', help='Género')
     metadata_parser.add_argument('--year', help='Año')
+    metadata_parser.add_argument('--track', help='Número de track')
+    metadata_parser.add_argument('--composer', help='Compositor')
+    metadata_parser.add_argument('--comment', help='Comentario')
+    metadata_parser.add_argument('--batch', action='store_true',
+                                help='Aplicar los cambios a todos los archivos que coincidan')
+    metadata_parser.add_argument('--template', '-t',
+                                help='Plantilla de TEMPLATES_DIR (nombre o ruta) a aplicar; '
+                                     'los campos indicados la sobrescriben')
+    metadata_parser.add_argument('--jobs', '-j', type=int, default=METADATA_WORKERS,
+                                help='Hilos para la edición por lotes')
+    
+    # Comando index
+    index_parser = subparsers.add_parser('index', help='Catálogo SQLite de la biblioteca')
+    index_subparsers = index_parser.add_subparsers(dest='index_command', help='Operaciones del índice')
+    
+    index_scan_parser = index_subparsers.add_parser('scan', help='Crear o actualizar el índice de un directorio')
+    index_scan_parser.add_argument('directory', help='Directorio de la biblioteca')
+    index_scan_parser.add_argument('--db', default=str(LIBRARY_INDEX_PATH), help='Archivo del índice')
+    index_scan_parser.add_argument('--jobs', '-j', type=int, default=METADATA_WORKERS,
+                                  help='Hilos para leer etiquetas')
+    
+    index_query_parser = index_subparsers.add_parser('query', help='Consultar el índice')
+    index_query_parser.add_argument('--db', default=str(LIBRARY_INDEX_PATH), help='Archivo del índice')
+    index_query_parser.add_argument('--where', nargs='+', default=[], metavar='CAMPO=VALOR',
+                                   help='Filtrar por valor exacto de un campo')
+    index_query_parser.add_argument('--missing', nargs='+', default=[], metavar='CAMPO',
+                                   help='Archivos con estos campos vacíos')
+    index_query_parser.add_argument('--under', help='Limitar a un directorio')
+    index_query_parser.add_argument('--limit', type=int, help='Número máximo de resultados')
+    index_query_parser.add_argument('--albums', action='store_true',
+                                   help='Pistas y duración total por álbum')
+    index_query_parser.add_argument('--errors', action='store_true',
+                                   help='Archivos que no se pudieron leer')
     
     return parser
 
@@ -65,22 +166,14 @@ def handle_split_command(args):
             return False
         
         # Procesar segmentos
-        segments = []
-        for seg in args.segments:
-            try:
-                # Formato: "inicio-fin:nombre"
-                time_range, name = seg.split(':', 1) if ':' in seg else (seg, "")
-                start_str, end_str = time_range.split('-')
-                
-                start_ms = convert_to_ms(start_str)
-                end_ms = convert_to_ms(end_str)
-                segments.append((start_ms, end_ms, name))
-            except Exception as e:
-                console.print(f"[red]Error procesando segmento '{seg}': {e}[/red]")
-                return False
+        segments = _parse_segments(args.segments)
+        if segments is None:
+            return False
         
         # Ejecutar división
-        success = split_audio(args.input_file, segments, args.output_dir)
+        from ..core.splitter import split_audio
+        success = split_audio(args.input_file, segments, args.output_dir,
+                              workers=args.jobs, single_pass=args.single_pass)
         if success:
             console.print(f"[green]✓ División completada en '{args.output_dir}'[/green]")
         else:
@@ -92,77 +185,266 @@ def handle_split_command(args):
         console.print(f"[red]Error: {e}[/red]")
         return False
 
+def _parse_segments(segment_args):
+    """Convierte argumentos "inicio-fin:nombre" en segmentos (inicio_ms, fin_ms, nombre)"""
+    from ..core.splitter import parse_segment
+    
+    segments = []
+    for seg in segment_args:
+        try:
+            segments.append(parse_segment(seg))
+        except Exception as e:
+            console.print(f"[red]Error procesando segmento '{seg}': {e}[/red]")
+            return None
+    return segments
+
 def handle_convert_command(args):
     """Maneja el comando convert"""
     try:
-        converter = AudioConverter()
+        from ..core.converter import AudioConverter, parse_format_specs
+        from ..core.conversion_cache import ConversionCache
         
-        if args.batch:
+        cache = None
+        if args.cache:
+            cache = ConversionCache()
+            if args.cache_size is not None:
+                cache.max_bytes = args.cache_size * 1024 * 1024
+        converter = AudioConverter(cache=cache)
+        specs = parse_format_specs(args.format, args.quality)
+        memory_budget = MEMORY_BUDGET
+        if args.memory_budget is not None:
+            memory_budget = args.memory_budget * 1024 * 1024
+        
+        if args.batch or args.sync:
+            if len(specs) > 1:
+                console.print("[red]Error: la conversión por lotes admite un único formato[/red]")
+                return False
+        
+        if args.sync:
+            # Árbol espejo incremental
+            target_format, quality = specs[0]
+            counts = converter.sync_library(
+                args.input, args.output, target_format, quality, True, workers=args.jobs,
+                memory_budget=memory_budget
+            )
+            _print_cache_stats(cache)
+            return counts['failed'] == 0
+        elif args.batch:
             # Conversión por lotes
+            target_format, quality = specs[0]
             successful, failed = converter.batch_convert(
-                args.input, args.output, args.format, 
-                args.quality, True, args.recursive
+                args.input, args.output, target_format, 
+                quality, True, args.recursive, workers=args.jobs,
+                incremental=args.incremental, memory_budget=memory_budget
             )
             console.print(f"[green]Conversión completada: {successful} exitosos, {failed} fallidos[/green]")
+            _print_cache_stats(cache)
             return failed == 0
         else:
-            # Conversión individual
-            success = converter.convert_file(
-                args.input, args.output, args.format, args.quality, True
-            )
+            # Conversión individual (una lectura para todos los formatos pedidos)
+            targets = converter.plan_targets(args.output, specs)
+            success = all(converter.convert_file_multi(args.input, targets, True))
             if success:
                 console.print("[green]✓ Conversión exitosa[/green]")
             else:
                 console.print("[red]✗ Error en conversión[/red]")
+            _print_cache_stats(cache)
             return success
             
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
         return False
 
+def _print_cache_stats(cache):
+    """Muestra las estadísticas de la caché de conversiones, si se usó"""
+    if cache is None:
+        return
+    
+    stats = cache.stats()
+    console.print(
+        f"[cyan]Caché:[/cyan] {stats['hits']} aciertos, {stats['misses']} fallos "
+        f"({stats['hit_rate']:.0%}), {stats['entries']} entradas, "
+        f"{stats['bytes'] / 1024 / 1024:.1f}/{stats['max_bytes'] / 1024 / 1024:.0f} MB"
+    )
+
+def handle_watch_command(args):
+    """Maneja el comando watch"""
+    try:
+        segments = None
+        if args.action == 'split':
+            if not args.segments:
+                console.print("[red]Error: Se requieren segmentos para dividir[/red]")
+                return False
+            segments = _parse_segments(args.segments)
+            if segments is None:
+                return False
+        
+        from ..core.converter import parse_format_specs
+        from ..core.watcher import IngestWatcher
+        
+        watcher = IngestWatcher(
+            args.watch_dir, args.output, action=args.action,
+            formats=parse_format_specs(args.format, args.quality), segments=segments,
+            workers=args.jobs, interval=args.interval, settle=args.settle
+        )
+        watcher.run(once=args.once)
+        return watcher.failed == 0
+        
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        return False
+
+def handle_serve_command(args):
+    """Maneja el comando serve"""
+    try:
+        from .server import serve
+        serve(args.host, args.port, workers=args.jobs, queue_size=args.queue_size,
+              roots=args.roots)
+        return True
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        return False
+
 def handle_metadata_command(args):
     """Maneja el comando metadata"""
     try:
-        editor = MetadataEditor()
+        # Solo los campos indicados; una cadena vacía borra el campo
+        changes = {field: value for field, value in [
+            ('title', args.title),
+            ('artist', args.artist),
+            ('album', args.album),
+            ('albumartist', args.albumartist),
+            ('genre', args.genre),
+            ('date', args.year),
+            ('track', args.track),
+            ('composer', args.composer),
+            ('comment', args.comment)
+        ] if value is not None}
         
-        # Leer metadatos existentes
-        existing_metadata = editor.read_metadata(args.file_path)
-        if existing_metadata is None:
-            console.print("[red]Error leyendo metadatos[/red]")
+        if args.template:
+            return _handle_metadata_template(args, changes)
+        
+        if not changes:
+            console.print("[red]Error: No se indicaron cambios de metadatos[/red]")
             return False
         
-        # Crear nueva estructura con cambios
-        new_metadata = AudioMetadata()
-        
-        # Copiar valores existentes
-        for field in ['title', 'artist', 'album', 'genre', 'date', 'track', 'comment']:
-            setattr(new_metadata, field, getattr(existing_metadata, field, None))
-        
-        # Aplicar cambios desde argumentos
-        if args.title:
-            new_metadata.title = args.title
-        if args.artist:
-            new_metadata.artist = args.artist
-        if args.album:
-            new_metadata.album = args.album
-        if args.genre:
-            new_metadata.genre = args.genre
-        if args.year:
-            new_metadata.date = args.year
-        
-        # Guardar cambios
-        success = editor.write_metadata(args.file_path, new_metadata)
-        if success:
-            console.print("[green]✓ Metadatos actualizados[/green]")
-        else:
-            console.print("[red]✗ Error actualizando metadatos[/red]")
+        if args.batch:
+            return _handle_metadata_batch(args, changes)
         
-        return success
+        from ..core.metadata_manager import MetadataEditor
+        
+        editor = MetadataEditor()
+        try:
+            editor.update_metadata(args.file_path, changes)
+        except Exception as e:
+            console.print(f"[red]✗ Error actualizando metadatos: {e}[/red]")
+            return False
+        
+        console.print("[green]✓ Metadatos actualizados[/green]")
+        return True
         
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
         return False
 
+def _handle_metadata_batch(args, changes):
+    """Edición por lotes: informa de los fallos al final sin detener el lote"""
+    from ..core.metadata_batch import BatchMetadataEditor, resolve_batch_sources
+    
+    batch = BatchMetadataEditor(workers=args.jobs)
+    result = batch.apply(resolve_batch_sources(args.file_path), changes)
+    return _report_metadata_batch(args, result)
+
+def _handle_metadata_template(args, overrides):
+    """Aplica una plantilla, compilada una sola vez, a uno o muchos archivos"""
+    from ..core.metadata_batch import BatchMetadataEditor, resolve_batch_sources
+    from ..core.metadata_templates import MetadataTemplate
+    
+    template = MetadataTemplate.load(args.template).compile(overrides)
+    
+    batch = BatchMetadataEditor(workers=args.jobs)
+    result = batch.apply_template(resolve_batch_sources(args.file_path), template)
+    return _report_metadata_batch(args, result)
+
+def _report_metadata_batch(args, result):
+    """Resumen de una edición por lotes con los fallos de cada archivo"""
+    if not result.updated and not result.failures:
+        console.print(f"[yellow]No se encontraron archivos de audio en: {args.file_path}[/yellow]")
+        return False
+    
+    console.print(f"[green]✓ Metadatos actualizados: {result.updated} archivos[/green]")
+    if result.failures:
+        console.print(f"[red]✗ Fallidos: {len(result.failures)}[/red]")
+        for file_path, reason in result.failures:
+            console.print(f"  [red]{file_path}[/red]: {reason}")
+    
+    return not result.failures
+
+def handle_index_command(args):
+    """Maneja el comando index"""
+    try:
+        from ..core.library_index import LibraryIndex
+        
+        if args.index_command == 'scan':
+            with LibraryIndex(args.db) as index:
+                counts = index.scan(args.directory, workers=args.jobs)
+            console.print(f"[green]✓ Índice actualizado:[/green] {counts['added']} nuevos, "
+                          f"{counts['updated']} actualizados, {counts['unchanged']} sin cambios, "
+                          f"{counts['removed']} eliminados")
+            if counts['failed']:
+                console.print(f"[yellow]⚠ {counts['failed']} archivos no se pudieron leer "
+                              f"(index query --errors)[/yellow]")
+            return True
+        
+        if args.index_command == 'query':
+            return _handle_index_query(args, LibraryIndex)
+        
+        console.print("[red]Error: Indica una operación: scan o query[/red]")
+        return False
+        
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        return False
+
+def _handle_index_query(args, index_class):
+    """Consulta el índice; las rutas se imprimen una por línea para encadenar con metadata --batch"""
+    if not Path(args.db).exists():
+        console.print(f"[red]Índice no encontrado: {args.db} (ejecuta index scan)[/red]")
+        return False
+    
+    equals = {}
+    for condition in args.where:
+        field, separator, value = condition.partition('=')
+        if not separator:
+            console.print(f"[red]Condición no válida (CAMPO=VALOR): {condition}[/red]")
+            return False
+        equals[field.strip()] = value
+    
+    with index_class(args.db) as index:
+        if args.albums:
+            from rich.table import Table
+            
+            table = Table(title="Álbumes")
+            table.add_column("Artista", style="cyan")
+            table.add_column("Álbum", style="white")
+            table.add_column("Pistas", justify="right")
+            table.add_column("Duración", justify="right")
+            for row in index.album_summary(args.under):
+                minutes, seconds = divmod(int(row['duration'] or 0), 60)
+                table.add_row(row['albumartist'] or "-", row['album'] or "-",
+                              str(row['tracks']), f"{minutes}:{seconds:02d}")
+            console.print(table)
+            return True
+        
+        if args.errors:
+            for row in index.failures():
+                print(f"{row['path']}\t{row['error']}")
+            return True
+        
+        for row in index.find(equals, args.missing, args.under, args.limit):
+            print(row['path'])
+        return True
+
 def main_cli(args=None):
     """Función principal del CLI"""
     parser = create_parser()
@@ -172,13 +454,23 @@ def main_cli(args=None):
         parser.print_help()
         return False
     
+    # Directorios de datos y logging solo para comandos reales (no --help/--version)
+    from ..config.runtime import initialize_runtime
+    initialize_runtime()
+    
     # Ejecutar comando correspondiente
     if parsed_args.command == 'split':
         return handle_split_command(parsed_args)
     elif parsed_args.command == 'convert':
         return handle_convert_command(parsed_args)
+    elif parsed_args.command == 'watch':
+        return handle_watch_command(parsed_args)
+    elif parsed_args.command == 'serve':
+        return handle_serve_command(parsed_args)
     elif parsed_args.command == 'metadata':
         return handle_metadata_command(parsed_args)
+    elif parsed_args.command == 'index':
+        return handle_index_command(parsed_args)
     else:
         console.print(f"[red]Comando no reconocido: {parsed_args.command}[/red]")
         return False
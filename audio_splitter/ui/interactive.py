@@ -14,6 +14,9 @@ console = Console()
 def interactive_menu():
     """Menú principal interactivo del sistema Audio Splitter Suite"""
     
+    from ..config.runtime import initialize_runtime
+    initialize_runtime()
+    
     console.print(Panel(
         "[bold blue]🎵 Audio Splitter Suite 2.0[/bold blue]\n" +
         "[dim]Sistema completo de procesamiento de audio[/dim]",
@@ -0,0 +1,460 @@
+"""
+Servicio HTTP local del Audio Splitter Suite
+
+Expone split, convert, info y metadata sobre HTTP en localhost, atendidos por
+un pool de procesos precalentado (las importaciones pesadas se pagan una sola
+vez al arrancar) y una cola de peticiones acotada. Solo usa la biblioteca
+estándar.
+
+Endpoints (cuerpo y respuesta JSON salvo que se indique):
+    GET  /health                  Estado del servicio
+    POST /info      {"path"}      Información técnica del archivo
+    POST /metadata  {"path", "update"?}
+                                  Lee los metadatos o aplica los campos de "update"
+    POST /convert   {"input", "formats", "quality"?, "output"?, "preserve_metadata"?}
+                                  Con "output" escribe en disco y devuelve las rutas;
+                                  sin él (un solo formato) devuelve los bytes del audio
+    POST /split     {"input", "segments", "output_dir"}
+                                  Divide en segmentos "inicio-fin:nombre"
+    GET  /file?path=...           Descarga un archivo de disco (p. ej. un resultado)
+
+Las peticiones POST deben ser application/json, las cabeceras Host y Origin
+(si viene) deben nombrar la dirección local del servicio, y toda ruta de
+entrada, salida o descarga debe estar dentro de los directorios raíz
+configurados; si no, se responde 415 o 403. Así una página web abierta en el
+navegador no puede usar el servicio para leer o escribir archivos.
+"""
+
+import json
+import mimetypes
+import shutil
+import socket
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from email.message import Message
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlparse
+
+from rich.console import Console
+
+from ..config.settings import SERVER_HOST, SERVER_PORT, SERVER_QUEUE_SIZE, SERVER_ROOTS
+from ..config.runtime import mark_worker_process
+from ..core.converter import AudioConverter, AudioFormatError, parse_format_specs
+from ..core.splitter import AudioSplitter, parse_segment
+from ..core.metadata_manager import MetadataEditor, AudioMetadata
+
+console = Console()
+
+# Direcciones aceptadas: el servicio nunca se expone fuera de la máquina
+LOOPBACK_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+# Bytes por escritura al enviar archivos
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Campos de AudioMetadata editables por JSON (la carátula es binaria)
+METADATA_TEXT_FIELDS = [name for name in AudioMetadata.__dataclass_fields__
+                        if not name.startswith('artwork')]
+
+AUDIO_MIME_TYPES = {
+    'wav': 'audio/wav',
+    'mp3': 'audio/mpeg',
+    'flac': 'audio/flac'
+}
+
+
+class ServiceBusy(Exception):
+    """La cola de peticiones está llena"""
+    pass
+
+
+class RequestError(Exception):
+    """Petición inválida; lleva el código HTTP a devolver"""
+
+    def __init__(self, message: str, status: HTTPStatus = HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+class AudioService:
+    """
+    Pool de procesos precalentado con una cola de peticiones acotada.
+
+    Como mucho `workers` trabajos se ejecutan a la vez y `queue_size` más
+    esperan turno; por encima de eso las peticiones se rechazan de inmediato
+    (ServiceBusy) en lugar de acumularse.
+    """
+
+    def __init__(self, workers: int = 2, queue_size: int = SERVER_QUEUE_SIZE):
+        self.workers = max(1, workers)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        self._slots = threading.BoundedSemaphore(self.workers + max(0, queue_size))
+
+    def warm_up(self):
+        """
+        Arranca el pool antes de aceptar peticiones
+
+        La preparación de cada proceso (importaciones e instancias) la hace el
+        initializer del pool, así que cualquier proceso que ejecute una tarea ya
+        está caliente; aquí solo se espera a que el pool haya arrancado.
+        """
+        wait([self.executor.submit(_ready) for _ in range(self.workers)])
+
+    def run(self, fn, *args):
+        """
+        Ejecuta una tarea en el pool y espera su resultado
+
+        Raises:
+            ServiceBusy: Si no queda sitio en la cola
+        """
+        if not self._slots.acquire(blocking=False):
+            raise ServiceBusy("Cola de peticiones llena")
+        try:
+            return self.executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+class AudioRequestHandler(BaseHTTPRequestHandler):
+    """Manejador de peticiones del servicio"""
+
+    server_version = "AudioSplitterService/2.0"
+
+    @property
+    def service(self) -> AudioService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        console.print(f"{self.address_string()} - {format % args}", style='dim', markup=False)
+
+    def do_GET(self):
+        if not self._check_origin():
+            return
+        url = urlparse(self.path)
+        routes = {
+            '/health': self._handle_health,
+            '/file': self._handle_file
+        }
+        self._dispatch(routes.get(url.path), parse_qs(url.query))
+
+    def do_POST(self):
+        routes = {
+            '/info': self._handle_info,
+            '/metadata': self._handle_metadata,
+            '/convert': self._handle_convert,
+            '/split': self._handle_split
+        }
+        if not self._check_origin():
+            return
+        handler = routes.get(urlparse(self.path).path)
+        body = None
+        if handler is not None:
+            try:
+                self._check_json_content_type()
+                body = self._read_json()
+            except RequestError as e:
+                self._send_json({'error': str(e)}, e.status)
+                return
+        self._dispatch(handler, body)
+
+    def _dispatch(self, handler, payload):
+        """Ejecuta el manejador y traduce los errores a códigos HTTP"""
+        if handler is None:
+            self._send_json({'error': 'Ruta no encontrada'}, HTTPStatus.NOT_FOUND)
+            return
+        try:
+            handler(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # El cliente cerró la conexión a mitad de respuesta
+            pass
+        except ServiceBusy as e:
+            self._send_json({'error': str(e)}, HTTPStatus.SERVICE_UNAVAILABLE, {'Retry-After': '1'})
+        except RequestError as e:
+            self._send_json({'error': str(e)}, e.status)
+        except AudioFormatError as e:
+            self._send_json({'error': str(e)}, HTTPStatus.UNPROCESSABLE_ENTITY)
+        except (KeyError, ValueError, TypeError) as e:
+            self._send_json({'error': f"Petición inválida: {e}"}, HTTPStatus.BAD_REQUEST)
+        except Exception as e:
+            self._send_json({'error': str(e)}, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    # Manejadores
+
+    def _handle_health(self, query):
+        self._send_json({'status': 'ok', 'workers': self.service.workers})
+
+    def _handle_info(self, body):
+        path = self._input_file(body['path'])
+        self._send_json(self.service.run(_task_info, str(path)))
+
+    def _handle_metadata(self, body):
+        path = self._input_file(body['path'])
+        update = body.get('update')
+        if update is None:
+            self._send_json(self.service.run(_task_read_metadata, str(path)))
+            return
+        if not isinstance(update, dict):
+            raise RequestError("'update' debe ser un objeto")
+        unknown = set(update) - set(METADATA_TEXT_FIELDS)
+        if unknown:
+            raise RequestError(f"Campos desconocidos: {', '.join(sorted(unknown))}")
+        if not self.service.run(_task_write_metadata, str(path), update):
+            raise RequestError("No se pudieron escribir los metadatos", HTTPStatus.INTERNAL_SERVER_ERROR)
+        self._send_json({'updated': sorted(update)})
+
+    def _handle_convert(self, body):
+        input_path = self._input_file(body['input'])
+        formats = body.get('formats') or [body['format']]
+        specs = parse_format_specs(formats, body.get('quality', 'high'))
+        preserve_metadata = bool(body.get('preserve_metadata', True))
+
+        if body.get('output'):
+            targets = AudioConverter.plan_targets(body['output'], specs)
+            self._check_paths(path for path, _, _ in targets)
+            results = self.service.run(_task_convert, str(input_path), targets, preserve_metadata)
+            outputs = [{'path': str(path), 'format': target_format, 'quality': quality, 'success': ok}
+                       for (path, target_format, quality), ok in zip(targets, results)]
+            status = HTTPStatus.OK if all(results) else HTTPStatus.INTERNAL_SERVER_ERROR
+            self._send_json({'outputs': outputs}, status)
+            return
+
+        # Sin salida en disco: convertir a un temporal y devolver los bytes
+        if len(specs) != 1:
+            raise RequestError("Sin 'output' solo se admite un formato")
+        target_format, quality = specs[0]
+        with tempfile.TemporaryDirectory(prefix='audio_splitter_') as temp_dir:
+            output = Path(temp_dir) / f"{input_path.stem}.{target_format}"
+            results = self.service.run(_task_convert, str(input_path),
+                                       [(output, target_format, quality)], preserve_metadata)
+            if not results[0]:
+                raise RequestError("Error en la conversión", HTTPStatus.INTERNAL_SERVER_ERROR)
+            self._send_file(output, AUDIO_MIME_TYPES[target_format])
+
+    def _handle_split(self, body):
+        input_path = self._input_file(body['input'])
+        segments = [parse_segment(spec) for spec in body['segments']]
+        output_dir = self._allowed_path(body['output_dir'])
+        # Solo se informan (y se permiten) los archivos que escribe esta división
+        outputs = AudioSplitter._segment_output_files(output_dir, segments)
+        self._check_paths(outputs)
+        if not self.service.run(_task_split, str(input_path), segments, str(output_dir)):
+            raise RequestError("Error en la división", HTTPStatus.INTERNAL_SERVER_ERROR)
+        self._send_json({'output_dir': str(output_dir), 'outputs': [str(path) for path in outputs]})
+
+    def _handle_file(self, query):
+        path = self._input_file(query.get('path', [''])[0])
+        mime_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        self._send_file(path, mime_type)
+
+    # Controles de acceso
+
+    def _check_origin(self) -> bool:
+        """
+        Comprueba que Host y Origin nombran al propio servicio
+
+        Un Host ajeno delata un ataque de DNS rebinding y un Origin ajeno una
+        petición lanzada por otra web desde el navegador del usuario.
+
+        Returns:
+            bool: True si la petición puede seguir (si no, ya se respondió 403)
+        """
+        host = self.headers.get('Host')
+        origin = self.headers.get('Origin')
+        if host not in self.server.allowed_hosts:
+            self._send_json({'error': f"Host no permitido: {host}"}, HTTPStatus.FORBIDDEN)
+            return False
+        if origin is not None and origin not in self.server.allowed_origins:
+            self._send_json({'error': f"Origen no permitido: {origin}"}, HTTPStatus.FORBIDDEN)
+            return False
+        return True
+
+    def _check_json_content_type(self):
+        """Exige application/json (un formulario o text/plain no pasan por CORS)"""
+        message = Message()
+        message['Content-Type'] = self.headers.get('Content-Type', '')
+        if message.get_content_type() != 'application/json':
+            raise RequestError("El cuerpo debe enviarse como application/json",
+                               HTTPStatus.UNSUPPORTED_MEDIA_TYPE)
+
+    def _allowed_path(self, path: Union[str, Path]) -> Path:
+        """
+        Ruta resuelta (sin .., enlaces ni relativas) dentro de algún directorio raíz
+
+        Raises:
+            RequestError: 403 si queda fuera de todos
+        """
+        if not path:
+            raise RequestError("Falta la ruta del archivo")
+        resolved = Path(path).resolve()
+        if not any(_is_within(resolved, root) for root in self.server.roots):
+            raise RequestError(f"Ruta fuera de los directorios permitidos: {path}",
+                               HTTPStatus.FORBIDDEN)
+        return resolved
+
+    def _check_paths(self, paths: Iterable[Union[str, Path]]):
+        """Comprueba una serie de rutas de salida con _allowed_path"""
+        for path in paths:
+            self._allowed_path(path)
+
+    def _input_file(self, path: str) -> Path:
+        """Ruta de un archivo existente dentro de los directorios raíz (403 o 404 si no)"""
+        file_path = self._allowed_path(path)
+        if not file_path.is_file():
+            raise RequestError(f"Archivo no encontrado: {path}", HTTPStatus.NOT_FOUND)
+        return file_path
+
+    # Utilidades de E/S
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            raise RequestError("Cuerpo JSON inválido")
+        if not isinstance(body, dict):
+            raise RequestError("El cuerpo debe ser un objeto JSON")
+        return body
+
+    def _send_json(self, data, status: HTTPStatus = HTTPStatus.OK, headers: Optional[Dict] = None):
+        payload = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_file(self, path: Path, mime_type: str):
+        """Envía un archivo por bloques, sin cargarlo entero en memoria"""
+        with open(path, 'rb') as f:
+            self.send_response(HTTPStatus.OK)
+            self.send_header('Content-Type', mime_type)
+            self.send_header('Content-Length', str(path.stat().st_size))
+            self.send_header('Content-Disposition', f'attachment; filename="{path.name}"')
+            self.end_headers()
+            shutil.copyfileobj(f, self.wfile, STREAM_CHUNK_SIZE)
+
+
+class AudioHTTPServer(ThreadingHTTPServer):
+    """
+    Servidor HTTP con hilos que comparte un AudioService
+
+    Guarda los directorios raíz permitidos y los valores de Host y Origin
+    aceptados, derivados de la dirección en la que escucha.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: AudioService,
+                 roots: Iterable[Union[str, Path]] = SERVER_ROOTS):
+        super().__init__(address, AudioRequestHandler)
+        self.service = service
+        self.roots = [Path(root).resolve() for root in roots]
+        host = address[0]
+        names = {f"[{host}]" if ':' in host else host, 'localhost'}
+        self.allowed_hosts = {f"{name}:{self.server_port}" for name in names}
+        self.allowed_origins = {f"http://{name}" for name in self.allowed_hosts}
+
+
+def serve(host: str = SERVER_HOST, port: int = SERVER_PORT,
+          workers: int = 2, queue_size: int = SERVER_QUEUE_SIZE,
+          roots: Optional[Iterable[Union[str, Path]]] = None):
+    """
+    Arranca el servicio y atiende peticiones hasta Ctrl+C
+
+    Args:
+        host: Dirección local de escucha
+        port: Puerto
+        workers: Procesos del pool
+        queue_size: Peticiones que pueden esperar turno además de las que se ejecutan
+        roots: Directorios de los que se puede leer y en los que se puede escribir
+               (por defecto SERVER_ROOTS)
+
+    Raises:
+        ValueError: Si host no es una dirección local
+    """
+    if host not in LOOPBACK_HOSTS:
+        raise ValueError(f"El servicio solo escucha en localhost, no en {host}")
+
+    if host == '::1':
+        AudioHTTPServer.address_family = socket.AF_INET6
+
+    roots = list(roots or SERVER_ROOTS)
+    service = AudioService(workers, queue_size)
+    console.print("[blue]Precalentando procesos...[/blue]")
+    service.warm_up()
+
+    with AudioHTTPServer((host, port), service, roots) as server:
+        console.print(f"[green]✓ Servicio escuchando en http://{host}:{server.server_port}[/green] "
+                      f"({service.workers} procesos, cola de {queue_size})")
+        console.print(f"Directorios permitidos: {', '.join(str(root) for root in server.roots)}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            console.print("[yellow]Deteniendo servicio...[/yellow]")
+        finally:
+            service.shutdown()
+
+
+def _is_within(path: Path, root: Path) -> bool:
+    """Equivale a Path.is_relative_to (Python 3.9+) para rutas ya resueltas"""
+    try:
+        path.relative_to(root)
+        return True
+    except ValueError:
+        return False
+
+
+# Tareas del pool: instancias creadas una vez por proceso
+
+_worker_converter: Optional[AudioConverter] = None
+_worker_splitter: Optional[AudioSplitter] = None
+_worker_editor: Optional[MetadataEditor] = None
+
+def _init_worker():
+    """Prepara cada proceso del pool al arrancar: importaciones pesadas e instancias"""
+    global _worker_converter, _worker_splitter, _worker_editor
+    mark_worker_process()
+    # librosa (numba) se importa en diferido en el resto del paquete: aquí se paga al arrancar
+    import librosa  # noqa: F401
+    _worker_converter = AudioConverter()
+    _worker_splitter = AudioSplitter()
+    _worker_editor = MetadataEditor()
+
+def _ready() -> bool:
+    """Tarea vacía: su resultado indica que el pool está en marcha"""
+    return True
+
+def _task_info(path: str) -> Dict:
+    return _worker_converter.get_audio_info(path)
+
+def _task_read_metadata(path: str) -> Dict:
+    metadata = _worker_editor.read_metadata(path)
+    if metadata is None:
+        raise ValueError(f"No se pudieron leer los metadatos de {path}")
+    data = metadata.to_dict()
+    # La carátula no viaja en JSON (ni se carga): solo se indica si existe
+    data.pop('artwork_data', None)
+    data['has_artwork'] = metadata.has_artwork
+    return data
+
+def _task_write_metadata(path: str, update: Dict) -> bool:
+    # Solo se reescriben los campos indicados; el resto de etiquetas se conserva
+    try:
+        _worker_editor.update_metadata(path, update)
+        return True
+    except ValueError:
+        return False
+
+def _task_convert(input_path: str, targets: List, preserve_metadata: bool) -> List[bool]:
+    return _worker_converter.convert_file_multi(input_path, targets, preserve_metadata)
+
+def _task_split(input_path: str, segments: List[Tuple[int, int, str]], output_dir: str) -> bool:
+    return _worker_splitter.split_audio(input_path, segments, output_dir)
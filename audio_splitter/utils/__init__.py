@@ -3,6 +3,13 @@ Módulo utils - Utilidades y helpers del Audio Splitter
 """
 
 from .file_utils import *
-from .audio_utils import *
 
 __all__ = []
+
+def __getattr__(name):
+    # audio_utils depende de numpy, soundfile y mutagen: se carga solo si se usa
+    if not name.startswith('_'):
+        from . import audio_utils
+        if hasattr(audio_utils, name):
+            return getattr(audio_utils, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,10 +2,13 @@
 Utilidades para procesamiento de audio
 """
 
-import librosa
 import numpy as np
+import soundfile as sf
+from mutagen import File as MutagenFile
 from pathlib import Path
-from typing import Tuple, Union, Optional
+from typing import Any, Tuple, Union, Optional
+
+from .wav_utils import read_wav_layout
 
 def load_audio(file_path: Union[str, Path], 
                sample_rate: Optional[int] = None) -> Tuple[np.ndarray, int]:
@@ -19,11 +22,89 @@ def load_audio(file_path: Union[str, Path],
     Returns:
         Tuple[np.ndarray, int]: (audio_data, sample_rate)
     """
+    # librosa (y numba) tarda segundos en importarse: solo cuando se decodifica
+    import librosa
     return librosa.load(str(file_path), sr=sample_rate)
 
+# Tipo numpy que conserva sin pérdida cada subtipo de soundfile
+SUBTYPE_DTYPES = {
+    'PCM_S8': 'int16',
+    'PCM_U8': 'int16',
+    'ULAW': 'int16',
+    'ALAW': 'int16',
+    'PCM_16': 'int16',
+    'PCM_24': 'int32',
+    'PCM_32': 'int32',
+    'FLOAT': 'float32',
+    'DOUBLE': 'float64'
+}
+
+def native_dtype(subtype: Optional[str]) -> str:
+    """
+    Obtiene el dtype de lectura adecuado para un subtipo de soundfile
+    
+    Args:
+        subtype: Subtipo del archivo (ej: 'PCM_16', 'FLOAT')
+        
+    Returns:
+        str: dtype numpy con el que leer sin pérdida ni memoria extra
+    """
+    # Los formatos comprimidos (MP3, Vorbis...) se decodifican a float
+    return SUBTYPE_DTYPES.get(subtype or '', 'float32')
+
+def probe_audio(file_path: Union[str, Path], tagged_file: Any = None) -> dict:
+    """
+    Obtiene la información técnica de un archivo leyendo solo su cabecera
+    
+    Prueba en orden soundfile (cabecera libsndfile), la información de stream
+    de mutagen y el análisis directo de la cabecera RIFF, sin decodificar audio.
+    
+    Args:
+        file_path: Ruta del archivo de audio
+        tagged_file: Objeto mutagen ya abierto del mismo archivo (opcional, evita reabrirlo)
+        
+    Returns:
+        dict: duration, sample_rate, channels, samples y subtype (None si se desconoce)
+        
+    Raises:
+        ValueError: Si ninguna de las fuentes reconoce el archivo
+    """
+    try:
+        info = sf.info(str(file_path))
+        if info.samplerate > 0:
+            return _stream_info(info.frames, info.samplerate, info.channels, info.subtype)
+    except RuntimeError:
+        # soundfile.LibsndfileError hereda de RuntimeError
+        pass
+    
+    try:
+        tagged_file = tagged_file if tagged_file is not None else MutagenFile(str(file_path))
+    except Exception:
+        tagged_file = None
+    stream = getattr(tagged_file, 'info', None)
+    if stream is not None and getattr(stream, 'sample_rate', 0):
+        return _stream_info(int(round(stream.length * stream.sample_rate)),
+                            stream.sample_rate, getattr(stream, 'channels', 1), None)
+    
+    layout = read_wav_layout(file_path)
+    if layout is not None:
+        return _stream_info(layout.frames, layout.sample_rate, layout.channels, None)
+    
+    raise ValueError(f"No se pudo leer la cabecera de audio: {file_path}")
+
+def _stream_info(frames: int, sample_rate: int, channels: int, subtype: Optional[str]) -> dict:
+    """Construye el diccionario de información técnica"""
+    return {
+        'duration': frames / sample_rate,
+        'sample_rate': sample_rate,
+        'channels': channels,
+        'samples': frames,
+        'subtype': subtype
+    }
+
 def get_audio_info(file_path: Union[str, Path]) -> dict:
     """
-    Obtiene información básica de un archivo de audio
+    Obtiene información básica de un archivo de audio sin decodificarlo
     
     Args:
         file_path: Ruta del archivo de audio
@@ -31,13 +112,13 @@ def get_audio_info(file_path: Union[str, Path]) -> dict:
     Returns:
         dict: Información del audio
     """
-    y, sr = load_audio(file_path)
+    info = probe_audio(file_path)
     
     return {
-        'duration': len(y) / sr,
-        'sample_rate': sr,
-        'channels': 1 if len(y.shape) == 1 else y.shape[0],
-        'samples': len(y),
+        'duration': info['duration'],
+        'sample_rate': info['sample_rate'],
+        'channels': info['channels'],
+        'samples': info['samples'],
         'format': Path(file_path).suffix.lower()
     }
 
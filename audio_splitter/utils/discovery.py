@@ -0,0 +1,184 @@
+"""
+Descubrimiento de archivos de audio con un único recorrido de directorios
+"""
+
+import os
+import threading
+from pathlib import Path
+from queue import Empty, Queue
+from typing import Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+# Marca de fin de un subárbol en la cola del recorrido paralelo
+_SUBTREE_DONE = object()
+
+
+def normalize_extensions(extensions: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Normaliza extensiones a minúsculas y con punto inicial
+
+    Args:
+        extensions: Extensiones (ej: ['.mp3', 'WAV'])
+
+    Returns:
+        Tuple[str, ...]: Extensiones normalizadas (ej: ('.mp3', '.wav'))
+    """
+    return tuple(
+        ext.lower() if ext.startswith('.') else f'.{ext.lower()}'
+        for ext in extensions
+    )
+
+
+class _VisitedDirectories:
+    """Registro de directorios ya recorridos por (dispositivo, inodo), seguro entre hilos"""
+
+    def __init__(self):
+        self._seen: Set[Tuple[int, int]] = set()
+        self._lock = threading.Lock()
+
+    def claim(self, stat: os.stat_result) -> bool:
+        """Marca un directorio como visitado; False si ya lo estaba (enlace en bucle o duplicado)"""
+        key = (stat.st_dev, stat.st_ino)
+        with self._lock:
+            if key in self._seen:
+                return False
+            self._seen.add(key)
+            return True
+
+
+def iter_files(directory: Union[str, Path],
+               extensions: Iterable[str],
+               recursive: bool = False,
+               follow_symlinks: bool = True,
+               workers: int = 1) -> Iterator[Path]:
+    """
+    Recorre un directorio una sola vez y genera los archivos con las extensiones dadas
+
+    La comparación de extensiones no distingue mayúsculas. Los archivos se
+    generan a medida que se encuentran, por lo que el consumidor puede empezar a
+    procesarlos antes de que termine el recorrido. Los directorios se identifican
+    por (dispositivo, inodo), de modo que un enlace simbólico en bucle no se
+    recorre dos veces.
+
+    Args:
+        directory: Directorio a recorrer
+        extensions: Extensiones buscadas (ej: ['.mp3', '.wav'])
+        recursive: Si buscar en subdirectorios
+        follow_symlinks: Si seguir enlaces simbólicos a directorios
+        workers: Hilos para recorrer en paralelo los subdirectorios de primer nivel
+                 (1 = recorrido secuencial y en orden alfabético por directorio)
+
+    Yields:
+        Path: Archivos encontrados
+    """
+    directory = Path(directory)
+    extensions = normalize_extensions(extensions)
+    visited = _VisitedDirectories()
+
+    try:
+        visited.claim(directory.stat())
+    except OSError:
+        return
+
+    if not recursive or workers <= 1:
+        yield from _walk(directory, extensions, recursive, follow_symlinks, visited)
+        return
+
+    files, subdirectories = _scan(directory, extensions, follow_symlinks, visited)
+    yield from files
+    yield from _walk_parallel(subdirectories, extensions, follow_symlinks, visited, workers)
+
+
+def _scan(directory: Path, extensions: Tuple[str, ...], follow_symlinks: bool,
+          visited: _VisitedDirectories) -> Tuple[List[Path], List[Path]]:
+    """
+    Lee un directorio con una sola llamada a os.scandir
+
+    Returns:
+        Tuple[List[Path], List[Path]]: (archivos coincidentes, subdirectorios no visitados)
+    """
+    files = []
+    subdirectories = []
+
+    try:
+        with os.scandir(directory) as entries:
+            entries = sorted(entries, key=lambda entry: entry.name)
+    except OSError:
+        # Sin permisos o eliminado durante el recorrido
+        return files, subdirectories
+
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=follow_symlinks):
+                if visited.claim(entry.stat(follow_symlinks=follow_symlinks)):
+                    subdirectories.append(Path(entry.path))
+            elif entry.is_file() and entry.name.lower().endswith(extensions):
+                files.append(Path(entry.path))
+        except OSError:
+            continue
+
+    return files, subdirectories
+
+
+def _walk(directory: Path, extensions: Tuple[str, ...], recursive: bool,
+          follow_symlinks: bool, visited: _VisitedDirectories,
+          stop: Optional[threading.Event] = None) -> Iterator[Path]:
+    """Recorrido en profundidad con pila explícita (sin límite de recursión)"""
+    pending = [directory]
+    while pending:
+        if stop is not None and stop.is_set():
+            return
+
+        files, subdirectories = _scan(pending.pop(), extensions, follow_symlinks, visited)
+        yield from files
+
+        if recursive:
+            # Invertidos para visitar los subdirectorios en orden alfabético
+            pending.extend(reversed(subdirectories))
+
+
+def _walk_parallel(subdirectories: List[Path], extensions: Tuple[str, ...],
+                   follow_symlinks: bool, visited: _VisitedDirectories,
+                   workers: int) -> Iterator[Path]:
+    """Recorre cada subárbol de primer nivel en un hilo y genera los archivos según llegan"""
+    if not subdirectories:
+        return
+
+    results: Queue = Queue(maxsize=1024)
+    stop = threading.Event()
+    pending = Queue()
+    for subdirectory in subdirectories:
+        pending.put(subdirectory)
+
+    def walk_subtrees():
+        while not stop.is_set():
+            try:
+                subdirectory = pending.get_nowait()
+            except Empty:
+                return
+            try:
+                for path in _walk(subdirectory, extensions, True, follow_symlinks, visited, stop):
+                    results.put(path)
+            finally:
+                results.put(_SUBTREE_DONE)
+
+    threads = [threading.Thread(target=walk_subtrees, daemon=True)
+               for _ in range(min(workers, len(subdirectories)))]
+    for thread in threads:
+        thread.start()
+
+    remaining = len(subdirectories)
+    try:
+        while remaining:
+            item = results.get()
+            if item is _SUBTREE_DONE:
+                remaining -= 1
+            else:
+                yield item
+    finally:
+        # Si el consumidor deja de iterar, detener los hilos sin dejarlos bloqueados
+        stop.set()
+        while any(thread.is_alive() for thread in threads):
+            while not results.empty():
+                results.get_nowait()
+            for thread in threads:
+                thread.join(timeout=0.01)
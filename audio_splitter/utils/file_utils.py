@@ -2,11 +2,14 @@
 Utilidades para manejo de archivos
 """
 
+import hashlib
 import os
 import shutil
 from pathlib import Path
 from typing import List, Optional, Union
 
+from .discovery import iter_files
+
 def ensure_directory(path: Union[str, Path]) -> Path:
     """
     Asegura que un directorio exista, lo crea si no existe
@@ -27,6 +30,9 @@ def get_files_by_extension(directory: Union[str, Path],
     """
     Obtiene archivos por extensión en un directorio
     
+    Usa un único recorrido del árbol y no distingue mayúsculas en la extensión
+    (ver discovery.iter_files para la versión perezosa).
+    
     Args:
         directory: Directorio a buscar
         extensions: Lista de extensiones (ej: ['.mp3', '.wav'])
@@ -35,14 +41,7 @@ def get_files_by_extension(directory: Union[str, Path],
     Returns:
         List[Path]: Lista de archivos encontrados
     """
-    directory = Path(directory)
-    pattern = "**/*" if recursive else "*"
-    
-    files = []
-    for ext in extensions:
-        files.extend(directory.glob(f"{pattern}{ext}"))
-    
-    return files
+    return list(iter_files(directory, extensions, recursive))
 
 def safe_filename(filename: str) -> str:
     """
@@ -108,6 +107,23 @@ def get_file_size_mb(file_path: Union[str, Path]) -> float:
     """
     return Path(file_path).stat().st_size / (1024 * 1024)
 
+def file_sha256(file_path: Union[str, Path], chunk_size: int = 1024 * 1024) -> str:
+    """
+    Calcula el hash SHA-256 del contenido de un archivo leyendo por bloques
+    
+    Args:
+        file_path: Ruta del archivo
+        chunk_size: Bytes leídos por bloque
+        
+    Returns:
+        str: Hash en hexadecimal
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 def copy_file_with_metadata(source: Union[str, Path], 
                            destination: Union[str, Path]) -> bool:
     """
@@ -65,8 +65,13 @@ def setup_logging(
     return logger
 
 def get_logger(name: str = 'audio_splitter') -> logging.Logger:
-    """Obtiene un logger configurado"""
+    """Obtiene un logger configurado (configura el logging en el primer uso)"""
+    from ..config.runtime import ensure_logging
+    ensure_logging()
     return logging.getLogger(name)
 
-# Logger por defecto
-default_logger = setup_logging()
+def __getattr__(name):
+    # Logger por defecto, configurado bajo demanda en lugar de al importar
+    if name == 'default_logger':
+        return get_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,224 @@
+"""
+Utilidades para acceso directo a archivos WAV PCM (lectura de cabecera y copia de rangos de bytes)
+"""
+
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+# Códigos de formato WAVE con muestras lineales copiables byte a byte
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+COPY_CHUNK_SIZE = 16 * 1024 * 1024  # Tamaño máximo por llamada de copia
+
+
+@dataclass
+class WavLayout:
+    """Disposición de un archivo WAV: formato y posición del chunk de datos"""
+    fmt_chunk: bytes
+    audio_format: int
+    channels: int
+    sample_rate: int
+    bits_per_sample: int
+    block_align: int
+    data_offset: int
+    data_size: int
+
+    @property
+    def frames(self) -> int:
+        """Número total de frames del chunk de datos"""
+        return self.data_size // self.block_align
+
+
+def read_wav_layout(file_path: Union[str, Path]) -> Optional[WavLayout]:
+    """
+    Lee la cabecera RIFF de un archivo WAV sin decodificar el audio
+
+    Args:
+        file_path: Ruta del archivo WAV
+
+    Returns:
+        Optional[WavLayout]: Disposición del archivo, o None si no es un WAV PCM/float lineal
+    """
+    file_size = Path(file_path).stat().st_size
+
+    with open(file_path, 'rb') as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+            return None
+
+        fmt_chunk = None
+        position = 12
+        while position + 8 <= file_size:
+            f.seek(position)
+            chunk_id, chunk_size = struct.unpack('<4sI', f.read(8))
+            body_offset = position + 8
+
+            if chunk_id == b'fmt ':
+                fmt_chunk = f.read(chunk_size)
+            elif chunk_id == b'data':
+                if fmt_chunk is None or len(fmt_chunk) < 16:
+                    return None
+                # Archivos truncados o escritos en streaming pueden declarar un tamaño mayor al real
+                data_size = min(chunk_size, file_size - body_offset)
+                return _build_layout(fmt_chunk, body_offset, data_size)
+
+            # Los chunks se alinean a tamaño par
+            position = body_offset + chunk_size + (chunk_size & 1)
+
+    return None
+
+
+def _build_layout(fmt_chunk: bytes, data_offset: int, data_size: int) -> Optional[WavLayout]:
+    """Construye el WavLayout si el formato admite copia directa de bytes"""
+    audio_format, channels, sample_rate, _, block_align, bits_per_sample = struct.unpack(
+        '<HHIIHH', fmt_chunk[:16]
+    )
+
+    if audio_format == WAVE_FORMAT_EXTENSIBLE:
+        # Los dos primeros bytes del GUID de subformato contienen el código real
+        if len(fmt_chunk) < 26:
+            return None
+        audio_format = struct.unpack('<H', fmt_chunk[24:26])[0]
+
+    if audio_format not in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT) or block_align == 0:
+        return None
+
+    return WavLayout(
+        fmt_chunk=fmt_chunk,
+        audio_format=audio_format,
+        channels=channels,
+        sample_rate=sample_rate,
+        bits_per_sample=bits_per_sample,
+        block_align=block_align,
+        data_offset=data_offset,
+        data_size=data_size - data_size % block_align
+    )
+
+
+def build_wav_header(fmt_chunk: bytes, data_size: int) -> bytes:
+    """
+    Genera la cabecera RIFF de un WAV con el chunk fmt dado
+
+    Args:
+        fmt_chunk: Contenido del chunk fmt original
+        data_size: Tamaño en bytes del chunk de datos que seguirá a la cabecera
+
+    Returns:
+        bytes: Cabecera completa hasta el inicio de los datos
+    """
+    fmt_padding = b'\x00' * (len(fmt_chunk) & 1)
+    riff_size = (4 + 8 + len(fmt_chunk) + len(fmt_padding)
+                 + 8 + data_size + (data_size & 1))
+
+    return b''.join([
+        struct.pack('<4sI4s', b'RIFF', riff_size, b'WAVE'),
+        struct.pack('<4sI', b'fmt ', len(fmt_chunk)), fmt_chunk, fmt_padding,
+        struct.pack('<4sI', b'data', data_size)
+    ])
+
+
+def copy_byte_range(src_fd: int, dst_fd: int, offset: int, count: int):
+    """
+    Copia un rango de bytes entre descriptores sin pasar por Python cuando es posible
+
+    Usa copy_file_range o sendfile (copia dentro del kernel) y, si el sistema
+    no los soporta, escribe desde un mapeo en memoria del archivo origen.
+    La escritura se realiza en la posición actual de dst_fd.
+
+    Args:
+        src_fd: Descriptor del archivo origen
+        dst_fd: Descriptor del archivo destino
+        offset: Posición inicial en el origen
+        count: Número de bytes a copiar
+    """
+    for kernel_copy in (_copy_file_range, _sendfile):
+        copied = kernel_copy(src_fd, dst_fd, offset, count)
+        offset += copied
+        count -= copied
+        if count <= 0:
+            return
+
+    _copy_from_mmap(src_fd, dst_fd, offset, count)
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    """Copia con os.copy_file_range; devuelve los bytes copiados"""
+    if not hasattr(os, 'copy_file_range'):
+        return 0
+
+    copied = 0
+    try:
+        while copied < count:
+            n = os.copy_file_range(src_fd, dst_fd, min(count - copied, COPY_CHUNK_SIZE),
+                                   offset + copied)
+            if n == 0:
+                break
+            copied += n
+    except OSError:
+        # EXDEV, ENOSYS, EINVAL... el siguiente método continúa desde lo ya copiado
+        pass
+    return copied
+
+
+def _sendfile(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    """Copia con os.sendfile; devuelve los bytes copiados"""
+    if not hasattr(os, 'sendfile'):
+        return 0
+
+    copied = 0
+    try:
+        while copied < count:
+            n = os.sendfile(dst_fd, src_fd, offset + copied, min(count - copied, COPY_CHUNK_SIZE))
+            if n == 0:
+                break
+            copied += n
+    except OSError:
+        pass
+    return copied
+
+
+def _copy_from_mmap(src_fd: int, dst_fd: int, offset: int, count: int):
+    """Copia escribiendo vistas de un mapeo en memoria del origen"""
+    with mmap.mmap(src_fd, 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            end = offset + count
+            while offset < end:
+                written = os.write(dst_fd, view[offset:min(end, offset + COPY_CHUNK_SIZE)])
+                offset += written
+        finally:
+            view.release()
+
+
+def extract_wav_frames(source_path: Union[str, Path],
+                       layout: WavLayout,
+                       output_path: Union[str, Path],
+                       start_frame: int,
+                       end_frame: int):
+    """
+    Escribe un rango de frames de un WAV como un nuevo WAV, copiando los bytes tal cual
+
+    Args:
+        source_path: Ruta del WAV origen
+        layout: Disposición del WAV origen (ver read_wav_layout)
+        output_path: Ruta del WAV de salida
+        start_frame: Frame inicial (incluido)
+        end_frame: Frame final (excluido)
+    """
+    start_frame = max(0, min(start_frame, layout.frames))
+    end_frame = max(start_frame, min(end_frame, layout.frames))
+
+    offset = layout.data_offset + start_frame * layout.block_align
+    data_size = (end_frame - start_frame) * layout.block_align
+
+    with open(source_path, 'rb') as src, open(output_path, 'wb', buffering=0) as dst:
+        dst.write(build_wav_header(layout.fmt_chunk, data_size))
+        copy_byte_range(src.fileno(), dst.fileno(), offset, data_size)
+        if data_size & 1:
+            dst.write(b'\x00')
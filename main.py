@@ -11,21 +11,19 @@ from pathlib import Path
 # Asegurar que el paquete esté en el path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from audio_splitter.ui.interactive import interactive_menu
-from audio_splitter.ui.cli import main_cli
-from rich.console import Console
-
-console = Console()
-
 def main():
     """Función principal que decide entre modo CLI o interactivo"""
     
     # Si hay argumentos de línea de comandos, usar CLI
     if len(sys.argv) > 1:
-        # Modo línea de comandos
+        # Modo línea de comandos (cada subcomando carga solo lo que necesita)
+        from audio_splitter.ui.cli import main_cli
         return main_cli()
     else:
         # Modo interactivo
+        from audio_splitter.ui.interactive import interactive_menu
+        from rich.console import Console
+        console = Console()
         try:
             interactive_menu()
             return True
@@ -0,0 +1,97 @@
+"""
+Tests para el almacén de carátulas con caché de variantes
+"""
+
+import io
+import os
+import unittest
+from pathlib import Path
+import sys
+
+# Agregar path del proyecto para imports absolutos
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from audio_splitter.core.artwork_store import ArtworkStore, PILLOW_AVAILABLE, shared_artwork_store
+
+if PILLOW_AVAILABLE:
+    from PIL import Image
+
+def noise_png(size=(1600, 1000)):
+    """PNG de ruido: grande en bytes y poco comprimible"""
+    image = Image.frombytes('RGB', size, os.urandom(size[0] * size[1] * 3))
+    output = io.BytesIO()
+    image.save(output, format='PNG')
+    return output.getvalue()
+
+class TestArtworkStoreWithoutResize(unittest.TestCase):
+
+    def test_small_artwork_is_untouched(self):
+        """Test una carátula dentro del límite se devuelve tal cual"""
+        data = b'\xff\xd8small'
+        self.assertIs(ArtworkStore(workers=0).fit(data, 'image/jpeg', max_bytes=1024)[0], data)
+
+    def test_shared_store_is_per_process(self):
+        """Test todos los editores del proceso comparten un almacén reutilizable tras close()"""
+        store = shared_artwork_store()
+        self.assertIs(shared_artwork_store(), store)
+        store.close()
+        self.assertIs(shared_artwork_store(), store)
+
+    @unittest.skipIf(PILLOW_AVAILABLE, "Solo sin Pillow")
+    def test_oversized_without_pillow(self):
+        """Test sin Pillow una carátula demasiado grande es un error"""
+        with self.assertRaises(ValueError):
+            ArtworkStore(workers=0).fit(b'\x00' * 2048, 'image/png', max_bytes=1024)
+
+@unittest.skipUnless(PILLOW_AVAILABLE, "Pillow no disponible")
+class TestArtworkStore(unittest.TestCase):
+
+    def setUp(self):
+        self.cover = noise_png()
+
+    def test_fit_downscales_under_limit(self):
+        """Test MAX_ARTWORK_SIZE se cumple reduciendo a JPEG"""
+        store = ArtworkStore(workers=0)
+        data, mime = store.fit(self.cover, 'image/png', max_bytes=len(self.cover) // 4)
+
+        self.assertEqual(mime, 'image/jpeg')
+        self.assertLessEqual(len(data), len(self.cover) // 4)
+        with Image.open(io.BytesIO(data)) as image:
+            self.assertLessEqual(max(image.size), 1200)
+
+    def test_identical_images_resized_once(self):
+        """Test la misma imagen de varias pistas se reduce una vez y comparte bytes"""
+        store = ArtworkStore(workers=0)
+        first = store.variant(self.cover, 500)
+        second = store.variant(bytes(self.cover), 500)
+
+        self.assertIs(first, second)
+        self.assertEqual((store.misses, store.hits), (1, 1))
+
+    def test_lru_eviction(self):
+        """Test la variante menos usada se expulsa al superar el presupuesto"""
+        probe = ArtworkStore(workers=0)
+        size_300 = len(probe.variant(self.cover, 300))
+        size_400 = len(probe.variant(self.cover, 400))
+
+        store = ArtworkStore(max_bytes=size_300 + size_400, workers=0)
+        store.variant(self.cover, 300)
+        store.variant(self.cover, 400)
+        store.variant(self.cover, 300)  # 400 pasa a ser la menos usada
+        store.variant(self.cover, 200)
+
+        self.assertGreaterEqual(store.evictions, 1)
+        store.variant(self.cover, 300)
+        self.assertEqual(store.misses, 3)
+
+    def test_process_pool_variants(self):
+        """Test varias variantes en el pool de procesos"""
+        with ArtworkStore(workers=2) as store:
+            variants = store.variants(self.cover, [300, 600])
+        for dimension, data in variants.items():
+            with Image.open(io.BytesIO(data)) as image:
+                self.assertEqual(max(image.size), dimension)
+
+if __name__ == '__main__':
+    unittest.main()
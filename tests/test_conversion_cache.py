@@ -0,0 +1,97 @@
+"""
+Tests para la caché de conversiones
+"""
+
+import os
+import unittest
+import tempfile
+from pathlib import Path
+import sys
+
+# Agregar path del proyecto para imports absolutos
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from audio_splitter.core.conversion_cache import ConversionCache
+
+class TestConversionCache(unittest.TestCase):
+    
+    def setUp(self):
+        """Crea una caché vacía en un directorio temporal"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.cache = ConversionCache(self.root / "cache", max_bytes=1000)
+        self.source = self.root / "song.wav"
+        self.source.write_bytes(b"RIFF" + b"\x00" * 100)
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def _converted_output(self, name: str, size: int) -> Path:
+        output = self.root / name
+        output.write_bytes(b"x" * size)
+        return output
+    
+    def test_key_depends_on_content_and_settings(self):
+        """Test que la clave cambia con el contenido, el formato y la calidad"""
+        key = self.cache.key(self.source, 'mp3', 'high')
+        self.assertEqual(key, self.cache.key(self.source, 'mp3', 'high'))
+        self.assertNotEqual(key, self.cache.key(self.source, 'mp3', 'low'))
+        self.assertNotEqual(key, self.cache.key(self.source, 'flac', 'high'))
+        
+        self.source.write_bytes(b"RIFF" + b"\x01" * 100)
+        self.assertNotEqual(key, self.cache.key(self.source, 'mp3', 'high'))
+    
+    def test_miss_then_hit(self):
+        """Test fallo, almacenamiento y acierto posterior"""
+        key = self.cache.key(self.source, 'mp3', 'high')
+        target = self.root / "copy.mp3"
+        
+        self.assertFalse(self.cache.fetch(key, 'mp3', target))
+        self.assertFalse(target.exists())
+        
+        self.cache.store(key, 'mp3', self._converted_output("out.mp3", 200))
+        self.assertTrue(self.cache.fetch(key, 'mp3', target))
+        self.assertEqual(target.read_bytes(), b"x" * 200)
+        
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+    
+    def test_lru_eviction(self):
+        """Test que se expulsa la entrada usada menos recientemente"""
+        for i, name in enumerate(["a", "b", "c"]):
+            self.cache.store(name * 64, 'mp3', self._converted_output(f"{name}.mp3", 400))
+            entry = self.cache._entry_path(name * 64, 'mp3')
+            os.utime(entry, (1000 + i, 1000 + i))
+        
+        # "a" (la más antigua) ya fue expulsada al superar los 1000 bytes
+        self.assertFalse(self.cache._entry_path("a" * 64, 'mp3').exists())
+        self.assertTrue(self.cache._entry_path("c" * 64, 'mp3').exists())
+        self.assertLessEqual(self.cache.stats()['bytes'], 1000)
+
+    def test_directory_scanned_once(self):
+        """Test el directorio se recorre una vez y la expulsión es incremental"""
+        scans = []
+        entries = self.cache._entries
+        self.cache._entries = lambda: scans.append(1) or entries()
+        
+        for i in range(20):
+            self.cache.store(f"{i:02d}" * 32, 'mp3', self._converted_output(f"{i}.mp3", 300))
+        
+        self.assertEqual(len(scans), 1)
+        self.assertEqual(self.cache.evictions, 17)
+        self.assertEqual(self.cache._size, 900)
+        self.assertEqual(ConversionCache(self.root / "cache").stats()['bytes'], 900)
+    
+    def test_fetch_refreshes_lru_order(self):
+        """Test un acierto protege la entrada de la siguiente expulsión"""
+        for name in ["a", "b"]:
+            self.cache.store(name * 64, 'mp3', self._converted_output(f"{name}.mp3", 400))
+        self.assertTrue(self.cache.fetch("a" * 64, 'mp3', self.root / "copy.mp3"))
+        self.cache.store("c" * 64, 'mp3', self._converted_output("c.mp3", 400))
+        
+        self.assertTrue(self.cache._entry_path("a" * 64, 'mp3').exists())
+        self.assertFalse(self.cache._entry_path("b" * 64, 'mp3').exists())
+
+if __name__ == '__main__':
+    unittest.main()
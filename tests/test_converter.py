@@ -3,14 +3,24 @@ Tests para el módulo AudioConverter
 """
 
 import unittest
+import tempfile
 from pathlib import Path
+from unittest import mock
 import sys
 
+import numpy as np
+import soundfile as sf
+from mutagen.flac import FLAC
+
 # Agregar path del proyecto para imports absolutos
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from audio_splitter.core.converter import AudioConverter
+from audio_splitter.core.conversion_cache import ConversionCache
+from audio_splitter.core.manifest import ConversionManifest
+from audio_splitter.core.pipeline import ConversionPipeline
+from audio_splitter.utils import file_utils
 
 class TestAudioConverter(unittest.TestCase):
     
@@ -50,5 +60,89 @@ class TestAudioConverter(unittest.TestCase):
         with self.assertRaises(FileNotFoundError):
             self.converter.detect_format("archivo_inexistente.mp3")
 
+class TestConvertFileMulti(unittest.TestCase):
+    
+    def setUp(self):
+        """Origen WAV estéreo de 16 bits"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.source = self.root / "master.wav"
+        rng = np.random.default_rng(0)
+        sf.write(str(self.source), rng.integers(-20000, 20000, size=(22050, 2), dtype=np.int16),
+                 44100, subtype='PCM_16')
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_source_hashed_once_for_all_targets(self):
+        """Test con caché el origen se hashea una vez aunque haya varias salidas"""
+        converter = AudioConverter(cache=ConversionCache(self.root / "cache"))
+        targets = AudioConverter.plan_targets(self.root / "out" / "master",
+                                              [('wav', 'high'), ('flac', 'low'), ('flac', 'high')])
+        
+        with mock.patch('audio_splitter.core.converter.file_sha256', wraps=file_utils.file_sha256) as hashed, \
+                mock.patch('audio_splitter.core.conversion_cache.file_sha256') as rehashed:
+            results = converter.convert_file_multi(self.source, targets)
+        
+        self.assertEqual(results, [True, True, True])
+        self.assertEqual(hashed.call_count, 1)
+        rehashed.assert_not_called()
+        self.assertEqual(converter.cache.stores, 3)
+
+    def test_formats_and_presets_from_one_source(self):
+        """Test WAV y dos presets FLAC salen de una lectura, sin pérdidas y con etiquetas"""
+        source = self.root / "master.flac"
+        sf.write(str(source), sf.read(str(self.source), dtype='int16')[0], 44100, subtype='PCM_16')
+        tagged = FLAC(str(source))
+        tagged['TITLE'] = 'Toma 1'
+        tagged.save()
+        targets = AudioConverter.plan_targets(self.root / "out" / "master",
+                                              [('wav', 'high'), ('flac', 'low'), ('flac', 'high')])
+        
+        with mock.patch('audio_splitter.core.converter.ConversionPipeline.blocks', autospec=True,
+                        side_effect=ConversionPipeline.blocks) as blocks:
+            results = AudioConverter().convert_file_multi(source, targets)
+        
+        self.assertEqual(results, [True, True, True])
+        self.assertEqual(blocks.call_count, 1)
+        self.assertEqual([path.name for path, _, _ in targets], ['master.wav', 'master_low.flac', 'master_high.flac'])
+        expected = sf.read(str(self.source), dtype='int16')[0]
+        for path, _, _ in targets:
+            written, _ = sf.read(str(path), dtype='int16')
+            np.testing.assert_array_equal(written, expected)
+            with sf.SoundFile(str(path)) as output:
+                self.assertEqual((output.subtype, output.title), ('PCM_16', 'Toma 1'))
+
+class TestIncrementalBatch(unittest.TestCase):
+    
+    def setUp(self):
+        """Carpeta con tres orígenes WAV distintos"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        (self.root / "in").mkdir()
+        for i in range(3):
+            sf.write(str(self.root / "in" / f"take{i}.wav"), np.full((4410, 2), i, dtype=np.int16),
+                     44100, subtype='PCM_16')
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_incremental_batch_hashes_sources_in_workers(self):
+        """Test con pool el hash del manifiesto se calcula en los procesos, no en el padre"""
+        output_dir = self.root / "out"
+        
+        with mock.patch('audio_splitter.core.manifest.file_sha256') as parent_hash:
+            successful, failed = AudioConverter().batch_convert(self.root / "in", output_dir, 'flac',
+                                                                workers=2, incremental=True)
+        
+        self.assertEqual((successful, failed), (3, 0))
+        parent_hash.assert_not_called()
+        manifest = ConversionManifest.load(output_dir)
+        for source in (self.root / "in").iterdir():
+            self.assertEqual(manifest.entries[str(source.resolve())]['sha256'],
+                             file_utils.file_sha256(source))
+            self.assertTrue(manifest.is_up_to_date(source, {'format': 'flac', 'quality': 'high',
+                                                            'preserve_metadata': True}))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,58 @@
+"""
+Tests para el descubrimiento de archivos de audio
+"""
+
+import os
+import unittest
+import tempfile
+from pathlib import Path
+import sys
+
+# Agregar path del proyecto para imports absolutos
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from audio_splitter.utils.discovery import iter_files
+
+class TestIterFiles(unittest.TestCase):
+
+    def setUp(self):
+        """Crea un árbol con extensiones en mayúsculas y un enlace en bucle"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        for relative in ["a.wav", "B.MP3", "notes.txt",
+                         "album1/01.flac", "album1/cd2/02.Wav",
+                         "album2/03.mp3"]:
+            path = self.root / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"")
+        os.symlink(self.root, self.root / "album1" / "loop")
+        self.extensions = ['.wav', '.mp3', '.flac']
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _relative(self, files):
+        return sorted(str(path.relative_to(self.root)) for path in files)
+
+    def test_top_level_is_case_insensitive(self):
+        files = iter_files(self.root, self.extensions)
+        self.assertEqual(self._relative(files), ["B.MP3", "a.wav"])
+
+    def test_recursive_walk_survives_symlink_loop(self):
+        files = list(iter_files(self.root, self.extensions, recursive=True))
+        self.assertEqual(self._relative(files),
+                         ["B.MP3", "a.wav", "album1/01.flac", "album1/cd2/02.Wav", "album2/03.mp3"])
+
+    def test_parallel_walk_finds_same_files(self):
+        sequential = self._relative(iter_files(self.root, self.extensions, recursive=True))
+        parallel = self._relative(iter_files(self.root, self.extensions, recursive=True, workers=4))
+        self.assertEqual(parallel, sequential)
+
+    def test_stopping_early_does_not_hang(self):
+        files = iter_files(self.root, self.extensions, recursive=True, workers=2)
+        next(files)
+        files.close()
+
+if __name__ == '__main__':
+    unittest.main()
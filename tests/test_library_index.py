@@ -0,0 +1,96 @@
+"""
+Tests para el índice SQLite de la biblioteca
+"""
+
+import unittest
+import tempfile
+from pathlib import Path
+import sys
+
+# Agregar path del proyecto para imports absolutos
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from audio_splitter.core.library_index import LibraryIndex
+from audio_splitter.core.metadata_manager import AudioMetadata
+
+COVER = b'\xff\xd8cover'
+
+class FakeEditor:
+    """Editor falso: etiquetas derivadas del nombre y registro de lecturas"""
+
+    def __init__(self):
+        self.reads = []
+
+    def inspect(self, file_path, load_artwork=False):
+        path = Path(file_path)
+        self.reads.append(path.name)
+        if path.stem == 'broken':
+            raise ValueError("Formato de audio no reconocido")
+        metadata = AudioMetadata(title=path.stem, artist='Trio', album=path.parent.name,
+                                 albumartist=None if path.stem == 'b' else 'Trio',
+                                 artwork_data=COVER, artwork_mime='image/jpeg')
+        return metadata, {'codec': 'FLAC', 'duration': 60.0, 'sample_rate': 44100, 'channels': 2,
+                          'bitrate': 900000, 'bits_per_sample': 16}
+
+class TestLibraryIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Crea una biblioteca con dos álbumes y un archivo ilegible"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name) / "library"
+        for name in ["Uno/a.flac", "Uno/b.flac", "Dos/c.flac", "Dos/broken.mp3", "Dos/notes.txt"]:
+            path = self.root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"audio")
+        self.editor = FakeEditor()
+        self.index = LibraryIndex(Path(self.temp_dir.name) / "index.sqlite3", editor=self.editor)
+
+    def tearDown(self):
+        self.index.close()
+        self.temp_dir.cleanup()
+
+    def test_rescan_reads_only_changed_files(self):
+        """Test un nuevo escaneo solo relee los archivos con tamaño o mtime distintos"""
+        counts = self.index.scan(self.root, workers=2, show_progress=False)
+        self.assertEqual((counts['added'], counts['failed']), (4, 1))
+
+        self.editor.reads.clear()
+        changed = self.root / "Uno" / "a.flac"
+        changed.write_bytes(b"audio, retagged")
+        (self.root / "Dos" / "c.flac").unlink()
+
+        counts = self.index.scan(self.root, show_progress=False)
+        self.assertEqual(self.editor.reads, ['a.flac'])
+        self.assertEqual((counts['updated'], counts['unchanged'], counts['removed']), (1, 2, 1))
+
+    def test_queries_and_artwork_by_hash(self):
+        """Test campos vacíos, duración por álbum y carátula guardada una sola vez"""
+        self.index.scan(self.root, show_progress=False)
+
+        missing = [Path(row['path']).name for row in self.index.find(missing=['albumartist'])]
+        self.assertEqual(missing, ['b.flac'])
+        self.assertEqual(len(self.index.find({'album': 'Uno'})), 2)
+
+        albums = {row['album']: (row['tracks'], row['duration']) for row in self.index.album_summary()}
+        self.assertEqual(albums, {'Dos': (1, 60.0), 'Uno': (2, 120.0)})
+
+        hashes = {row['artwork_hash'] for row in self.index.find()}
+        self.assertEqual(len(hashes), 1)
+        self.assertEqual(self.index.artwork(hashes.pop()), (COVER, 'image/jpeg'))
+        self.assertEqual([Path(row['path']).name for row in self.index.failures()], ['broken.mp3'])
+
+    def test_scan_is_limited_to_root(self):
+        """Test escanear un subdirectorio no elimina el resto del índice"""
+        self.index.scan(self.root, show_progress=False)
+        counts = self.index.scan(self.root / "Uno", show_progress=False)
+        self.assertEqual(counts['removed'], 0)
+        self.assertEqual(len(self.index.find(under=self.root / "Dos")), 1)
+
+    def test_rejects_unknown_fields(self):
+        """Test solo se consultan columnas conocidas"""
+        with self.assertRaises(ValueError):
+            self.index.find({'title; DROP TABLE files': 'x'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Tests para el manifiesto de conversiones incrementales
+"""
+
+import os
+import unittest
+import tempfile
+from pathlib import Path
+from unittest import mock
+import sys
+
+# Agregar path del proyecto para imports absolutos
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from audio_splitter.core.manifest import ConversionManifest
+
+class TestConversionManifest(unittest.TestCase):
+    
+    def setUp(self):
+        """Crea un origen y una salida ya convertida"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        self.source = root / "song.flac"
+        self.source.write_bytes(b"fLaC" + b"\x01" * 128)
+        self.output_dir = root / "out"
+        self.output_dir.mkdir()
+        self.output = self.output_dir / "song.mp3"
+        self.output.write_bytes(b"mp3")
+        self.settings = {'format': 'mp3', 'quality': 'high', 'preserve_metadata': True}
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def _recorded_manifest(self):
+        manifest = ConversionManifest(self.output_dir)
+        manifest.record(self.source, self.output, self.settings)
+        manifest.save()
+        return ConversionManifest.load(self.output_dir)
+    
+    def test_unchanged_source_is_up_to_date(self):
+        """Test origen sin cambios tras guardar y recargar el manifiesto"""
+        manifest = self._recorded_manifest()
+        self.assertTrue(manifest.is_up_to_date(self.source, self.settings))
+        self.assertEqual(manifest.output_for(self.source), self.output)
+    
+    def test_record_reuses_given_hash(self):
+        """Test un hash ya calculado (p. ej. en el proceso que convirtió) no se vuelve a leer"""
+        manifest = ConversionManifest(self.output_dir)
+        with mock.patch('audio_splitter.core.manifest.file_sha256') as hashed:
+            manifest.record(self.source, self.output, self.settings, 'abc123')
+        hashed.assert_not_called()
+        self.assertEqual(manifest.entries[str(self.source.resolve())]['sha256'], 'abc123')
+    
+    def test_touched_source_with_same_content(self):
+        """Test cambio de mtime sin cambio de contenido"""
+        manifest = self._recorded_manifest()
+        stat = self.source.stat()
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertTrue(manifest.is_up_to_date(self.source, self.settings))
+    
+    def test_modified_source_or_settings(self):
+        """Test origen modificado o configuración distinta"""
+        manifest = self._recorded_manifest()
+        self.assertFalse(manifest.is_up_to_date(self.source, dict(self.settings, quality='low')))
+        
+        self.source.write_bytes(b"fLaC" + b"\x02" * 128)
+        self.assertFalse(manifest.is_up_to_date(self.source, self.settings))
+    
+    def test_missing_output(self):
+        """Test salida borrada después de la conversión"""
+        manifest = self._recorded_manifest()
+        self.output.unlink()
+        self.assertFalse(manifest.is_up_to_date(self.source, self.settings))
+    
+    def test_prune_removed_source(self):
+        """Test eliminar entradas de orígenes desaparecidos del árbol"""
+        manifest = self._recorded_manifest()
+        root = self.source.parent
+        self.assertEqual(manifest.prune(root, [self.source]), [])
+        
+        self.source.unlink()
+        self.assertEqual(manifest.prune(self.output_dir, []), [])
+        self.assertEqual(manifest.prune(root, []), [self.output])
+        self.assertIsNone(manifest.output_for(self.source))
+
+if __name__ == '__main__':
+    unittest.main()
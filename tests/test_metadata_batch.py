@@ -0,0 +1,123 @@
+"""
+Tests para la edición de metadatos por lotes
+"""
+
+import threading
+import unittest
+import tempfile
+from pathlib import Path
+import sys
+
+# Agregar path del proyecto para imports absolutos
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from audio_splitter.core.manifest import ConversionManifest
+from audio_splitter.core.metadata_batch import BatchMetadataEditor, resolve_batch_sources
+
+class RecordingEditor:
+    """Editor falso que registra cada archivo y falla con los marcados como rotos"""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def update_metadata(self, file_path, changes):
+        with self._lock:
+            self.calls.append(Path(file_path).name)
+        if 'broken' in Path(file_path).name:
+            raise ValueError("Formato de audio no reconocido")
+        return changes
+
+class ClosingStore:
+    """Almacén de carátulas falso que cuenta los cierres"""
+
+    def __init__(self):
+        self.closed = 0
+
+    def close(self):
+        self.closed += 1
+
+class TestResolveBatchSources(unittest.TestCase):
+
+    def setUp(self):
+        """Crea un árbol con audio, otros archivos y un subdirectorio"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        (self.root / "album").mkdir()
+        for name in ["album/01.mp3", "album/02.FLAC", "album/cover.jpg", "loose.wav"]:
+            (self.root / name).write_bytes(b"data")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _names(self, source):
+        return sorted(path.name for path in resolve_batch_sources(source))
+
+    def test_directory_is_recursive_and_filtered(self):
+        """Test un directorio se recorre entero y solo devuelve audio"""
+        self.assertEqual(self._names(self.root), ['01.mp3', '02.FLAC', 'loose.wav'])
+
+    def test_glob_pattern(self):
+        """Test patrón glob recursivo"""
+        self.assertEqual(self._names(str(self.root / "**" / "*.mp3")), ['01.mp3'])
+
+    def test_file_list_relative_paths(self):
+        """Test lista de archivos con comentarios, rutas relativas y duplicados"""
+        playlist = self.root / "lote.m3u"
+        playlist.write_text("#EXTM3U\nalbum/01.mp3\n\nloose.wav\nalbum/01.mp3\n", encoding='utf-8')
+        self.assertEqual(self._names(playlist), ['01.mp3', 'loose.wav'])
+
+    def test_conversion_manifest_outputs(self):
+        """Test un manifiesto de conversión edita sus salidas"""
+        output_dir = self.root / "out"
+        output_dir.mkdir()
+        (output_dir / "loose.mp3").write_bytes(b"mp3")
+        manifest = ConversionManifest(output_dir)
+        manifest.record(self.root / "loose.wav", output_dir / "loose.mp3", {'format': 'mp3'})
+        manifest.save()
+        self.assertEqual(self._names(manifest.path), ['loose.mp3'])
+
+    def test_other_json_is_rejected(self):
+        """Test un .json que no es el manifiesto no carga el manifiesto de su directorio"""
+        manifest = ConversionManifest(self.root)
+        manifest.record(self.root / "loose.wav", self.root / "loose.wav", {'format': 'wav'})
+        manifest.save()
+        other = self.root / "album" / "tags.json"
+        other.write_text("{}", encoding='utf-8')
+        sibling = self.root / "other.json"
+        sibling.write_text("{}", encoding='utf-8')
+
+        for source in (other, sibling):
+            with self.assertRaises(ValueError):
+                resolve_batch_sources(source)
+
+class TestBatchMetadataEditor(unittest.TestCase):
+
+    def test_failures_do_not_stop_batch(self):
+        """Test cada archivo se edita una vez y los fallos se acumulan"""
+        editor = RecordingEditor()
+        files = [Path(f"track_{i}.mp3") for i in range(50)] + [Path("broken.mp3")]
+        result = BatchMetadataEditor(editor, workers=4).apply(files, {'artist': 'X'}, show_progress=False)
+
+        self.assertEqual(result.updated, 50)
+        self.assertEqual(result.failures, [(Path("broken.mp3"), "Formato de audio no reconocido")])
+        self.assertEqual(sorted(editor.calls), sorted(path.name for path in files))
+
+    def test_artwork_pool_closed_after_batch(self):
+        """Test el pool de carátulas del editor se detiene al acabar el lote"""
+        editor = RecordingEditor()
+        editor.artwork_store = ClosingStore()
+        BatchMetadataEditor(editor, workers=2).apply([Path("a.mp3"), Path("broken.mp3")], {'artist': 'X'},
+                                                     show_progress=False)
+        self.assertEqual(editor.artwork_store.closed, 1)
+
+    def test_rejects_unknown_fields(self):
+        """Test campos no editables"""
+        with self.assertRaises(ValueError):
+            BatchMetadataEditor(RecordingEditor()).apply([], {'artwork_data': b''}, show_progress=False)
+        with self.assertRaises(ValueError):
+            BatchMetadataEditor(RecordingEditor()).apply([], {}, show_progress=False)
+
+if __name__ == '__main__':
+    unittest.main()
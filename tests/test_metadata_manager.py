@@ -0,0 +1,169 @@
+"""
+Tests para el editor de metadatos y la carátula diferida de AudioMetadata
+"""
+
+import unittest
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+import sys
+
+import numpy as np
+import soundfile as sf
+from mutagen.flac import FLAC, Picture
+from mutagen.id3 import ID3, APIC, COMM, TXXX, USLT
+
+# Agregar path del proyecto para imports absolutos
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from audio_splitter.core.metadata_manager import ArtworkHandle, AudioMetadata, MetadataEditor
+
+COVER = b'\xff\xd8' + b'\x00' * 64
+
+def opened_file(kind):
+    """Objeto con la forma de un archivo mutagen abierto que contiene COVER"""
+    if kind == 'id3':
+        return SimpleNamespace(tags={'APIC:Cover': SimpleNamespace(data=COVER)})
+    if kind == 'flac':
+        return SimpleNamespace(pictures=[SimpleNamespace(data=b'back'), SimpleNamespace(data=COVER)])
+    return SimpleNamespace(tags={'covr': [COVER]})
+
+class TestArtworkHandle(unittest.TestCase):
+
+    def test_load_from_open_file(self):
+        """Test cada tipo de handle localiza su imagen en el archivo abierto"""
+        for kind, key in (('id3', 'APIC:Cover'), ('flac', 1), ('mp4', 0)):
+            handle = ArtworkHandle('song', kind, key, 'image/jpeg', len(COVER))
+            data = handle.load(opened_file(kind))
+            self.assertIs(type(data), bytes)
+            self.assertEqual(data, COVER)
+
+    def test_missing_artwork(self):
+        """Test una carátula que ya no está en el archivo"""
+        handle = ArtworkHandle('song', 'flac', 5)
+        with self.assertRaises(ValueError):
+            handle.load(opened_file('flac'))
+
+class TestAudioMetadataArtwork(unittest.TestCase):
+
+    def test_handle_is_not_loaded_for_listing(self):
+        """Test tamaño, presencia y to_dict no leen la carátula"""
+        handle = ArtworkHandle('/no/existe.flac', 'flac', 0, 'image/png', 1234)
+        metadata = AudioMetadata(title='A', artwork_mime='image/png', artwork=handle)
+
+        self.assertTrue(metadata.has_artwork)
+        self.assertEqual(metadata.artwork_size, 1234)
+        self.assertEqual(metadata.to_dict(), {'title': 'A', 'artwork_mime': 'image/png'})
+
+    def test_assigned_artwork_takes_precedence(self):
+        """Test la carátula asignada sustituye a la del archivo"""
+        handle = ArtworkHandle('/no/existe.flac', 'flac', 0)
+        metadata = AudioMetadata(artwork_data=b'new', artwork=handle)
+        self.assertEqual(metadata.load_artwork(), b'new')
+        self.assertIsNone(AudioMetadata().load_artwork())
+        self.assertFalse(AudioMetadata().has_artwork)
+
+def write_silence(path, subtype):
+    """Audio corto sin etiquetas"""
+    sf.write(str(path), np.zeros((4410, 2), dtype='float32'), 44100, subtype=subtype)
+
+class FittingStore:
+    """Almacén de carátulas falso que cuenta las reducciones"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def fit(self, data, mime):
+        self.calls += 1
+        return b'small', 'image/jpeg'
+
+class TestUpdateMetadata(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.editor = MetadataEditor()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def flac_with_extras(self):
+        """FLAC con etiquetas que el editor no conoce e imágenes de tres tipos"""
+        path = Path(self.temp_dir.name) / "song.flac"
+        write_silence(path, 'PCM_16')
+        audio = FLAC(str(path))
+        if audio.tags is None:
+            audio.add_tags()
+        audio.tags['TITLE'] = 'Song'
+        audio.tags['GENRE'] = 'Rock'
+        audio.tags['REPLAYGAIN_TRACK_GAIN'] = '-7.50 dB'
+        audio.tags['MUSICBRAINZ_TRACKID'] = '0b1f4c4e-0000-4000-8000-000000000000'
+        audio.tags['LYRICS'] = 'la la la'
+        for picture_type in (3, 4, 6):
+            picture = Picture()
+            picture.type = picture_type
+            picture.mime = 'image/jpeg'
+            picture.data = COVER + bytes([picture_type])
+            audio.add_picture(picture)
+        audio.save()
+        return path
+
+    def test_flac_edit_keeps_unknown_tags_and_pictures(self):
+        """Test cambiar un campo no borra etiquetas desconocidas ni imágenes"""
+        path = self.flac_with_extras()
+        self.editor.update_metadata(path, {'genre': 'Jazz'})
+
+        audio = FLAC(str(path))
+        self.assertEqual(audio.tags['GENRE'], ['Jazz'])
+        self.assertEqual(audio.tags['TITLE'], ['Song'])
+        for key in ('REPLAYGAIN_TRACK_GAIN', 'MUSICBRAINZ_TRACKID', 'LYRICS'):
+            self.assertIn(key, audio.tags)
+        self.assertEqual([picture.type for picture in audio.pictures], [3, 4, 6])
+        self.assertEqual(audio.pictures[0].data, COVER + b'\x03')
+
+    def test_flac_artwork_edit_replaces_front_cover_only(self):
+        """Test cambiar la carátula solo sustituye la portada"""
+        path = self.flac_with_extras()
+        self.editor.update_metadata(path, {'artwork_data': b'\xff\xd8new', 'artwork_mime': 'image/jpeg'})
+
+        pictures = {picture.type: picture.data for picture in FLAC(str(path)).pictures}
+        self.assertEqual(pictures, {3: b'\xff\xd8new', 4: COVER + b'\x04', 6: COVER + b'\x06'})
+
+    def test_existing_oversized_cover_is_not_refitted(self):
+        """Test MAX_ARTWORK_SIZE solo se aplica a la carátula asignada, no a la del archivo"""
+        path = self.flac_with_extras()
+        editor = MetadataEditor(artwork_store=FittingStore())
+        with mock.patch('audio_splitter.core.metadata_manager.MAX_ARTWORK_SIZE', 16):
+            editor.update_metadata(path, {'genre': 'Jazz'})
+            editor.update_metadata(path, {'artwork_description': 'Front'})
+            self.assertEqual(editor.artwork_store.calls, 0)
+            self.assertEqual(FLAC(str(path)).pictures[-1].data, COVER + b'\x03')
+
+            editor.update_metadata(path, {'artwork_data': COVER, 'artwork_mime': 'image/png'})
+            self.assertEqual(editor.artwork_store.calls, 1)
+        self.assertIn(b'small', [picture.data for picture in FLAC(str(path)).pictures])
+
+    def test_mp3_edit_keeps_unknown_frames(self):
+        """Test en ID3 solo se sustituyen los frames de los campos editados"""
+        path = Path(self.temp_dir.name) / "song.mp3"
+        write_silence(path, 'MPEG_LAYER_III')
+        tags = ID3()
+        tags.add(TXXX(encoding=3, desc='replaygain_track_gain', text='-7.50 dB'))
+        tags.add(USLT(encoding=3, lang='eng', desc='', text='la la la'))
+        tags.add(COMM(encoding=3, lang='eng', desc='iTunNORM', text='0000'))
+        tags.add(APIC(encoding=3, mime='image/jpeg', type=3, desc='Cover', data=COVER))
+        tags.add(APIC(encoding=3, mime='image/jpeg', type=4, desc='Back', data=b'back'))
+        tags.save(str(path))
+
+        self.editor.update_metadata(path, {'genre': 'Jazz', 'comment': 'Nuevo'})
+
+        tags = ID3(str(path))
+        self.assertEqual(str(tags['TCON']), 'Jazz')
+        self.assertIn('TXXX:replaygain_track_gain', tags)
+        self.assertEqual(len(tags.getall('USLT')), 1)
+        self.assertEqual(sorted(frame.desc for frame in tags.getall('COMM')), ['', 'iTunNORM'])
+        self.assertEqual(sorted(frame.type for frame in tags.getall('APIC')), [3, 4])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Tests para las plantillas de metadatos
+"""
+
+import unittest
+import tempfile
+from pathlib import Path
+import sys
+
+# Agregar path del proyecto para imports absolutos
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from audio_splitter.core.metadata_batch import BatchMetadataEditor
+from audio_splitter.core.metadata_templates import MetadataTemplate, list_templates
+
+class CapturingEditor:
+    """Editor falso que guarda los cambios recibidos por archivo"""
+
+    def __init__(self):
+        self.changes = {}
+
+    def update_metadata(self, file_path, changes):
+        self.changes[Path(file_path).name] = changes
+        return changes
+
+class TestMetadataTemplate(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.templates_dir = Path(self.temp_dir.name) / "templates"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save_and_load_with_artwork(self):
+        """Test guardar y cargar una plantilla con carátula relativa"""
+        template = MetadataTemplate("Álbum: Jazz", {'album': 'Kind of Blue', 'track': '{track}'})
+        path = template.save(self.templates_dir, artwork=(b'\xff\xd8jpeg', 'image/jpeg'))
+
+        self.assertEqual(list_templates(self.templates_dir), [path.stem])
+        loaded = MetadataTemplate.load("Álbum: Jazz", self.templates_dir)
+        self.assertEqual(loaded.fields, template.fields)
+        self.assertEqual(Path(loaded.artwork).read_bytes(), b'\xff\xd8jpeg')
+
+    def test_render_placeholders(self):
+        """Test variables de archivo y numeración del lote"""
+        compiled = MetadataTemplate("t", {
+            'title': '{stem}',
+            'album': '{parent}',
+            'track': '{track:02d}',
+            'track_total': '{total}',
+            'comment': 'Literal {{x}}'
+        }).compile()
+
+        changes = compiled.render(Path("discos/Blue/So What.flac"), 3, 12)
+        self.assertEqual(changes, {'title': 'So What', 'album': 'Blue', 'track': '03',
+                                   'track_total': '12', 'comment': 'Literal {x}'})
+
+    def test_compile_rejects_invalid_templates(self):
+        """Test campos, variables y formatos no válidos fallan al compilar"""
+        for fields in ({'artwork_data': 'x'}, {'title': '{unknown}'}, {'title': '{stem.upper}'},
+                       {'track': '{stem:d}'}, {'title': '{'}):
+            with self.assertRaises(ValueError, msg=fields):
+                MetadataTemplate("t", fields).compile()
+
+    def test_overrides_are_literal(self):
+        """Test los valores indicados sustituyen a los de la plantilla sin interpretar variables"""
+        compiled = MetadataTemplate("t", {'title': '{stem}'}).compile({'title': '{stem}', 'genre': 'Jazz'})
+        self.assertEqual(compiled.render(Path("a.mp3"), 1, 1), {'title': '{stem}', 'genre': 'Jazz'})
+
+    def test_artwork_loaded_once_for_batch(self):
+        """Test todos los archivos del lote comparten los bytes de la carátula"""
+        artwork = Path(self.temp_dir.name) / "cover.png"
+        artwork.write_bytes(b'\x89PNG')
+        compiled = MetadataTemplate("t", {'album': 'A', 'track': '{track}'}, artwork=str(artwork)).compile()
+        artwork.unlink()
+
+        editor = CapturingEditor()
+        files = [Path(f"{i:02d}.mp3") for i in range(1, 21)]
+        result = BatchMetadataEditor(editor, workers=4).apply_template(files, compiled, show_progress=False)
+
+        self.assertEqual(result.updated, 20)
+        self.assertEqual(editor.changes['07.mp3']['track'], '7')
+        self.assertEqual(editor.changes['07.mp3']['artwork_mime'], 'image/png')
+        data = {id(changes['artwork_data']) for changes in editor.changes.values()}
+        self.assertEqual(len(data), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,224 @@
+"""
+Tests para la conversión con una única decodificación (ConversionPipeline)
+"""
+
+import io
+import shutil
+import unittest
+import tempfile
+from pathlib import Path
+from unittest import mock
+import sys
+
+import numpy as np
+import soundfile as sf
+
+# Agregar path del proyecto para imports absolutos
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from audio_splitter.core import pipeline as pipeline_module
+from audio_splitter.core.pipeline import ConversionPipeline
+from audio_splitter.core.converter import AudioConverter
+from audio_splitter.config.settings import FFMPEG_BINARY, STREAM_BLOCK_FRAMES
+
+def write_source(path, subtype='PCM_24', channels=2, frames=22050):
+    """Origen con ruido determinista; devuelve las muestras tal como quedaron en disco"""
+    rng = np.random.default_rng(2)
+    sf.write(str(path), rng.integers(-2**31, 2**31 - 1, size=(frames, channels), dtype=np.int32),
+             44100, subtype=subtype)
+    return sf.read(str(path), dtype='int32', always_2d=True)[0]
+
+class TestConversionPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.source = self.root / "master.wav"
+        self.data = write_source(self.source)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_wav_keeps_samples_and_writes_tags_inline(self):
+        """Test la salida WAV conserva muestras y profundidad y lleva las etiquetas"""
+        pipeline = ConversionPipeline(self.source, {'title': 'Toma 1', 'artist': 'Banda', 'album': None})
+        output = self.root / "out.wav"
+        pipeline.encode(output, 'wav')
+
+        self.assertEqual(sf.info(str(output)).subtype, 'PCM_24')
+        np.testing.assert_array_equal(sf.read(str(output), dtype='int32', always_2d=True)[0], self.data)
+        with sf.SoundFile(str(output)) as written:
+            self.assertEqual((written.title, written.artist), ('Toma 1', 'Banda'))
+
+    def test_decode_reads_source_once(self):
+        """Test el buffer decodificado se reutiliza entre codificaciones"""
+        pipeline = ConversionPipeline(self.source)
+        with mock.patch('audio_splitter.core.pipeline.sf.read', wraps=sf.read) as read:
+            pcm, sr = pipeline.decode()
+            pipeline.encode(self.root / "a.wav", 'wav')
+            pipeline.encode(self.root / "b.wav", 'wav')
+        self.assertEqual(read.call_count, 1)
+        self.assertEqual((pcm.shape, sr), (self.data.shape, 44100))
+        np.testing.assert_array_equal(sf.read(str(self.root / "b.wav"), dtype='int32')[0], self.data)
+
+    def test_unsupported_format(self):
+        """Test un formato objetivo desconocido se rechaza"""
+        with self.assertRaises(ValueError):
+            ConversionPipeline(self.source).encode(self.root / "out.ogg", 'ogg')
+
+class TestFlacEncoding(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_lossless_with_source_bit_depth(self):
+        """Test FLAC conserva las muestras; los orígenes en coma flotante pasan a 24 bits"""
+        for subtype, flac_subtype in (('PCM_16', 'PCM_16'), ('PCM_24', 'PCM_24'), ('FLOAT', 'PCM_24')):
+            source = self.root / f"{subtype}.wav"
+            data = write_source(source, subtype)
+            output = self.root / f"{subtype}.flac"
+            ConversionPipeline(source).encode(output, 'flac', {'compression_level': 5})
+
+            self.assertEqual(sf.info(str(output)).subtype, flac_subtype)
+            if subtype != 'FLOAT':
+                np.testing.assert_array_equal(sf.read(str(output), dtype='int32', always_2d=True)[0], data)
+
+    def test_compression_level_is_honored(self):
+        """Test el nivel de compresión del preset cambia el tamaño, no las muestras"""
+        source = self.root / "tone.wav"
+        tone = (np.sin(2 * np.pi * 440 * np.arange(44100) / 44100) * 20000).astype(np.int16)
+        sf.write(str(source), np.stack([tone, tone // 2], axis=1), 44100, subtype='PCM_16')
+
+        pipeline = ConversionPipeline(source)
+        sizes = {}
+        for level in (0, 8):
+            output = self.root / f"level{level}.flac"
+            pipeline.encode(output, 'flac', {'compression_level': level})
+            sizes[level] = output.stat().st_size
+            np.testing.assert_array_equal(sf.read(str(output), dtype='int16')[0][:, 0], tone)
+        self.assertLess(sizes[8], sizes[0])
+
+class RecordingStdin(io.BytesIO):
+    """stdin de ffmpeg falso que conserva lo recibido al cerrarse"""
+
+    def close(self):
+        self.received = self.getvalue()
+        super().close()
+
+class FakeFfmpeg:
+    """Proceso ffmpeg falso: acepta PCM por stdin y termina con el código indicado"""
+
+    def __init__(self, returncode=0, errors=b''):
+        self.returncode = returncode
+        self.stdin = RecordingStdin()
+        self.stderr = io.BytesIO(errors)
+
+    def wait(self):
+        return self.returncode
+
+class TestMp3Encoding(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.source = self.root / "master.wav"
+        self.data = write_source(self.source, 'PCM_16') >> 16
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_blocks_streamed_to_one_process(self):
+        """Test todos los bloques PCM van por stdin a un único proceso ffmpeg"""
+        pipeline = ConversionPipeline(self.source, {'title': 'Toma 1'})
+        process = FakeFfmpeg()
+        with mock.patch('audio_splitter.core.pipeline.subprocess.Popen', return_value=process) as popen:
+            pipeline.encode(self.root / "out.mp3", 'mp3', AudioConverter.QUALITY_PRESETS['mp3']['high'],
+                            blocks=pipeline.blocks(1000))
+
+        popen.assert_called_once()
+        command = popen.call_args[0][0]
+        self.assertEqual(command[command.index('-f') + 1], 's16le')
+        self.assertEqual(command[command.index('-ac') + 1], '2')
+        self.assertEqual(command[command.index('-b:a') + 1], '320k')
+        self.assertIn('title=Toma 1', command)
+        self.assertEqual(process.stdin.received, self.data.astype('<i2').tobytes())
+
+    def test_vbr_preset_parameters(self):
+        """Test los presets VBR pasan sus parámetros en lugar de un bitrate"""
+        command = ConversionPipeline(self.source)._ffmpeg_mp3_command(
+            self.root / "out.mp3", 44100, 2, np.dtype('int32'), AudioConverter.QUALITY_PRESETS['mp3']['vbr_high'])
+        self.assertEqual(command[command.index('-q:a') + 1], '0')
+        self.assertNotIn('-b:a', command)
+        self.assertEqual(command[command.index('-f') + 1], 's32le')
+
+    def test_ffmpeg_failure_is_reported(self):
+        """Test un código de salida distinto de cero se convierte en error con el mensaje de ffmpeg"""
+        process = FakeFfmpeg(returncode=1, errors=b'Unknown encoder')
+        with mock.patch('audio_splitter.core.pipeline.subprocess.Popen', return_value=process):
+            with self.assertRaisesRegex(RuntimeError, 'Unknown encoder'):
+                ConversionPipeline(self.source).encode(self.root / "out.mp3", 'mp3', {'bitrate': '128k'})
+
+    @unittest.skipUnless(shutil.which(FFMPEG_BINARY), "ffmpeg no está instalado")
+    def test_encode_with_ffmpeg(self):
+        """Test MP3 real: misma frecuencia, canales y duración que el origen"""
+        output = self.root / "out.mp3"
+        ConversionPipeline(self.source).encode(output, 'mp3', {'bitrate': '192k'})
+        info = sf.info(str(output))
+        self.assertEqual((info.samplerate, info.channels), (44100, 2))
+        self.assertAlmostEqual(info.duration, 0.5, delta=0.1)
+
+class TestEncodeMany(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.source = self.root / "master.wav"
+        # Varios bloques de lectura, para que el reparto entre colas entre en juego
+        self.data = write_source(self.source, frames=STREAM_BLOCK_FRAMES * 4 + 100)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_one_read_feeds_every_output(self):
+        """Test una sola lectura del origen produce todas las salidas, cada una con su preset"""
+        pipeline = ConversionPipeline(self.source)
+        targets = [(self.root / "out.wav", 'wav', {}),
+                   (self.root / "fast.flac", 'flac', {'compression_level': 0}),
+                   (self.root / "best.flac", 'flac', {'compression_level': 8})]
+        with mock.patch.object(ConversionPipeline, 'blocks', autospec=True,
+                               side_effect=ConversionPipeline.blocks) as blocks:
+            errors = pipeline.encode_many(targets)
+
+        self.assertEqual(errors, [None, None, None])
+        self.assertEqual(blocks.call_count, 1)
+        for output, _, _ in targets:
+            self.assertEqual(sf.info(str(output)).subtype, 'PCM_24')
+            np.testing.assert_array_equal(sf.read(str(output), dtype='int32', always_2d=True)[0], self.data)
+
+    def test_failed_output_does_not_block_the_others(self):
+        """Test un codificador que falla no detiene ni bloquea al resto"""
+        targets = [(self.root / "out.wav", 'wav', {}),
+                   (self.root / "out.ogg", 'ogg', {}),
+                   (self.root / "out.mp3", 'mp3', {'bitrate': '128k'}),
+                   (self.root / "out.flac", 'flac', {})]
+        # Colas de un bloque: el lector se bloquearía si nadie vaciara las de los fallidos
+        with mock.patch.object(pipeline_module, 'FANOUT_QUEUE_BLOCKS', 1), \
+                mock.patch('audio_splitter.core.pipeline.subprocess.Popen',
+                           return_value=FakeFfmpeg(returncode=1, errors=b'boom')):
+            pipeline = ConversionPipeline(self.source)
+            errors = pipeline.encode_many(targets)
+
+        self.assertIsNone(errors[0])
+        self.assertIsInstance(errors[1], ValueError)
+        self.assertIsInstance(errors[2], RuntimeError)
+        self.assertIsNone(errors[3])
+        np.testing.assert_array_equal(sf.read(str(self.root / "out.flac"), dtype='int32', always_2d=True)[0],
+                                      self.data)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Tests para el planificador de trabajos por memoria
+"""
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import sys
+
+# Agregar path del proyecto para imports absolutos
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from audio_splitter.core.scheduler import JobEstimate, MemoryAwareScheduler
+
+class TestMemoryAwareScheduler(unittest.TestCase):
+    
+    def setUp(self):
+        """Trabajos (nombre, memoria, frames) con un registro de ejecución"""
+        self.jobs = [('short', 10, 100), ('huge', 80, 10000), ('medium', 40, 1000), ('tiny', 5, 10)]
+        self.lock = threading.Lock()
+        self.started = []
+        self.running = 0
+        self.peak_memory = 0
+        self.memory = 0
+    
+    def _estimate(self, job):
+        return JobEstimate(memory=job[1], frames=job[2])
+    
+    def _work(self, job):
+        with self.lock:
+            self.started.append(job[0])
+            self.memory += job[1]
+            self.peak_memory = max(self.peak_memory, self.memory)
+        time.sleep(0.02)
+        with self.lock:
+            self.memory -= job[1]
+        return job[0]
+    
+    def _run(self, workers, budget):
+        scheduler = MemoryAwareScheduler(workers, budget, self._estimate)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return [future.result() for _, future in scheduler.run(executor, self._work, iter(self.jobs))]
+    
+    def test_longest_jobs_start_first(self):
+        """Test orden de más largo a más corto sin límite de memoria"""
+        finished = self._run(workers=1, budget=None)
+        self.assertEqual(self.started, ['huge', 'medium', 'short', 'tiny'])
+        self.assertEqual(sorted(finished), sorted(job[0] for job in self.jobs))
+    
+    def test_budget_limits_concurrent_memory(self):
+        """Test la memoria simultánea no supera el presupuesto"""
+        self._run(workers=4, budget=100)
+        self.assertLessEqual(self.peak_memory, 100)
+        self.assertEqual(self.started[0], 'huge')
+    
+    def test_oversized_job_runs_alone(self):
+        """Test un trabajo mayor que el presupuesto se ejecuta, pero en solitario"""
+        self._run(workers=4, budget=50)
+        self.assertEqual(self.started[0], 'huge')
+        self.assertEqual(self.peak_memory, 80)
+
+    def test_long_job_is_not_passed_over(self):
+        """Test un trabajo largo que no cabe aún no queda relegado por los cortos que sí caben"""
+        self.jobs = [('long', 60, 10000), ('big', 70, 5000)] + [(f'small{i}', 10, 100) for i in range(6)]
+        self._run(workers=3, budget=100)
+        self.assertEqual(self.started[:2], ['long', 'big'])
+        self.assertEqual(sorted(self.started[2:]), [f'small{i}' for i in range(6)])
+        self.assertLessEqual(self.peak_memory, 100)
+
+if __name__ == '__main__':
+    unittest.main()
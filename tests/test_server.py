@@ -0,0 +1,113 @@
+"""
+Tests para los controles de acceso del servicio HTTP local
+"""
+
+import http.client
+import json
+import threading
+import unittest
+import tempfile
+from pathlib import Path
+import sys
+
+# Agregar path del proyecto para imports absolutos
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from audio_splitter.ui.server import AudioHTTPServer
+
+class RecordingService:
+    """Servicio falso: registra las tareas en lugar de ejecutarlas en el pool"""
+
+    workers = 1
+
+    def __init__(self):
+        self.calls = []
+
+    def run(self, fn, *args):
+        self.calls.append(fn.__name__)
+        return {'duration': 1.0}
+
+class TestServerAccessControl(unittest.TestCase):
+
+    def setUp(self):
+        """Servicio con un único directorio raíz y un archivo fuera de él"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        base = Path(self.temp_dir.name)
+        self.root = base / "library"
+        self.root.mkdir()
+        self.inside = self.root / "take.wav"
+        self.inside.write_bytes(b"RIFF")
+        self.outside = base / "secret.txt"
+        self.outside.write_text("secret")
+
+        self.service = RecordingService()
+        self.server = AudioHTTPServer(('127.0.0.1', 0), self.service, [self.root])
+        self.port = self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+
+    def request(self, method, path, body=None, headers=None):
+        """Envía una petición y devuelve (estado, cuerpo)"""
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+        headers = {'Content-Type': 'application/json', **(headers or {})}
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        connection.request(method, path, body=data, headers=headers)
+        response = connection.getresponse()
+        payload = response.read()
+        connection.close()
+        return response.status, payload
+
+    def test_allowed_request(self):
+        """Test una petición JSON local sobre un archivo de la raíz se atiende"""
+        status, payload = self.request('POST', '/info', {'path': str(self.inside)},
+                                       {'Origin': f'http://localhost:{self.port}'})
+        self.assertEqual(status, 200)
+        self.assertEqual(self.service.calls, ['_task_info'])
+
+    def test_rejects_non_json_content_type(self):
+        """Test un POST text/plain (sin preflight CORS) se rechaza"""
+        status, _ = self.request('POST', '/info', {'path': str(self.inside)},
+                                 {'Content-Type': 'text/plain'})
+        self.assertEqual(status, 415)
+        self.assertEqual(self.service.calls, [])
+
+    def test_rejects_foreign_origin_and_host(self):
+        """Test Origin de otra web y Host ajeno (DNS rebinding) reciben 403"""
+        for headers in ({'Origin': 'http://evil.example'},
+                        {'Host': f'evil.example:{self.port}'}):
+            status, _ = self.request('POST', '/info', {'path': str(self.inside)}, headers)
+            self.assertEqual(status, 403, headers)
+        self.assertEqual(self.service.calls, [])
+
+    def test_paths_outside_roots_are_forbidden(self):
+        """Test /file, /convert y /split no salen de los directorios raíz"""
+        status, _ = self.request('GET', f'/file?path={self.outside}')
+        self.assertEqual(status, 403)
+        status, _ = self.request('GET', f'/file?path={self.root}/../secret.txt')
+        self.assertEqual(status, 403)
+
+        pwned = Path(self.temp_dir.name) / "pwned" / "x.wav"
+        status, _ = self.request('POST', '/convert', {'input': str(self.inside), 'formats': ['wav'],
+                                                      'output': str(pwned)})
+        self.assertEqual(status, 403)
+        self.assertFalse(pwned.parent.exists())
+
+        for body in ({'output_dir': str(self.outside.parent), 'segments': ['0:00-0:01']},
+                     {'output_dir': str(self.root), 'segments': ['0:00-0:01:../escape']}):
+            status, _ = self.request('POST', '/split', {'input': str(self.inside), **body})
+            self.assertEqual(status, 403, body)
+        self.assertEqual(self.service.calls, [])
+
+    def test_file_inside_root(self):
+        """Test se puede descargar un archivo de la raíz"""
+        status, payload = self.request('GET', f'/file?path={self.inside}')
+        self.assertEqual((status, payload), (200, b"RIFF"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,10 @@ Tests para el módulo AudioSplitter
 
 import unittest
 import tempfile
+from types import SimpleNamespace
+from unittest import mock
 import numpy as np
+import soundfile as sf
 from pathlib import Path
 import sys
 
@@ -12,8 +15,9 @@ import sys
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from audio_splitter.core.splitter import split_audio, convert_to_ms
-from audio_splitter.utils.audio_utils import time_to_ms, ms_to_time, validate_audio_segment
+from audio_splitter.core.splitter import AudioSplitter, split_audio, convert_to_ms, parse_segment
+from audio_splitter.utils.audio_utils import (time_to_ms, ms_to_time, validate_audio_segment, native_dtype,
+                                              probe_audio, get_audio_info)
 
 class TestAudioSplitter(unittest.TestCase):
     
@@ -29,6 +33,30 @@ class TestAudioSplitter(unittest.TestCase):
         # Formato HH:MM:SS
         self.assertEqual(convert_to_ms("1:01:30"), 3690000)  # 1 hora 1 min 30 seg
     
+    def test_parse_segment(self):
+        """Test especificaciones de segmento con y sin nombre"""
+        self.assertEqual(parse_segment("0:30-1:45:intro"), (30000, 105000, "intro"))
+        self.assertEqual(parse_segment("0:30-1:45"), (30000, 105000, ""))
+        self.assertEqual(parse_segment("0:30.5-1:45:"), (30500, 105000, ""))
+        
+        # Formato HH:MM:SS, con y sin nombre
+        self.assertEqual(parse_segment("1:00:00-1:02:30:parte 2"), (3600000, 3750000, "parte 2"))
+        self.assertEqual(parse_segment("1:00:00-1:02:30"), (3600000, 3750000, ""))
+        
+        # Nombres numéricos (número de pista) y nombres con ':' o '-'
+        self.assertEqual(parse_segment("0:30-1:45:01"), (30000, 105000, "01"))
+        self.assertEqual(parse_segment("1:00:00-1:02:30:02"), (3600000, 3750000, "02"))
+        self.assertEqual(parse_segment("0:30-1:45:1.5"), (30000, 105000, "1.5"))
+        self.assertEqual(parse_segment("0:30-1:45:live-take: 2"), (30000, 105000, "live-take: 2"))
+        
+        # Inicio MM:SS y fin HH:MM:SS
+        self.assertEqual(parse_segment("59:00-1:01:00"), (3540000, 3660000, ""))
+        self.assertEqual(parse_segment("59:00-1:01:00:03"), (3540000, 3660000, "03"))
+        
+        for spec in ("1:45", "intro", "0:10-0:20-0:30:x", "0:30-", "intro-1:45"):
+            with self.assertRaises(ValueError, msg=spec):
+                parse_segment(spec)
+    
     def test_time_to_ms(self):
         """Test conversión usando audio_utils"""
         self.assertEqual(time_to_ms("2:15"), 135000)
@@ -53,5 +81,129 @@ class TestAudioSplitter(unittest.TestCase):
         # Segmento inválido - inicio negativo
         self.assertFalse(validate_audio_segment(-1000, 30000, 60000))
 
+    def test_native_dtype(self):
+        """Test dtype de lectura según el subtipo del archivo"""
+        self.assertEqual(native_dtype('PCM_16'), 'int16')
+        self.assertEqual(native_dtype('PCM_24'), 'int32')
+        self.assertEqual(native_dtype('FLOAT'), 'float32')
+        
+        # Formatos comprimidos o desconocidos se decodifican a float
+        self.assertEqual(native_dtype('MPEG_LAYER_III'), 'float32')
+        self.assertEqual(native_dtype(None), 'float32')
+
+class TestProbeAudio(unittest.TestCase):
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_header_info_without_decoding(self):
+        """Test canales, frecuencia y duración salen de la cabecera, sin leer muestras"""
+        cases = (('stereo.wav', 48000, 2, 'PCM_24'), ('mono.flac', 22050, 1, 'PCM_16'))
+        for name, sr, channels, subtype in cases:
+            sf.write(str(self.root / name), np.zeros((sr * 3 // 2, channels), dtype='int16'), sr, subtype=subtype)
+        
+        with mock.patch('soundfile.read', side_effect=AssertionError("decodificación completa")), \
+                mock.patch('soundfile.SoundFile.read', side_effect=AssertionError("decodificación completa")):
+            for name, sr, channels, subtype in cases:
+                info = probe_audio(self.root / name)
+                self.assertEqual(info, {'duration': 1.5, 'sample_rate': sr, 'channels': channels,
+                                        'samples': sr * 3 // 2, 'subtype': subtype})
+                self.assertEqual(get_audio_info(self.root / name)['format'], Path(name).suffix)
+    
+    def test_falls_back_to_mutagen_stream_info(self):
+        """Test si libsndfile no reconoce el formato se usa la información de mutagen"""
+        path = self.root / "song.m4a"
+        path.write_bytes(b"\x00" * 64)
+        tagged = SimpleNamespace(info=SimpleNamespace(length=2.0, sample_rate=44100, channels=2))
+        
+        info = probe_audio(path, tagged)
+        self.assertEqual((info['duration'], info['sample_rate'], info['channels'], info['samples']),
+                         (2.0, 44100, 2, 88200))
+        
+        with self.assertRaises(ValueError):
+            probe_audio(path, SimpleNamespace(info=None))
+
+# Segmentos solapados, uno que pasa del final y uno vacío (archivo de 1 s)
+SEGMENTS = [(0, 400, 'a'), (250, 750, 'b'), (300, 350, 'c'), (900, 2000, 'd'), (500, 500, 'e')]
+
+class TestSplitAudioOutput(unittest.TestCase):
+    
+    def setUp(self):
+        """Orígenes de 1 s: WAV estéreo de 16 bits y FLAC mono de 24 bits"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        rng = np.random.default_rng(1)
+        self.sources = {}
+        for name, subtype, channels in (('stereo16.wav', 'PCM_16', 2), ('mono24.flac', 'PCM_24', 1)):
+            data = rng.integers(-2**23, 2**23, size=(44100, channels), dtype=np.int32) << 8
+            path = self.root / name
+            sf.write(str(path), data, 44100, subtype=subtype)
+            self.sources[path] = (sf.read(str(path), dtype='int32', always_2d=True)[0], subtype)
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def assert_segments_exact(self, **options):
+        """Divide cada origen con las opciones dadas, sin decodificarlo entero, y compara muestra a muestra"""
+        for source, (data, subtype) in self.sources.items():
+            output_dir = self.root / f"{source.stem}_{len(list(self.root.iterdir()))}"
+            with mock.patch('soundfile.read', side_effect=AssertionError("decodificación completa")):
+                self.assertTrue(AudioSplitter().split_audio(source, SEGMENTS, output_dir,
+                                                            block_frames=1000, **options))
+            for start_ms, end_ms, name in SEGMENTS:
+                segment, sr = sf.read(str(output_dir / f"{name}.wav"), dtype='int32', always_2d=True)
+                start, end = AudioSplitter._segment_frames(start_ms, end_ms, 44100, len(data))
+                self.assertEqual(sr, 44100)
+                self.assertEqual(sf.info(str(output_dir / f"{name}.wav")).subtype, subtype)
+                self.assertEqual(segment.shape, (end - start, data.shape[1]), (source.name, name))
+                np.testing.assert_array_equal(segment, data[start:end])
+    
+    def test_streaming_matches_source(self):
+        """Test la lectura por bloques conserva muestras, canales y profundidad"""
+        self.assert_segments_exact(fast_path=False)
+    
+    def test_parallel_export_matches_source(self):
+        """Test exportar en paralelo (copia directa y por bloques) da las mismas muestras"""
+        self.assert_segments_exact(workers=3)
+        self.assert_segments_exact(fast_path=False, workers=3)
+    
+    def test_single_pass_matches_source(self):
+        """Test la pasada secuencial única da las mismas muestras"""
+        self.assert_segments_exact(single_pass=True)
+    
+    def test_single_pass_reads_each_frame_once(self):
+        """Test la pasada única lee solo la unión de los segmentos, una vez"""
+        source, (data, _) = next(iter(self.sources.items()))
+        frames_read = []
+        read = sf.SoundFile.read
+        
+        def counting_read(soundfile, *args, **kwargs):
+            block = read(soundfile, *args, **kwargs)
+            frames_read.append(len(block))
+            return block
+        
+        with mock.patch.object(sf.SoundFile, 'read', counting_read):
+            self.assertTrue(AudioSplitter().split_audio(source, SEGMENTS, self.root / "single",
+                                                        block_frames=1000, single_pass=True))
+        
+        covered = np.zeros(len(data), dtype=bool)
+        for start_ms, end_ms, _ in SEGMENTS:
+            start, end = AudioSplitter._segment_frames(start_ms, end_ms, 44100, len(data))
+            covered[start:end] = True
+        self.assertEqual(sum(frames_read), covered.sum())
+        self.assertLessEqual(max(frames_read), 1000)
+    
+    def test_parallel_duplicate_names_do_not_collide(self):
+        """Test dos segmentos con el mismo nombre escriben archivos distintos"""
+        source = next(iter(self.sources))
+        segments = [(0, 100, 'take'), (100, 300, 'take')]
+        self.assertTrue(AudioSplitter().split_audio(source, segments, self.root / "dup", workers=2))
+        self.assertEqual(sf.info(str(self.root / "dup" / "take.wav")).frames, 4410)
+        self.assertEqual(sf.info(str(self.root / "dup" / "take_1.wav")).frames, 8820)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,81 @@
+"""
+Tests de presupuesto de arranque del CLI
+"""
+
+import json
+import subprocess
+import unittest
+from pathlib import Path
+import sys
+
+# Agregar path del proyecto para imports absolutos
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Tiempo máximo de importación + ejecución de `--version`, sin el arranque del intérprete
+STARTUP_BUDGET_SECONDS = 0.5
+
+# Módulos que no deben cargarse para mostrar la versión o la ayuda
+HEAVY_MODULES = ['librosa', 'numba', 'numpy', 'soundfile', 'pydub', 'mutagen', 'rich']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from audio_splitter.ui.cli import main_cli
+try:
+    main_cli(sys.argv[1:])
+except SystemExit:
+    pass
+elapsed = time.perf_counter() - start
+print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))
+"""
+
+class TestCliStartup(unittest.TestCase):
+
+    def _probe(self, *args):
+        """Ejecuta el CLI en un intérprete limpio y devuelve tiempo y módulos cargados"""
+        result = subprocess.run([sys.executable, '-c', PROBE, *args], cwd=str(project_root),
+                                capture_output=True, text=True, check=True)
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_version_within_budget(self):
+        """Test --version dentro del presupuesto de tiempo"""
+        # El mejor de tres intentos, para no fallar por ruido del sistema
+        elapsed = min(self._probe('--version')['elapsed'] for _ in range(3))
+        self.assertLess(elapsed, STARTUP_BUDGET_SECONDS)
+
+    def test_help_does_not_load_heavy_modules(self):
+        """Test --help y --version no importan dependencias pesadas"""
+        for args in (['--version'], ['--help'], ['convert', '--help']):
+            loaded = set(self._probe(*args)['modules'])
+            self.assertEqual([name for name in HEAVY_MODULES if name in loaded], [], args)
+
+class TestImportSideEffects(unittest.TestCase):
+
+    def _run(self, code):
+        """Ejecuta código en un intérprete limpio y devuelve su última línea JSON"""
+        result = subprocess.run([sys.executable, '-c', code], cwd=str(project_root),
+                                capture_output=True, text=True, check=True)
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_import_does_not_configure_logging(self):
+        """Test importar settings y logging_utils no instala handlers"""
+        handlers = self._run(
+            "import json, logging\n"
+            "import audio_splitter.config.settings, audio_splitter.utils.logging_utils\n"
+            "print(json.dumps(len(logging.getLogger('audio_splitter').handlers)))\n")
+        self.assertEqual(handlers, 0)
+
+    def test_worker_process_skips_runtime_init(self):
+        """Test un proceso marcado como worker no crea directorios ni handlers"""
+        result = self._run(
+            "import json, logging\n"
+            "from audio_splitter.config import runtime\n"
+            "runtime.mark_worker_process()\n"
+            "runtime.initialize_runtime()\n"
+            "print(json.dumps([runtime.ensure_data_directories(),\n"
+            "                  len(logging.getLogger('audio_splitter').handlers)]))\n")
+        self.assertEqual(result, [False, 0])
+
+if __name__ == '__main__':
+    unittest.main()
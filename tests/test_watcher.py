@@ -0,0 +1,71 @@
+"""
+Tests para la carpeta de ingesta vigilada
+"""
+
+import os
+import unittest
+import tempfile
+from concurrent.futures import Future
+from unittest import mock
+from pathlib import Path
+import sys
+
+# Agregar path del proyecto para imports absolutos
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from audio_splitter.core.watcher import IngestWatcher
+
+class TestIngestWatcher(unittest.TestCase):
+    
+    def setUp(self):
+        """Carpeta de ingesta con un archivo recién copiado"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.watch_dir = Path(self.temp_dir.name) / "ingest"
+        self.watch_dir.mkdir()
+        self.dropped = self.watch_dir / "take1.WAV"
+        self.dropped.write_bytes(b"RIFF")
+        (self.watch_dir / ".take2.wav.part").write_bytes(b"RIFF")
+        (self.watch_dir / ".take3.wav").write_bytes(b"RIFF")
+        self.watcher = IngestWatcher(self.watch_dir, Path(self.temp_dir.name) / "out", settle=0)
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_file_ready_after_stable_poll(self):
+        """Test un archivo solo está listo cuando no cambia entre sondeos"""
+        self.assertEqual(self.watcher.poll(), [])
+        self.assertEqual(self.watcher.poll(), [self.dropped])
+    
+    def test_growing_file_is_not_ready(self):
+        """Test un archivo que sigue creciendo no se procesa"""
+        self.watcher.poll()
+        with open(self.dropped, 'ab') as f:
+            f.write(b"more")
+        self.assertEqual(self.watcher.poll(), [])
+        self.assertEqual(self.watcher.poll(), [self.dropped])
+    
+    def test_output_names_do_not_collide(self):
+        """Test dos archivos con el mismo nombre base reciben salidas distintas"""
+        first, _ = self.watcher._task(self.dropped)
+        second, _ = self.watcher._task(self.watch_dir / "take1.flac")
+        self.assertNotEqual(first[2], second[2])
+    
+    def test_unmovable_file_skipped_until_changed(self):
+        """Test un archivo que no se pudo apartar no se vuelve a procesar hasta que cambie"""
+        future = Future()
+        future.set_result(True)
+        self.watcher._in_flight[future] = (self.dropped, [])
+        with mock.patch('audio_splitter.core.watcher.shutil.move', side_effect=PermissionError("ro")):
+            self.watcher._finish(future)
+        
+        self.assertEqual(self.watcher.poll(), [])
+        self.assertEqual(self.watcher.poll(), [])
+        
+        stat = self.dropped.stat()
+        os.utime(self.dropped, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(self.watcher.poll(), [])
+        self.assertEqual(self.watcher.poll(), [self.dropped])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Tests para las utilidades de copia directa de WAV PCM
+"""
+
+import unittest
+import tempfile
+import wave
+from pathlib import Path
+import sys
+
+# Agregar path del proyecto para imports absolutos
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from audio_splitter.utils.wav_utils import read_wav_layout, extract_wav_frames
+
+class TestWavUtils(unittest.TestCase):
+
+    def setUp(self):
+        """Crea un WAV estéreo de 16 bits con contenido conocido"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source = Path(self.temp_dir.name) / "source.wav"
+        self.frames = bytes(range(256)) * 40  # 10240 bytes = 2560 frames estéreo 16 bits
+
+        with wave.open(str(self.source), 'wb') as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(8000)
+            wav.writeframes(self.frames)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_read_wav_layout(self):
+        """Test lectura de cabecera sin decodificar"""
+        layout = read_wav_layout(self.source)
+        self.assertIsNotNone(layout)
+        self.assertEqual(layout.channels, 2)
+        self.assertEqual(layout.sample_rate, 8000)
+        self.assertEqual(layout.block_align, 4)
+        self.assertEqual(layout.frames, 2560)
+
+    def test_read_wav_layout_not_wav(self):
+        """Test archivo que no es RIFF/WAVE"""
+        other = Path(self.temp_dir.name) / "other.wav"
+        other.write_bytes(b"ID3" + b"\x00" * 64)
+        self.assertIsNone(read_wav_layout(other))
+
+    def test_extract_wav_frames_bit_exact(self):
+        """Test que el segmento extraído es idéntico byte a byte"""
+        layout = read_wav_layout(self.source)
+        output = Path(self.temp_dir.name) / "segment.wav"
+
+        extract_wav_frames(self.source, layout, output, 100, 600)
+
+        with wave.open(str(output), 'rb') as wav:
+            self.assertEqual(wav.getnchannels(), 2)
+            self.assertEqual(wav.getframerate(), 8000)
+            self.assertEqual(wav.getnframes(), 500)
+            self.assertEqual(wav.readframes(500), self.frames[400:2400])
+
+    def test_extract_wav_frames_clamped(self):
+        """Test que un rango fuera de la duración se acota al final del archivo"""
+        layout = read_wav_layout(self.source)
+        output = Path(self.temp_dir.name) / "tail.wav"
+
+        extract_wav_frames(self.source, layout, output, 2500, 9000)
+
+        with wave.open(str(output), 'rb') as wav:
+            self.assertEqual(wav.getnframes(), 60)
+
+if __name__ == '__main__':
+    unittest.main()